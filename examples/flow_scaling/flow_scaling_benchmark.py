@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Benchmark of the numerical scaling of flows.
+
+Several examples are solved without scaling and with every flow scaled by
+its nominal capacity (``flow_scaling="nominal_capacity"``). The script
+reports the time needed by the solver, the total time of ``Model.solve``
+(which includes scaling, writing the problem and reading the results) and
+the objective for both variants.
+The objectives have to agree, the solve times depend on the solver and on
+how badly scaled the original problem is.
+
+Code
+----
+Download source code: :download:`flow_scaling_benchmark.py </../examples/flow_scaling/flow_scaling_benchmark.py>`
+
+.. dropdown:: Click to display code
+
+    .. literalinclude:: /../examples/flow_scaling/flow_scaling_benchmark.py
+        :language: python
+        :lines: 42-
+
+Installation requirements
+-------------------------
+
+This example requires oemof.solph (at least v0.6.5), install by:
+
+.. code:: bash
+
+    pip install oemof.solph>=0.6.5
+
+
+License
+-------
+`MIT license <https://github.com/oemof/oemof-solph/blob/dev/LICENSE>`_
+
+"""
+
+import importlib.util
+import os
+import time
+
+import pandas as pd
+
+from oemof import solph
+
+EXAMPLES = [
+    "simple_dispatch/simple_dispatch.py",
+    "storage_investment/v1_invest_optimize_all_technologies.py",
+    "economic_results/economics_results_with_invest.py",
+]
+
+
+def load_energy_system(path):
+    """Create the energy system of the example script at `path`."""
+    path = os.path.join(os.path.dirname(__file__), os.pardir, path)
+    spec = importlib.util.spec_from_file_location("example", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main(optimize=False)
+
+
+def benchmark(path, flow_scaling, solver):
+    model = solph.Model(load_energy_system(path), flow_scaling=flow_scaling)
+    start = time.perf_counter()
+    results = model.solve(solver=solver)
+    return {
+        "solver time [s]": model.solve_statistics["solver_wall_time"],
+        "total time [s]": time.perf_counter() - start,
+        "objective": results["objective"],
+    }
+
+
+def main(optimize=True, solver="cbc"):
+    if optimize is False:
+        return [load_energy_system(path) for path in EXAMPLES]
+
+    results = pd.DataFrame(
+        {
+            (os.path.basename(path), str(flow_scaling)): benchmark(
+                path, flow_scaling, solver
+            )
+            for path in EXAMPLES
+            for flow_scaling in [None, "nominal_capacity"]
+        }
+    ).T
+    print(results.to_string())
+
+
+if __name__ == "__main__":
+    main()
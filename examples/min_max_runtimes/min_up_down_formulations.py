@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Benchmark comparing the formulations of minimum up and downtimes.
+
+The demand of the example `min_max_runtimes` is repeated for every day of a
+year. Both plants get a minimum up and downtime of 24 hours. For the
+'window' formulation (default) and the 'turn_on' formulation, the script
+reports the build time, the size of the model (constraints and nonzeros),
+the objective of the linear relaxation and the solution time of the MILP.
+
+Results for CBC 2.10 on a single core, with a time limit of one hour
+(``cmdline_options={"sec": 3600}``) for the full year:
+
+=====================  ===========  ===========  ==========  ==========
+formulation            window       turn_on      window      turn_on
+days                   7            7            365         365
+=====================  ===========  ===========  ==========  ==========
+constraints            1744         3528         96256       183960
+nonzeros               15660        9374         1003740     516302
+build time [s]         0.1          0.2          7.1         6.6
+LP relaxation          8939         15105        258140      635802
+MILP solve time [s]    40           0.6          > 3600      > 3600
+MILP objective         15020        15105        none found  643705
+=====================  ===========  ===========  ==========  ==========
+
+For the full year, neither MILP is solved to optimality within the hour.
+With 'turn_on', CBC finds a solution within 1.2 % of the LP relaxation, while it
+finds no integer solution at all with 'window'. The optima of the two
+formulations can differ: 'window' has no constraint for the status change
+at the first flexible timestep, so its optimum for one week (15020)
+breaks the minimum downtime there once.
+
+Code
+----
+Download source code: :download:`min_up_down_formulations.py </../examples/min_max_runtimes/min_up_down_formulations.py>`
+
+.. dropdown:: Click to display code
+
+    .. literalinclude:: /../examples/min_max_runtimes/min_up_down_formulations.py
+        :language: python
+        :lines: 60-
+
+Installation requirements
+-------------------------
+
+This example requires oemof.solph (at least v0.6.5), install by:
+
+.. code:: bash
+
+    pip install oemof.solph>=0.6.5
+
+
+License
+-------
+`MIT license <https://github.com/oemof/oemof-solph/blob/dev/LICENSE>`_
+
+"""
+
+import time
+
+import pandas as pd
+from pyomo.environ import Constraint
+from pyomo.repn import generate_standard_repn
+
+from oemof import solph
+
+
+def create_energy_system(formulation, days=365, runtime=24):
+    demand_el = [0] * 24
+    for n in [10, 15, 19]:
+        demand_el[n] = 1
+
+    idx = solph.create_time_index(2017, number=24 * days)
+    es = solph.EnergySystem(timeindex=idx, infer_last_interval=False)
+
+    bel = solph.Bus(label="bel")
+
+    demand = solph.components.Sink(
+        label="demand_el",
+        inputs={bel: solph.Flow(fix=demand_el * days, nominal_capacity=10)},
+    )
+
+    dummy_el = solph.components.Sink(
+        label="dummy_el", inputs={bel: solph.Flow(variable_costs=10)}
+    )
+
+    plants = [
+        solph.components.Source(
+            label=f"plant_{k}",
+            outputs={
+                bel: solph.Flow(
+                    nominal_capacity=10,
+                    minimum=0.5,
+                    maximum=1.0,
+                    variable_costs=10 + k,
+                    nonconvex=solph.NonConvex(
+                        minimum_uptime=runtime,
+                        minimum_downtime=runtime,
+                        initial_status=1,
+                        minimum_up_down_formulation=formulation,
+                    ),
+                )
+            },
+        )
+        for k in range(2)
+    ]
+
+    es.add(bel, demand, dummy_el, *plants)
+    return es
+
+
+def count_nonzeros(model):
+    nonzeros = 0
+    for constraint in model.component_data_objects(Constraint, active=True):
+        repn = generate_standard_repn(constraint.body, compute_values=False)
+        nonzeros += len(repn.linear_vars) + len(repn.quadratic_vars)
+    return nonzeros
+
+
+def benchmark(formulation, days, solver):
+    es = create_energy_system(formulation, days=days)
+
+    start = time.perf_counter()
+    model = solph.Model(es)
+    build_time = time.perf_counter() - start
+
+    result = {
+        "build time [s]": build_time,
+        "constraints": model.nconstraints(),
+        "nonzeros": count_nonzeros(model),
+    }
+
+    start = time.perf_counter()
+    milp = model.solve(solver=solver)
+    result["MILP solve time [s]"] = time.perf_counter() - start
+    result["MILP objective"] = milp["objective"]
+
+    relaxed = solph.Model(es)
+    relaxed.relax_problem()
+    result["LP relaxation"] = relaxed.solve(solver=solver)["objective"]
+
+    return result
+
+
+def main(optimize=True, days=365, solver="cbc"):
+    if optimize is False:
+        return create_energy_system("turn_on", days=days)
+
+    results = pd.DataFrame(
+        {
+            formulation: benchmark(formulation, days, solver)
+            for formulation in ["window", "turn_on"]
+        }
+    )
+    print(results)
+
+
+if __name__ == "__main__":
+    main()
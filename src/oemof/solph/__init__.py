@@ -1,10 +1,13 @@
 __version__ = "0.6.5a2"
 
+from . import aggregation
 from . import buses
 from . import components
 from . import constraints
+from . import decomposition
 from . import flows
 from . import helpers
+from . import heuristics
 from . import processing
 from . import views
 from ._energy_system import EnergySystem
@@ -13,19 +16,25 @@ from ._helpers import create_time_index
 from ._models import Model
 from ._options import Investment
 from ._options import NonConvex
+from ._plumbing import LazySequence
+from ._plumbing import SequenceRegistry
 from ._plumbing import sequence
 from ._results import Results
+from ._stochastic_model import StochasticModel
 from .buses import Bus  # default Bus (for convenience)
 from .flows import Flow  # default Flow (for convenience)
 
 __all__ = [
+    "aggregation",
     "buses",
     "Bus",
     "components",
     "constraints",
+    "decomposition",
     "flows",
     "Flow",
     "helpers",
+    "heuristics",
     "processing",
     "Results",
     "views",
@@ -33,7 +42,10 @@ __all__ = [
     "create_time_index",
     "GROUPINGS",
     "Model",
+    "StochasticModel",
     "Investment",
     "NonConvex",
+    "LazySequence",
+    "SequenceRegistry",
     "sequence",
 ]
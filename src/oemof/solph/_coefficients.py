@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""Report on the ranges of coefficients of a model.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import numpy as np
+import pandas as pd
+from pyomo import environ as po
+from pyomo.common.dependencies import scipy_available
+from pyomo.repn.plugins.standard_form import LinearStandardFormCompiler
+
+PARTS = ["matrix", "rhs", "bounds", "objective"]
+
+
+def _block_name(component):
+    block = component.parent_block()
+    if block.parent_block() is None:
+        return type(block).__name__
+    return block.local_name
+
+
+def _component_codes(items):
+    """Return the index of the parent component of every item and the
+    parent components in order of appearance."""
+    codes = {}
+    components = []
+
+    def _code(item):
+        component = item.parent_component()
+        code = codes.get(id(component))
+        if code is None:
+            code = codes[id(component)] = len(components)
+            components.append(component)
+        return code
+
+    return (
+        np.fromiter(map(_code, items), dtype=np.int64, count=len(items)),
+        components,
+    )
+
+
+def _extremes(keys, values):
+    """Return the positions of the first smallest and the first largest
+    nonzero finite absolute value per key."""
+    values = np.abs(values)
+    (positions,) = np.nonzero((values > 0) & np.isfinite(values))
+    keys = keys[positions]
+    extremes = []
+    for sign in (1, -1):
+        order = np.lexsort((sign * values[positions], keys))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[order[1:]] != keys[order[:-1]]
+        extremes.append(positions[order[first]])
+    return np.unique(np.concatenate(extremes)), values
+
+
+def coefficient_report(model, top=10):
+    """Return the ranges of the coefficients of the `model` per block and
+    the most extreme coefficients.
+
+    See :meth:`oemof.solph.Model.coefficient_report`.
+    """
+    if not scipy_available:
+        raise ImportError(
+            "The coefficient report needs scipy to compile the model. "
+            "Install it with `pip install scipy`."
+        )
+    # The model is compiled once into a sparse matrix. Fixed variables are
+    # part of the right hand side and unused variables are dropped. SOS
+    # constraints have no coefficients and are unknown to the compiler.
+    sos = list(
+        model.component_data_objects(
+            po.SOSConstraint, active=True, descend_into=True
+        )
+    )
+    for constraint in sos:
+        constraint.deactivate()
+    try:
+        form = LinearStandardFormCompiler().write(
+            model, mixed_form=True, set_sense=None, file_determinism=0
+        )
+    finally:
+        for constraint in sos:
+            constraint.activate()
+    constraints = [row.constraint for row in form.rows]
+    row_codes, row_components = _component_codes(constraints)
+    column_codes, column_components = _component_codes(form.columns)
+    row_blocks = [_block_name(c) for c in row_components]
+    column_blocks = [_block_name(c) for c in column_components]
+
+    def _names(items, positions):
+        return [items[i].name for i in positions]
+
+    frames = []
+
+    matrix = form.A.tocsr().tocoo()
+    positions, values = _extremes(
+        row_codes[matrix.row] * len(column_components)
+        + column_codes[matrix.col],
+        matrix.data,
+    )
+    row, col = matrix.row[positions], matrix.col[positions]
+    frames.append(
+        pd.DataFrame(
+            {
+                "part": "matrix",
+                "value": values[positions],
+                "block": [row_blocks[i] for i in row_codes[row]],
+                "constraint": _names(constraints, row),
+                "variable": _names(form.columns, col),
+            }
+        )
+    )
+
+    positions, values = _extremes(row_codes, np.asarray(form.rhs, float))
+    frames.append(
+        pd.DataFrame(
+            {
+                "part": "rhs",
+                "value": values[positions],
+                "block": [row_blocks[i] for i in row_codes[positions]],
+                "constraint": _names(constraints, positions),
+                "variable": "",
+            }
+        )
+    )
+
+    objective = form.c.tocoo()
+    positions, values = _extremes(column_codes[objective.col], objective.data)
+    col = objective.col[positions]
+    frames.append(
+        pd.DataFrame(
+            {
+                "part": "objective",
+                "value": values[positions],
+                "block": [column_blocks[i] for i in column_codes[col]],
+                "constraint": _names(
+                    form.objectives, objective.row[positions]
+                ),
+                "variable": _names(form.columns, col),
+            }
+        )
+    )
+
+    bounds = np.array([v.bounds for v in form.columns], dtype=float).reshape(
+        -1, 2
+    )
+    positions, values = _extremes(np.repeat(column_codes, 2), bounds.ravel())
+    col = positions // 2
+    frames.append(
+        pd.DataFrame(
+            {
+                "part": "bounds",
+                "value": values[positions],
+                "block": [column_blocks[i] for i in column_codes[col]],
+                "constraint": "",
+                "variable": _names(form.columns, col),
+            }
+        )
+    )
+
+    values = pd.concat(frames, ignore_index=True).drop_duplicates()
+
+    blocks = values.pivot_table(
+        index="block", columns="part", values="value", aggfunc=["min", "max"]
+    )
+    blocks = blocks.swaplevel(axis=1).reindex(
+        columns=pd.MultiIndex.from_product([PARTS, ["min", "max"]])
+    )
+    blocks = blocks.reindex(list(dict.fromkeys(values["block"])))
+    blocks[("matrix", "ratio")] = (
+        blocks[("matrix", "max")] / blocks[("matrix", "min")]
+    )
+
+    values = values.sort_values("value", kind="stable")
+    extremes = pd.concat([values.head(top), values.tail(top)])
+    extremes = extremes[~extremes.index.duplicated()]
+    return {"blocks": blocks, "extremes": extremes.reset_index(drop=True)}
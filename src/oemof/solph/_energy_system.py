@@ -217,6 +217,9 @@ class EnergySystem(es.EnergySystem):
                 else:
                     params["timesteps"] = params["timesteps_per_period"]
         self.tsa_parameters = tsa_parameters
+        # timeindex before merging timesteps, see
+        # oemof.solph.aggregation.merge_timesteps
+        self.original_timeindex = None
 
         timeincrement = self._init_timeincrement(
             timeincrement, timeindex, periods, tsa_parameters
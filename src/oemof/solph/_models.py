@@ -15,16 +15,39 @@ SPDX-License-Identifier: MIT
 
 """
 
+import asyncio
 import logging
+import math
+import multiprocessing
+import os
+import re
+import signal
+import tempfile
+import time
 import warnings
+import weakref
+from contextlib import ExitStack
 from logging import getLogger
+from queue import Empty
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import pandas as pd
 from oemof.tools import debugging
 from pyomo import environ as po
+from pyomo.core.base.suffix import active_import_suffix_generator
 from pyomo.core.plugins.transform.relax_integrality import RelaxIntegrality
 from pyomo.opt import SolverFactory
+from pyomo.opt.solver import SystemCallSolver
 
+from oemof.solph import _coefficients
+from oemof.solph import _presolve
+from oemof.solph import _scaling
 from oemof.solph import processing
+from oemof.solph._plumbing import unload_lazy_sequences
 from oemof.solph.buses._bus import BusBlock
 from oemof.solph.components._converter import ConverterBlock
 from oemof.solph.flows._invest_non_convex_flow_block import (
@@ -34,6 +57,7 @@ from oemof.solph.flows._investment_flow_block import InvestmentFlowBlock
 from oemof.solph.flows._non_convex_flow_block import NonConvexFlowBlock
 from oemof.solph.flows._simple_flow_block import SimpleFlowBlock
 
+from ._period_cache import PeriodCache
 from ._results import Results
 
 
@@ -66,6 +90,37 @@ class Model(po.ConcreteModel):
         building process set this value to False
         and use methods `_add_parent_block_sets`,
         `_add_parent_block_variables`, `_add_blocks`, `_add_objective`
+    flow_scaling : None, 'nominal_capacity', numeric or dict
+        Unit in which the flows are passed to the solver, which helps to
+        reduce the range of coefficients. 'nominal_capacity' scales every
+        flow by its nominal capacity (or by the maximum capacity of an
+        investment flow, if it is finite), a number applies the same unit to
+        all flows and a dict gives the unit per flow, indexed by
+        `(source, target)`. Variables in the unit of the flow, e.g. the
+        `invest` of investment flows, are scaled as well. The scaling only
+        applies while solving, all results are given in the original units.
+        Defaults to None (no scaling).
+    objective_scaling : 'auto', numeric or None
+        Factor applied to the objective while solving. 'auto' (default)
+        chooses a power of ten moving the objective coefficients around 1 if
+        flows are scaled.
+    tighten_big_m : bool
+        If True, the maximal investment into flows, which is used as big-M
+        value of nonconvex investments, is tightened before the blocks are
+        built. The tightened value is the largest flow possible according to
+        the bounds of the other flows, propagated through balanced buses and
+        converters, see :func:`oemof.solph._presolve.investment_bounds`.
+        The changes are logged. Defaults to False.
+    eliminate_flows : bool
+        If True, flows which are proportional to another flow (connected by
+        a balanced bus with a single input and output, a converter or a
+        link) are substituted by this flow while solving, and the implied
+        constraints are left out. This reduces the number of variables and
+        constraints passed to the solver, see
+        :func:`oemof.solph._presolve.flow_aliases`. The eliminated flows
+        get their values from the remaining flows, so the results contain
+        all flows. Balances of buses are kept if duals are received.
+        Defaults to False.
 
     Attributes
     ----------
@@ -79,6 +134,24 @@ class Model(po.ConcreteModel):
         Energy system of the model
     meta : `pyomo.opt.results.results_.SolverResults` or None
         Solver results
+    solve_statistics : dict
+        Build time of the model and statistics of the last solve: times
+        (in seconds) for writing the problem, running the solver (wall
+        time as reported by the solver and CPU time), reading the solution
+        file and loading the results, problem size as reported by the
+        solver, MIP gap and number of branch-and-bound nodes. Unknown values
+        are None. Solver interfaces without problem files (e.g. persistent
+        ones) and warm starts are only timed as a whole.
+    investment_bounds : dict
+        Tightened maximal investment per flow, indexed by
+        `(source, target)`, if `tighten_big_m` is True
+    eliminated_flows : dict
+        Flows eliminated in the last solve, indexed by `(source, target)`,
+        with the remaining flow and the factors (per timestep) expressing
+        them, if `eliminate_flows` is True
+    period_cache : PeriodCache or None
+        Cached period and lifetime data of a multi-period model, e.g.
+        decommissioning periods, discount factors and annuities
     dual : `pyomo.core.base.suffix.Suffix` or None
         Store the dual variables of the model if pyomo suffix is set to IMPORT
     rc : `pyomo.core.base.suffix.Suffix` or None
@@ -174,8 +247,15 @@ class Model(po.ConcreteModel):
         ]
 
         self.flows = self.es.flows()
+        self.flow_scaling = kwargs.get("flow_scaling")
+        self.objective_scaling = kwargs.get("objective_scaling", "auto")
+        self.tighten_big_m = kwargs.get("tighten_big_m", False)
+        self.investment_bounds = {}
+        self.eliminate_flows = kwargs.get("eliminate_flows", False)
+        self.eliminated_flows = {}
 
         self.solver_results = None
+        self.solve_statistics = dict.fromkeys(_STATISTICS_KEYS)
         self.dual = None
         self.rc = None
 
@@ -193,10 +273,16 @@ class Model(po.ConcreteModel):
         """Construct a Model by adding parent block sets and variables
         as well as child blocks and variables to it.
         """
+        start = time.perf_counter()
         self._add_parent_block_sets()
         self._add_parent_block_variables()
+        unload_lazy_sequences()
+        if self.tighten_big_m:
+            self.investment_bounds = _presolve.investment_bounds(self)
         self._add_child_blocks()
         self._add_objective()
+        unload_lazy_sequences()
+        self.solve_statistics["build_time"] = time.perf_counter() - start
 
     def _set_discount_rate_with_warning(self):
         """
@@ -270,6 +356,12 @@ class Model(po.ConcreteModel):
             timesteps_in_period[p].append(t)
         self.TIMESTEPS_IN_PERIOD = timesteps_in_period
 
+        # Period and lifetime data shared by all multi-period blocks
+        if self.es.periods is None:
+            self.period_cache = None
+        else:
+            self.period_cache = PeriodCache(self)
+
         # Set up disaggregated timesteps from original timeseries
         self.TSAM_MODE = False
         if self.es.tsa_parameters is None:
@@ -397,6 +489,8 @@ class Model(po.ConcreteModel):
             # create constraints etc. related with block for all nodes
             # in the group
             block._create(group=self.es.groups.get(group))
+            # keep only the lazy sequences of one block in memory
+            unload_lazy_sequences()
 
     def _add_objective(self, sense=po.minimize, update=False):
         """Method to sum up all objective expressions from the child blocks
@@ -443,13 +537,18 @@ class Model(po.ConcreteModel):
         allow_nonoptimal=False,
         solve_kwargs=None,
         cmdline_options=None,
+        warmstart=False,
     ):
         r"""Takes care of communication with solver to solve the model.
 
         Parameters
         ----------
-        solver : string
-            solver to be used e.g. "cbc", "glpk", "gurobi", "cplex"
+        solver : string or list
+            solver to be used e.g. "cbc", "glpk", "gurobi", "cplex".
+            A list of solvers or solver configurations (dicts with the key
+            "solver" and optionally "solver_io", "cmdline_options" and
+            "solve_kwargs", defaulting to the arguments given here) is
+            solved as a portfolio, see the note below.
         solver_io : string
             pyomo solver interface file format: "lp", "python", "nl", etc.
         allow_nonoptimal : bool
@@ -466,19 +565,76 @@ class Model(po.ConcreteModel):
             \{"interior":" "} results in "--interior"
             \Gurobi solver takes numeric parameter values such as
             {"method": 2}
+        warmstart : bool
+            Pass the current values of the variables (e.g. set using
+            :meth:`set_start_values`) to the solver as a starting point.
+            This requires a solver interface with warm start capabilities,
+            e.g. "cbc", "gurobi" or "appsi_highs". For other solvers, a
+            warning is given and the values are ignored.
+
+        Note
+        ----
+        If a list of solver configurations is given, the problem is written
+        to a file once and all configurations solve it concurrently in
+        separate processes (portfolio solve). The first configuration
+        finding an optimal solution (which includes reaching a gap given as
+        command line option) wins, all others are stopped. The winning
+        configuration is given by the key "solver_configuration" of the
+        returned `Results`. This requires solver interfaces reading problem
+        files, e.g. "cbc", "glpk", "gurobi" or "cplex" (not the persistent
+        or direct interfaces). Warm starts are not supported for
+        portfolios. On platforms starting processes by "spawn" (Windows,
+        macOS), the calling script needs to be guarded by
+        `if __name__ == "__main__":`.
         """
         if solve_kwargs is None:
             solve_kwargs = {}
         if cmdline_options is None:
             cmdline_options = {}
-        opt = SolverFactory(solver, solver_io=solver_io)
 
-        # set command line options
-        options = opt.options
-        for k in cmdline_options:
-            options[k] = cmdline_options[k]
+        configuration = None
+        timings = {}
+        with (
+            _presolve.eliminated(self, self.eliminate_flows),
+            _scaling.scaled(self, self.flow_scaling, self.objective_scaling),
+        ):
+            if isinstance(solver, (list, tuple)):
+                if warmstart:
+                    warnings.warn(
+                        "Warm starts are not supported for portfolio solves."
+                        + " The start values are ignored.",
+                        debugging.SuspiciousUsageWarning,
+                    )
+                solver_results, configuration = self._solve_portfolio(
+                    [
+                        _solver_configuration(
+                            c, solver_io, solve_kwargs, cmdline_options
+                        )
+                        for c in solver
+                    ],
+                    timings,
+                )
+            else:
+                solver_results = self._solve_single(
+                    solver,
+                    solver_io,
+                    solve_kwargs,
+                    cmdline_options,
+                    warmstart,
+                    timings,
+                )
+        return self._finish_solve(
+            solver_results, timings, allow_nonoptimal, configuration
+        )
 
-        solver_results = opt.solve(self, **solve_kwargs)
+    def _finish_solve(
+        self, solver_results, timings, allow_nonoptimal, configuration=None
+    ):
+        """Store the `solver_results` and statistics of a solve and return
+        the results, if the solution is optimal."""
+        self.solve_statistics.update(
+            _solve_statistics(self, solver_results, timings)
+        )
 
         status = solver_results.Solver.Status
         termination_condition = solver_results.Solver.Termination_condition
@@ -504,7 +660,346 @@ class Model(po.ConcreteModel):
             else:
                 raise RuntimeError(msg)
 
-        return Results(self)
+        results = Results(self)
+        if configuration is not None:
+            results._meta_results["solver_configuration"] = configuration
+        return results
+
+    def solve_async(
+        self,
+        solver="cbc",
+        solver_io="lp",
+        allow_nonoptimal=False,
+        solve_kwargs=None,
+        cmdline_options=None,
+    ):
+        """Start solving the model in a separate process.
+
+        The problem is written to a file, which is solved in a new process,
+        and a :class:`SolveFuture` is returned at once. Meanwhile, e.g. the
+        model of the next scenario can be built. The solution is loaded
+        when the result of the future is requested, e.g. by
+        ``future.result()`` or ``await future``. The model should not be
+        changed before. A future which is not needed anymore should be
+        closed (or used as context manager) to stop the solver and to
+        restore the model.
+
+        Parameters
+        ----------
+        solver, solver_io, allow_nonoptimal, solve_kwargs, cmdline_options
+            See :meth:`solve`. The solver interface has to read problem
+            files, e.g. "cbc", "glpk", "gurobi" or "cplex".
+
+        Returns
+        -------
+        SolveFuture
+            Future of the results, see :meth:`solve`.
+
+        Note
+        ----
+        On platforms starting processes by "spawn" (Windows, macOS), the
+        calling script needs to be guarded by
+        `if __name__ == "__main__":`.
+        """
+        configuration = _solver_configuration(
+            solver,
+            solver_io,
+            solve_kwargs if solve_kwargs is not None else {},
+            cmdline_options if cmdline_options is not None else {},
+        )
+        return SolveFuture(self, configuration, allow_nonoptimal)
+
+    def _solve_single(
+        self,
+        solver,
+        solver_io,
+        solve_kwargs,
+        cmdline_options,
+        warmstart,
+        timings,
+    ):
+        """Solve the model with a single solver, measuring the `timings`
+        of the single steps."""
+        opt = SolverFactory(solver, solver_io=solver_io)
+        _check_sos_support(self, opt, solver)
+
+        # set command line options
+        options = opt.options
+        for k in cmdline_options:
+            options[k] = cmdline_options[k]
+
+        if warmstart:
+            if opt.warm_start_capable():
+                solve_kwargs = {**solve_kwargs, "warmstart": True}
+            else:
+                warnings.warn(
+                    f"The solver interface '{solver}' does not support warm"
+                    + " starts. The start values are ignored.",
+                    debugging.SuspiciousUsageWarning,
+                )
+
+        if warmstart or not isinstance(opt, SystemCallSolver):
+            # the solver interface needs the model (e.g. to pass the start
+            # values), so only the whole solve can be timed
+            start, cpu_start = time.perf_counter(), _cpu_time()
+            solver_results = opt.solve(self, **solve_kwargs)
+            total_time = time.perf_counter() - start
+            timings["solver_cpu_time"] = _cpu_time() - cpu_start
+            timings["solver_wall_time"] = _solver_time(solver_results)
+            if timings["solver_wall_time"] is None:
+                timings["solver_wall_time"] = total_time
+            else:
+                timings["load_time"] = max(
+                    total_time - timings["solver_wall_time"], 0
+                )
+        else:
+            solver_results = self._solve_problem_file(
+                opt, solver_io, solve_kwargs, timings
+            )
+        timings["log"] = getattr(opt, "_log", None)
+        return solver_results
+
+    def _solve_problem_file(self, opt, solver_io, solve_kwargs, timings):
+        """Write the problem file, solve it with the solver interface `opt`
+        and load the solution, timing each step."""
+        solve_kwargs = dict(solve_kwargs)
+        io_options = {
+            "symbolic_solver_labels": solve_kwargs.pop(
+                "symbolic_solver_labels", False
+            ),
+            **solve_kwargs.pop("io_options", {}),
+        }
+        load_solutions = solve_kwargs.pop("load_solutions", True)
+        suffixes = solve_kwargs.setdefault("suffixes", [])
+        for name, _ in active_import_suffix_generator(self):
+            if name not in suffixes:
+                suffixes.append(name)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            start = time.perf_counter()
+            problem_file, smap_id = self.write(
+                os.path.join(tmpdir, f"model.{solver_io}"),
+                io_options=io_options,
+            )
+            timings["write_time"] = time.perf_counter() - start
+
+            start, cpu_start = time.perf_counter(), _cpu_time()
+            solver_results = opt.solve(problem_file, **solve_kwargs)
+            call_time = time.perf_counter() - start
+            timings["solver_cpu_time"] = _cpu_time() - cpu_start
+
+        # the call includes reading the solution file
+        timings["solver_wall_time"] = _solver_time(solver_results)
+        if timings["solver_wall_time"] is None:
+            timings["solver_wall_time"] = call_time
+        else:
+            timings["read_time"] = max(
+                call_time - timings["solver_wall_time"], 0
+            )
+
+        start = time.perf_counter()
+        if load_solutions:
+            self._load_solution(solver_results, smap_id)
+        else:
+            self.solutions.symbol_map.pop(smap_id, None)
+        timings["load_time"] = time.perf_counter() - start
+        return solver_results
+
+    def _solve_portfolio(self, configurations, timings):
+        """Race the solver `configurations` on the same problem file and
+        load the solution of the first one finding the optimum."""
+        context = multiprocessing.get_context()
+        queue = context.Queue()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            start = time.perf_counter()
+            problem_files = {}
+            for config in configurations:
+                _check_sos_support(
+                    self,
+                    SolverFactory(
+                        config["solver"], solver_io=config["solver_io"]
+                    ),
+                    config["solver"],
+                )
+                io = config["solver_io"]
+                if io not in problem_files:
+                    problem_files[io] = self.write(
+                        os.path.join(tmpdir, f"model.{io}"),
+                        io_options={"symbolic_solver_labels": False},
+                    )
+            timings["write_time"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            processes = [
+                context.Process(
+                    target=_portfolio_worker,
+                    args=(k, config, problem_files[config["solver_io"]][0]),
+                    kwargs={"queue": queue},
+                    daemon=True,
+                )
+                for k, config in enumerate(configurations)
+            ]
+            for process in processes:
+                process.start()
+
+            finished = []
+            try:
+                while len(finished) < len(processes):
+                    try:
+                        k, solver_results = queue.get(timeout=1)
+                    except Empty:
+                        if any(p.is_alive() for p in processes):
+                            continue
+                        if queue.empty():
+                            break
+                        continue
+                    finished.append((k, solver_results))
+                    if not isinstance(solver_results, Exception) and (
+                        solver_results.solver.termination_condition
+                        == "optimal"
+                    ):
+                        break
+            finally:
+                for process in processes:
+                    _stop_process(process)
+            timings["solver_wall_time"] = time.perf_counter() - start
+
+        results = [(k, r) for k, r in finished if not isinstance(r, Exception)]
+        if not results:
+            raise RuntimeError(
+                "No solver of the portfolio returned a solution:\n"
+                + "\n".join(str(r) for _, r in finished)
+            )
+        k, solver_results = results[-1]
+        logging.info(f"Portfolio solve won by {configurations[k]}.")
+
+        start = time.perf_counter()
+        self._load_solution(
+            solver_results, problem_files[configurations[k]["solver_io"]][1]
+        )
+        for _, smap_id in problem_files.values():
+            self.solutions.symbol_map.pop(smap_id, None)
+        timings["load_time"] = time.perf_counter() - start
+        return solver_results, configurations[k]
+
+    def _load_solution(self, solver_results, smap_id):
+        """Load the solution of a problem file written by the model, which
+        has the symbol map `smap_id`."""
+        if len(solver_results.solution) > 0:
+            solver_results._smap = self.solutions.symbol_map[smap_id]
+            self.solutions.load_from(solver_results)
+        self.solutions.symbol_map.pop(smap_id, None)
+
+    def set_start_values(self, values, variables=None):
+        """Set the values of variables as a starting point for the solver.
+
+        Together with `solve(warmstart=True)`, the values are passed to the
+        solver as a MIP start, which can speed up solving models that are
+        similar to a model solved before, e.g. in scenario sweeps.
+
+        Parameters
+        ----------
+        values : Results or dict
+            Results of a previous solve, possibly of another model of an
+            energy system with the same labels (e.g. a relaxed one), or a
+            dict mapping variable names to values. The values of a variable
+            are given in the format of :meth:`Results.get`
+            (`pd.DataFrame`) or as a dict mapping the index of the
+            variable, e.g. `(source, target, timestep)`, to the value.
+            Nodes can also be given by their labels.
+        variables : iterable of str or None
+            Names of the variables to be set, e.g. `["flow", "status",
+            "invest", "storage_content"]`. If None, all variables of the
+            model found in `values` are set. Note that solvers usually
+            need values for all integer variables (including e.g. `startup`)
+            to use a MIP start.
+
+        Note
+        ----
+        Values of integer variables are rounded, fixed variables are not
+        changed.
+        """
+        components = {}
+        for var in self.component_objects(po.Var, descend_into=True):
+            components.setdefault(var.local_name, []).append(var)
+        if variables is None:
+            variables = components.keys()
+
+        for name in variables:
+            data = values.get(name)
+            if data is None:
+                continue
+            for var in components.get(name, []):
+                if isinstance(data, dict):
+                    indexed_values = data
+                else:
+                    indexed_values = _indexed_values(var, data)
+                for index, value in indexed_values.items():
+                    if index not in var or var[index].fixed:
+                        continue
+                    if value is None or value != value:  # None or NaN
+                        continue
+                    if not var[index].is_continuous():
+                        value = round(value)
+                    var[index].set_value(value, skip_validation=True)
+
+    def coefficient_report(self, top=10):
+        """Report the ranges of coefficients of the model.
+
+        Large ranges of coefficients, e.g. caused by a tiny efficiency or a
+        huge maximum, slow down solvers and make them numerically fragile.
+        The report compiles all active constraints, the objective and the
+        bounds of the model into a sparse matrix once and aggregates the
+        absolute values per block (e.g. `BusBlock`, `ConverterBlock` or
+        `InvestmentFlowBlock`). Constraints and variables of the model
+        itself are listed as `Model`. Fixed variables count as part of the
+        right hand side and variables not used by any constraint or the
+        objective are left out. Compiling the model needs scipy.
+
+        Parameters
+        ----------
+        top : int
+            Number of the smallest and of the largest values listed in the
+            extremes.
+
+        Returns
+        -------
+        dict
+            'blocks' : :class:`pandas.DataFrame` with the minimal and
+            maximal absolute value of the constraint coefficients ('matrix'),
+            right hand sides ('rhs'), variable bounds ('bounds') and
+            objective coefficients ('objective') per block as well as the
+            ratio of the matrix coefficients. Objective coefficients and
+            bounds belong to the block of their variable.
+
+            'extremes' : :class:`pandas.DataFrame` with the `top` smallest
+            and largest absolute values of all parts, their block and the
+            names of the constraint and/or variable, which point to the
+            nodes and flows causing them. Only the smallest and largest value
+            of every constraint and variable is listed, so a value repeated
+            for every timestep shows up once.
+
+        Examples
+        --------
+        >>> from oemof import solph
+        >>> es = solph.EnergySystem(timeindex=[1, 2, 3])
+        >>> gas = solph.buses.Bus(label="gas")
+        >>> heat = solph.buses.Bus(label="heat")
+        >>> es.add(gas, heat, solph.components.Converter(
+        ...     label="boiler",
+        ...     inputs={gas: solph.flows.Flow()},
+        ...     outputs={heat: solph.flows.Flow()},
+        ...     conversion_factors={heat: 1e-9},
+        ... ))
+        >>> report = solph.Model(es).coefficient_report()
+        >>> float(report["blocks"].loc["ConverterBlock", ("matrix", "max")])
+        1.0
+        >>> float(report["blocks"].loc["ConverterBlock", ("matrix", "min")])
+        1e-09
+        >>> report["extremes"].loc[0, ["constraint", "variable"]].tolist()
+        ['ConverterBlock.relation[boiler,gas,heat,0]', 'flow[gas,boiler,0]']
+        """
+        return _coefficients.coefficient_report(self, top=top)
 
     def relax_problem(self):
         """Relaxes integer variables to reals of optimization model self."""
@@ -533,3 +1028,387 @@ class Model(po.ConcreteModel):
             for k in range(len(self.es.tsa_parameters[p][cluster_type]))
             for t in range(self.es.tsa_parameters[p]["timesteps"] + offset)
         ]
+
+
+class SolveFuture:
+    """Result of a model solved in a separate process, see
+    :meth:`Model.solve_async`.
+
+    The future can be awaited in a coroutine, e.g.
+    ``results = await model.solve_async()``. Cancelling the awaiting task
+    cancels the solve, and awaiting a cancelled future raises
+    :class:`asyncio.CancelledError`.
+
+    Until the solution is loaded, the future keeps the solver process, the
+    problem file and the scaled or reduced state of the model. They are
+    released by :meth:`result`, :meth:`cancel` or :meth:`close`, when
+    leaving a ``with`` block of the future or, at the latest, when the
+    future is garbage collected.
+    """
+
+    poll_interval = 0.1
+
+    def __init__(self, model, configuration, allow_nonoptimal):
+        self.model = model
+        self.configuration = configuration
+        self._allow_nonoptimal = allow_nonoptimal
+        self._timings = {}
+        self._answer = None
+        self._result = None
+        self._error = None
+        self._finished = False
+        _check_sos_support(
+            model,
+            SolverFactory(
+                configuration["solver"], solver_io=configuration["solver_io"]
+            ),
+            configuration["solver"],
+        )
+
+        # the model keeps its solving state until the solution is loaded
+        self._stack = ExitStack()
+        try:
+            self._stack.enter_context(
+                _presolve.eliminated(model, model.eliminate_flows)
+            )
+            self._stack.enter_context(
+                _scaling.scaled(
+                    model, model.flow_scaling, model.objective_scaling
+                )
+            )
+            tmpdir = self._stack.enter_context(tempfile.TemporaryDirectory())
+            start = time.perf_counter()
+            problem_file, self._smap_id = model.write(
+                os.path.join(tmpdir, f"model.{configuration['solver_io']}"),
+                io_options={"symbolic_solver_labels": False},
+            )
+            self._timings["write_time"] = time.perf_counter() - start
+
+            context = multiprocessing.get_context()
+            self._queue = context.Queue()
+            self._start = time.perf_counter()
+            self._process = context.Process(
+                target=_portfolio_worker,
+                args=(0, configuration, problem_file),
+                kwargs={"queue": self._queue},
+                daemon=True,
+            )
+            self._process.start()
+        except BaseException:
+            self._stack.close()
+            raise
+        self._release = weakref.finalize(
+            self, _release_solve, self._process, self._stack
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _receive(self, timeout):
+        """Wait up to `timeout` seconds (forever if None) for the answer of
+        the solver process. Return True if it is available."""
+        if self._answer is not None:
+            return True
+        if self._finished:
+            return False
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            wait = 1 if deadline is None else deadline - time.perf_counter()
+            try:
+                _, answer = self._queue.get(timeout=max(min(wait, 1), 0))
+            except Empty:
+                if not self._process.is_alive() and self._queue.empty():
+                    answer = RuntimeError(
+                        "The solver process ended without results."
+                    )
+                elif deadline is None or time.perf_counter() < deadline:
+                    continue
+                else:
+                    return False
+            self._timings["solver_wall_time"] = (
+                time.perf_counter() - self._start
+            )
+            self._answer = answer
+            _stop_process(self._process)
+            return True
+
+    def done(self):
+        """Return True if the solver finished or the future was
+        cancelled."""
+        return self._finished or self._receive(timeout=0)
+
+    def cancel(self):
+        """Stop the solver. Return False if it already finished."""
+        if self._finished or self._receive(timeout=0):
+            return False
+        self.close()
+        return True
+
+    def close(self):
+        """Stop the solver, delete the problem file and restore the model.
+        A solution which is not loaded yet is discarded, and the future is
+        cancelled."""
+        if not self._finished:
+            self._finished = True
+            self._answer = None
+        self._release()
+
+    def cancelled(self):
+        """Return True if the future was cancelled."""
+        return self._finished and self._answer is None
+
+    def result(self, timeout=None):
+        """Wait for the solver and return the results of the model.
+
+        Parameters
+        ----------
+        timeout : float or None
+            Maximal time to wait (in seconds). Wait until the solver
+            finishes if None.
+
+        Returns
+        -------
+        Results or `pyomo.opt.results.results_.SolverResults`
+            See :meth:`Model.solve`.
+        """
+        if self._finished:
+            if self._answer is None:
+                raise RuntimeError("The solve was cancelled.")
+            if self._error is not None:
+                raise self._error
+            return self._result
+        if not self._receive(timeout):
+            raise TimeoutError(
+                f"The solver did not finish within {timeout} seconds."
+            )
+        self._finished = True
+        self._release.detach()
+        try:
+            with self._stack:
+                if isinstance(self._answer, Exception):
+                    raise self._answer
+                start = time.perf_counter()
+                self.model._load_solution(self._answer, self._smap_id)
+                self._timings["load_time"] = time.perf_counter() - start
+            self._result = self.model._finish_solve(
+                self._answer, self._timings, self._allow_nonoptimal
+            )
+        except Exception as error:
+            self._error = error
+            raise
+        return self._result
+
+    def __await__(self):
+        try:
+            while not self.done():
+                yield from asyncio.sleep(self.poll_interval).__await__()
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        if self.cancelled():
+            raise asyncio.CancelledError("The solve was cancelled.")
+        return self.result()
+
+
+def _release_solve(process, stack):
+    """Stop the solver `process` and leave the contexts of the `stack` of a
+    :class:`SolveFuture`."""
+    _stop_process(process)
+    stack.close()
+
+
+def _indexed_values(var, frame):
+    """Map the index of `var` to the values in `frame`, which is in the
+    format of :meth:`Results.get`."""
+    time_set = tuple(var.index_set().subsets())[-1]
+    positional = time_set.name in ("TIMESTEPS", "TIMEPOINTS")
+    if isinstance(frame, pd.Series):
+        frame = frame.to_frame()
+
+    values = {}
+    for column in frame.columns:
+        prefix = column if isinstance(column, tuple) else (column,)
+        for position, (row, value) in enumerate(frame[column].items()):
+            if positional:
+                if position >= len(time_set):
+                    break
+                row = time_set.at(position + 1)
+            values[(*prefix, row)] = value
+    return values
+
+
+def _solver_configuration(
+    configuration, solver_io, solve_kwargs, cmdline_options
+):
+    """Complete a solver configuration of a portfolio by the defaults."""
+    if isinstance(configuration, str):
+        configuration = {"solver": configuration}
+    return {
+        "solver_io": solver_io,
+        "solve_kwargs": solve_kwargs,
+        "cmdline_options": cmdline_options,
+        **configuration,
+    }
+
+
+def _check_sos_support(model, opt, solver):
+    """Raise an error if the model has SOS constraints which the solver
+    interface `opt` does not support (e.g. CBC with LP files)."""
+    # check the class, unknown solvers raise errors on any attribute access,
+    # interfaces without capabilities (e.g. HiGHS) are not checked
+    if not hasattr(type(opt), "has_capability"):
+        return
+    for sos in model.component_data_objects(po.SOSConstraint, active=True):
+        if not opt.has_capability(f"sos{sos.level}"):
+            raise ValueError(
+                f"The solver interface of '{solver}' does not support SOS"
+                + f" constraints of type {sos.level} (used by {sos.name})."
+                + " Use a solver supporting them or another formulation,"
+                + " e.g. pw_repn='CC' for a PiecewiseLinearConverter."
+            )
+
+
+def _portfolio_worker(index, configuration, problem_file, queue):
+    """Solve the `problem_file` in a process of a portfolio solve."""
+    if hasattr(os, "setpgrp"):
+        # own process group to stop the solver together with this process
+        os.setpgrp()
+    try:
+        opt = SolverFactory(
+            configuration["solver"], solver_io=configuration["solver_io"]
+        )
+        for k, v in configuration["cmdline_options"].items():
+            opt.options[k] = v
+        solver_results = opt.solve(
+            problem_file, **configuration["solve_kwargs"]
+        )
+    except Exception as e:
+        # the original exception might not be picklable
+        solver_results = RuntimeError(f"{configuration}: {e}")
+    queue.put((index, solver_results))
+
+
+def _stop_process(process):
+    """Stop a process of a portfolio solve including its solver."""
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            process.terminate()
+    process.join()
+
+
+_STATISTICS_KEYS = (
+    "build_time",
+    "write_time",
+    "solver_wall_time",
+    "solver_cpu_time",
+    "read_time",
+    "load_time",
+    "rows",
+    "columns",
+    "nonzeros",
+    "integer_variables",
+    "mip_gap",
+    "nodes",
+)
+
+# number of branch-and-bound nodes in the logs of common solvers
+_NODE_PATTERNS = (
+    re.compile(r"Enumerated nodes:\s+(\d+)"),  # CBC
+    re.compile(r"Explored (\d+) nodes"),  # Gurobi
+    re.compile(r"Nodes = (\d+)"),  # CPLEX
+    re.compile(r"^\s*Nodes\s+(\d+)\s*$", re.MULTILINE),  # HiGHS
+)
+
+
+def _cpu_time():
+    """CPU time of this process and its (finished) child processes."""
+    cpu_time = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu_time += children.ru_utime + children.ru_stime
+    return cpu_time
+
+
+def _solver_time(solver_results):
+    """Wall clock time reported by the solver (or measured by the solver
+    interface) or None if it is unknown."""
+    solver = solver_results["Solver"][0]
+    for key in ("Wallclock time", "Time"):
+        value = _defined(solver, key)
+        if isinstance(value, (int, float)) and value >= 0:
+            return float(value)
+    return None
+
+
+def _defined(container, *keys):
+    """Return the value of a (nested) key of pyomo solver results or None
+    if it is not defined."""
+    value = container
+    try:
+        for key in keys:
+            value = value[key]
+    except (KeyError, TypeError, AttributeError):
+        return None
+    if str(value) == "<undefined>":
+        return None
+    return value
+
+
+def _solve_statistics(model, solver_results, timings):
+    """Collect the statistics of a solve."""
+    problem = solver_results["Problem"][0]
+    solver = solver_results["Solver"][0]
+
+    statistics = dict.fromkeys(_STATISTICS_KEYS[1:])
+    statistics.update(
+        (key, value) for key, value in timings.items() if key in statistics
+    )
+
+    statistics["rows"] = _defined(problem, "Number of constraints")
+    if statistics["rows"] is None:
+        statistics["rows"] = model.nconstraints()
+    statistics["columns"] = _defined(problem, "Number of variables")
+    if statistics["columns"] is None:
+        statistics["columns"] = model.nvariables()
+    statistics["nonzeros"] = _defined(problem, "Number of nonzeros")
+    statistics["integer_variables"] = _defined(
+        problem, "Number of integer variables"
+    )
+    if statistics["integer_variables"] is None:
+        statistics["integer_variables"] = sum(
+            1
+            for v in model.component_data_objects(po.Var)
+            if not v.is_continuous() and not v.fixed
+        )
+
+    upper_bound = _defined(problem, "Upper bound")
+    lower_bound = _defined(problem, "Lower bound")
+    if isinstance(upper_bound, (int, float)) and isinstance(
+        lower_bound, (int, float)
+    ):
+        if upper_bound == lower_bound:
+            statistics["mip_gap"] = 0.0
+        elif math.isfinite(upper_bound) and math.isfinite(lower_bound):
+            statistics["mip_gap"] = abs(upper_bound - lower_bound) / max(
+                abs(upper_bound), 1e-10
+            )
+
+    statistics["nodes"] = _defined(
+        solver,
+        "Statistics",
+        "Branch and bound",
+        "Number of created subproblems",
+    )
+    log = timings.get("log")
+    if statistics["nodes"] is None and log:
+        for pattern in _NODE_PATTERNS:
+            match = pattern.search(log)
+            if match:
+                statistics["nodes"] = int(match.group(1))
+                break
+    return statistics
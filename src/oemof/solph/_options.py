@@ -247,6 +247,31 @@ class NonConvex:
     positive_gradient_limit : numeric (iterable, scalar or None)
             the normed *upper bound* on the negative difference
             (`flow[t-1] > flow[t]`) of two consecutive flow values.
+    minimum_up_down_formulation : str
+        Formulation of the minimum up and downtime constraints.
+        'window' (default) limits the status within a rolling window after
+        every change of the status. 'turn_on' uses the turn on/turn off
+        inequalities based on the startup and shutdown variables, which
+        are created automatically. They are formulated using cumulated
+        startups and shutdowns, leading to fewer nonzeros and a tighter
+        linear relaxation, in particular for long minimum up or downtimes.
+        Note that switching the formulation can change the optimum: the
+        'window' formulation has no constraint for a status change at the
+        first flexible timestep, so the minimum up or downtime following it
+        can be violated, while 'turn_on' enforces it. In the example
+        `min_up_down_formulations.py`, the optimum for one week is 15020
+        with 'window' and 15105 with 'turn_on'.
+    number_of_units : int
+        Number of identical units represented by the flow (default: 1).
+        For more than one unit, the status is an integer giving the number
+        of units online, startups and shutdowns are counted per unit and
+        the `nominal_capacity` of the flow is the capacity of all units.
+        The minimum load (`minimum` of the flow) refers to the units online.
+        Costs defined per status (activity, inactivity, startup, shutdown)
+        apply per unit. Minimum up and downtimes require the 'turn_on'
+        formulation, gradient limits are not supported. An `initial_status`
+        between 0 and `number_of_units` gives the number of units online at
+        the start.
     """
 
     def __init__(
@@ -262,6 +287,8 @@ class NonConvex:
         inactivity_costs=None,
         negative_gradient_limit=None,
         positive_gradient_limit=None,
+        minimum_up_down_formulation="window",
+        number_of_units=1,
         custom_attributes=None,  # To be removed for versions >= v0.7
         custom_properties=None,
     ):
@@ -298,6 +325,46 @@ class NonConvex:
         self.negative_gradient_limit = sequence(negative_gradient_limit)
         self.positive_gradient_limit = sequence(positive_gradient_limit)
 
+        if minimum_up_down_formulation not in ("window", "turn_on"):
+            raise ValueError(
+                "The minimum_up_down_formulation has to be 'window' or"
+                + f" 'turn_on' but is '{minimum_up_down_formulation}'."
+            )
+        self.minimum_up_down_formulation = minimum_up_down_formulation
+
+        if int(number_of_units) != number_of_units or number_of_units < 1:
+            raise ValueError(
+                "The number_of_units has to be a positive integer but is"
+                + f" {number_of_units}."
+            )
+        self.number_of_units = int(number_of_units)
+        if self.number_of_units > 1:
+            if minimum_up_down_formulation == "window" and (
+                self.minimum_uptime.max() > 0
+                or self.minimum_downtime.max() > 0
+            ):
+                raise ValueError(
+                    "Minimum up and downtimes of several units"
+                    + " (number_of_units > 1) require the"
+                    + " minimum_up_down_formulation 'turn_on'."
+                )
+            if (
+                self.positive_gradient_limit is not None
+                or self.negative_gradient_limit is not None
+            ):
+                raise ValueError(
+                    "Gradient limits are not supported for several units"
+                    + " (number_of_units > 1)."
+                )
+            if initial_status is not None and not (
+                0 <= initial_status <= self.number_of_units
+            ):
+                raise ValueError(
+                    "The initial_status has to be between 0 and the"
+                    + f" number_of_units ({self.number_of_units}) but is"
+                    + f" {initial_status}."
+                )
+
         if initial_status == 0:
             self.first_flexible_timestep = self.minimum_downtime[0]
         else:
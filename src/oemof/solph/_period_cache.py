@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""Cached period and lifetime data of multi-period models.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import numpy as np
+from oemof.tools import economics
+
+
+class PeriodCache:
+    """Precomputed period and lifetime data shared by all blocks of a
+    multi-period model.
+
+    Many investment options share the same lifetime and initial age.
+    Decommissioning periods, expired time indices and annuity factors are
+    thus computed once per (lifetime, age) or (n, wacc) and reused by every
+    block of the model.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        Multi-period model with the sets `TIMEINDEX` and
+        `TIMESTEPS_IN_PERIOD` already created.
+
+    Attributes
+    ----------
+    period_discount_factors : numpy.ndarray
+        :math:`(1 + dr)^{-year(p)}` for every period :math:`p`.
+    timestep_discount_factors : numpy.ndarray
+        The discount factor of the period of every timestep.
+    """
+
+    def __init__(self, model):
+        es = model.es
+        self.periods_years = np.asarray(es.periods_years)
+        self.periods_matrix = np.asarray(es.periods_matrix)
+        self.end_year_of_optimization = es.end_year_of_optimization
+        self.timesteps_in_period = model.TIMESTEPS_IN_PERIOD
+
+        self.period_discount_factors = (1 + model.discount_rate) ** -(
+            self.periods_years.astype(float)
+        )
+        period_of_timestep = np.fromiter(
+            (p for p, _ in model.TIMEINDEX),
+            dtype=int,
+            count=len(model.TIMEINDEX),
+        )
+        self.timestep_discount_factors = self.period_discount_factors[
+            period_of_timestep
+        ]
+
+        self._decommissioning_periods = {}
+        self._exo_decommissioning_periods = {}
+        self._expired_timeindex = {}
+        self._annuity_factors = {}
+
+    def decommissioning_periods(self, lifetime):
+        """Return the decommissioning period for every investment period.
+
+        The value at index `p` is the first period in which an investment
+        made in period `p` reaches its `lifetime`, or 0 if this does not
+        happen within the optimization horizon.
+        """
+        if lifetime not in self._decommissioning_periods:
+            # index of the minimum value in each row greater equal than the
+            # lifetime, which is zero if the condition is met nowhere
+            self._decommissioning_periods[lifetime] = np.argmin(
+                np.where(
+                    (self.periods_matrix >= lifetime),
+                    self.periods_matrix,
+                    np.inf,
+                ),
+                axis=1,
+            )
+        return self._decommissioning_periods[lifetime]
+
+    def exo_decommissioning_period(self, lifetime, age=0):
+        """Return the period in which an existing capacity of the given
+        `age` is decommissioned or None if it lasts the whole horizon.
+
+        Decommissioning cannot take place in the first period.
+        """
+        key = (lifetime, age)
+        if key not in self._exo_decommissioning_periods:
+            expired = np.flatnonzero(lifetime - age <= self.periods_years[1:])
+            self._exo_decommissioning_periods[key] = (
+                int(expired[0]) + 1 if expired.size else None
+            )
+        return self._exo_decommissioning_periods[key]
+
+    def expired_timeindex(self, lifetime, age=0):
+        """Return all time indices `(p, t)` of periods starting after a unit
+        of the given `age` has reached its `lifetime`.
+        """
+        key = (lifetime, age)
+        if key not in self._expired_timeindex:
+            self._expired_timeindex[key] = tuple(
+                (p, t)
+                for p in np.flatnonzero(
+                    lifetime - age <= self.periods_years
+                ).tolist()
+                for t in self.timesteps_in_period[p]
+            )
+        return self._expired_timeindex[key]
+
+    def annuity_factor(self, n, wacc):
+        """Return the annuity of an investment of 1 over `n` years."""
+        key = (n, wacc)
+        if key not in self._annuity_factors:
+            self._annuity_factors[key] = economics.annuity(
+                capex=1, n=n, wacc=wacc
+            )
+        return self._annuity_factors[key]
+
+    def annuity(self, capex, n, wacc):
+        """Return the annuity of an investment of `capex` over `n` years."""
+        return capex * self.annuity_factor(n, wacc)
+
+    def present_value_factor(self, n, wacc):
+        """Return the present value of an annuity of 1 paid over `n` years."""
+        return 1 / self.annuity_factor(n, wacc)
+
+    def investment_duration(self, p, lifetime):
+        """Return the years an investment made in period `p` is used within
+        the optimization horizon.
+        """
+        return min(
+            self.end_year_of_optimization - int(self.periods_years[p]),
+            lifetime,
+        )
@@ -11,12 +11,20 @@ SPDX-License-Identifier: MIT
 
 """
 
+import hashlib
 import warnings
+import weakref
 from collections import abc
 from itertools import repeat
 
 import numpy as np
 
+# Registries activated by ``with SequenceRegistry(): ...``, innermost last.
+_ACTIVE_REGISTRIES = []
+
+# Lazy sequences currently holding their values.
+_LOADED_LAZY_SEQUENCES = weakref.WeakSet()
+
 
 def sequence(iterable_or_scalar, length=None):
     """Checks if an object is iterable (except string) or scalar and returns
@@ -25,7 +33,10 @@ def sequence(iterable_or_scalar, length=None):
 
     Parameters
     ----------
-    iterable_or_scalar : iterable or None or int or float
+    iterable_or_scalar : iterable or None or int or float or callable
+        A callable (without arguments) returning an iterable is wrapped into
+        a :class:`LazySequence`, which only calls it when the values are
+        needed. Memory maps (`np.memmap`) are used without copying.
 
     Examples
     --------
@@ -48,7 +59,20 @@ def sequence(iterable_or_scalar, length=None):
     >>> x[10]
     10
 
+    If a :class:`SequenceRegistry` is active, numeric arrays are interned by
+    the registry, i.e. identical sequences share the same read-only array.
     """
+    if isinstance(iterable_or_scalar, LazySequence):
+        if length and iterable_or_scalar.size != length:
+            raise ValueError(
+                f"Length mismatch: Cannot create sequence of length {length}"
+                + f" from input {iterable_or_scalar}."
+            )
+        return iterable_or_scalar
+    if callable(iterable_or_scalar) and not isinstance(
+        iterable_or_scalar, abc.Iterable
+    ):
+        return LazySequence(iterable_or_scalar, length=length)
     if len(np.shape(iterable_or_scalar)) > 1:
         d = len(np.shape(iterable_or_scalar))
         raise ValueError(
@@ -68,6 +92,11 @@ def sequence(iterable_or_scalar, length=None):
         else:
             if isinstance(iterable_or_scalar, str):
                 return iterable_or_scalar
+            elif _ACTIVE_REGISTRIES:
+                return _ACTIVE_REGISTRIES[-1].intern(iterable_or_scalar)
+            elif isinstance(iterable_or_scalar, np.memmap):
+                # keep data on disk, pages are read when accessed
+                return iterable_or_scalar
             else:
                 return np.array(iterable_or_scalar)
     else:
@@ -83,6 +112,12 @@ def valid_sequence(sequence, length: int) -> bool:
     if sequence is None:
         return False
 
+    if isinstance(sequence, LazySequence):
+        # a known length can be checked without loading the values
+        if sequence.size == length:
+            return True
+        sequence = sequence.values
+
     if isinstance(sequence, _FakeSequence):
         if sequence.size is None:
             sequence.size = length
@@ -111,6 +146,276 @@ def valid_sequence(sequence, length: int) -> bool:
     return False
 
 
+class LazySequence:
+    """Sequence whose values are only loaded when they are accessed.
+
+    The values are loaded (and cached) on first access, which typically
+    happens while the model is built. This allows to define energy systems
+    with long input time series without loading all of them up front.
+    While a :class:`~oemof.solph.Model` is built, the cached values are
+    released after every block (see :func:`unload_lazy_sequences`), so only
+    the sequences used by one block are held in memory at a time. A
+    sequence used by several blocks is loaded once per block.
+
+    Parameters
+    ----------
+    loader : callable
+        Function without arguments returning a one-dimensional iterable,
+        e.g. a `pd.Series` or a `np.memmap`.
+    length : int or None
+        Length of the sequence. If given, the length can be validated
+        without loading the values.
+
+    Examples
+    --------
+    >>> calls = []
+    >>> def load_profile():
+    ...     calls.append(1)
+    ...     return [0.2, 0.4, 0.6]
+    >>> s = LazySequence(load_profile, length=3)
+    >>> len(s), s.loaded
+    (3, False)
+    >>> s[1]
+    np.float64(0.4)
+    >>> s.max()
+    np.float64(0.6)
+    >>> len(calls)
+    1
+    """
+
+    def __init__(self, loader, length=None):
+        self._loader = loader
+        self._length = length
+        self._values = None
+
+    @classmethod
+    def from_parquet(cls, path, column, length=None):
+        """Create a sequence from a column of a Parquet file.
+
+        Only the requested column is read (using :func:`pandas.read_parquet`,
+        which requires `pyarrow` or `fastparquet`).
+        """
+        import pandas as pd
+
+        def _load_column():
+            return pd.read_parquet(path, columns=[column])[column]
+
+        return cls(_load_column, length=length)
+
+    @property
+    def loaded(self):
+        return self._values is not None
+
+    @property
+    def values(self):
+        """The values as a numpy array, loaded on first access."""
+        if self._values is None:
+            values = sequence(self._loader())
+            if not isinstance(values, np.ndarray):
+                raise ValueError(
+                    f"The loader {self._loader} has to return a"
+                    + " one-dimensional iterable."
+                )
+            if self._length is not None and values.size != self._length:
+                raise ValueError(
+                    f"Length of loaded sequence ({values.size}) differs from"
+                    + f" given length ({self._length})."
+                )
+            self._values = values
+            _LOADED_LAZY_SEQUENCES.add(self)
+        return self._values
+
+    def unload(self):
+        """Drop the cached values, they will be reloaded when needed."""
+        self._values = None
+        _LOADED_LAZY_SEQUENCES.discard(self)
+
+    @property
+    def size(self):
+        if self._length is None:
+            return self.values.size
+        return self._length
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.values, dtype=dtype, copy=True)
+        if copy is False and not (
+            dtype is None or np.dtype(dtype) == self.values.dtype
+        ):
+            raise ValueError(
+                f"Unable to avoid a copy when converting to {dtype}."
+            )
+        return np.asarray(self.values, dtype=dtype)
+
+    def __repr__(self):
+        if self.loaded:
+            return repr(self.values)
+        return f"LazySequence({self._loader}, length={self._length})"
+
+    def max(self):
+        return self.values.max()
+
+    def min(self):
+        return self.values.min()
+
+    def sum(self):
+        return self.values.sum()
+
+    def to_numpy(self, length=None):
+        return self.values
+
+    def __mul__(self, other):
+        return self.values * other
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return self.values / other
+
+
+def unload_lazy_sequences():
+    """Drop the cached values of all loaded :class:`LazySequence` objects.
+
+    Examples
+    --------
+    >>> s = LazySequence(lambda: [1, 2, 3])
+    >>> s.max(), s.loaded
+    (np.int64(3), True)
+    >>> unload_lazy_sequences()
+    >>> s.loaded
+    False
+    """
+    for lazy_sequence in list(_LOADED_LAZY_SEQUENCES):
+        lazy_sequence.unload()
+
+
+class SequenceRegistry:
+    """Deduplicated storage for numeric sequences.
+
+    While the registry is active (used as a context manager), all numeric
+    sequences created by :func:`sequence`, e.g. the `fix`, `maximum` or
+    `variable_costs` of a :class:`~oemof.solph.flows.Flow`, are interned:
+    Identical sequences are stored only once and shared as read-only arrays.
+    NumPy arrays, pandas objects and `np.memmap` objects are used without
+    copying the data if no conversion of the data type is needed.
+
+    Parameters
+    ----------
+    dtype : numpy dtype or None
+        If given, floating point sequences are stored using this data type,
+        e.g. `np.float32` to halve the memory needed. Note that this might
+        alter the values slightly. Integer and boolean sequences keep their
+        data type.
+
+    Note
+    ----
+    The registry keeps views on the given data. Input arrays must not be
+    modified after they have been passed to a sequence.
+
+    Examples
+    --------
+    >>> from oemof import solph
+    >>> profile = np.array([0.1, 0.5, 0.9])
+    >>> with solph.SequenceRegistry() as registry:
+    ...     f1 = solph.flows.Flow(fix=profile, nominal_capacity=5)
+    ...     f2 = solph.flows.Flow(fix=list(profile), nominal_capacity=2)
+    >>> f1.fix is f2.fix
+    True
+    >>> f1.fix.flags.writeable
+    False
+    >>> report = registry.memory_report()
+    >>> report["sequences"], report["unique"], report["saved_bytes"]
+    (2, 1, 24)
+    """
+
+    def __init__(self, dtype=None):
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self._arrays = {}
+        self._requests = 0
+        self._requested_bytes = 0
+
+    def __enter__(self):
+        _ACTIVE_REGISTRIES.append(self)
+        return self
+
+    def __exit__(self, *_):
+        _ACTIVE_REGISTRIES.remove(self)
+
+    def intern(self, iterable):
+        """Return a read-only array with the values of `iterable`.
+
+        If an identical array has been interned before, that array is
+        returned instead of a new one.
+        """
+        # np.asarray does not copy numpy arrays (including np.memmap) and
+        # numeric pandas objects without missing values
+        array = np.asarray(iterable)
+        if array.dtype.kind not in "biuf":
+            return np.array(iterable)
+
+        if self.dtype is not None and array.dtype.kind == "f":
+            array = array.astype(self.dtype, copy=False)
+
+        self._requests += 1
+        self._requested_bytes += array.nbytes
+
+        if not array.flags.c_contiguous:
+            array = np.ascontiguousarray(array)
+        key = (
+            array.dtype.str,
+            array.shape,
+            hashlib.blake2b(array.data, digest_size=16).digest(),
+        )
+        candidates = self._arrays.setdefault(key, [])
+        for candidate in candidates:
+            if np.array_equal(candidate, array):
+                return candidate
+
+        # read-only view, the original array stays writeable
+        interned = array.view(np.ndarray)
+        interned.flags.writeable = False
+        candidates.append(interned)
+        return interned
+
+    def memory_report(self):
+        """Summarise the memory saved by deduplication.
+
+        Returns
+        -------
+        dict
+            Number of interned `sequences`, number of `unique` arrays,
+            `requested_bytes` (memory needed without deduplication),
+            `stored_bytes` and `saved_bytes`.
+        """
+        stored_bytes = sum(
+            array.nbytes
+            for candidates in self._arrays.values()
+            for array in candidates
+        )
+        return {
+            "sequences": self._requests,
+            "unique": sum(len(c) for c in self._arrays.values()),
+            "requested_bytes": self._requested_bytes,
+            "stored_bytes": stored_bytes,
+            "saved_bytes": self._requested_bytes - stored_bytes,
+        }
+
+    def clear(self):
+        """Forget all interned arrays and reset the statistics."""
+        self._arrays = {}
+        self._requests = 0
+        self._requested_bytes = 0
+
+
 class _FakeSequence:
     """Emulates a list whose length is not known in advance.
 
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+"""Presolve steps on the energy system graph of a model.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import logging
+from contextlib import contextmanager
+
+import numpy as np
+from pyomo import environ as po
+from pyomo.common.collections import ComponentMap
+from pyomo.core.expr.visitor import ExpressionReplacementVisitor
+
+from oemof.solph.buses._bus import BusBlock
+from oemof.solph.components._converter import ConverterBlock
+from oemof.solph.components._generic_storage import GenericStorage
+from oemof.solph.components._link import LinkBlock
+
+
+def _values(sequence, length):
+    return np.fromiter(
+        (sequence[t] for t in range(length)), dtype=float, count=length
+    )
+
+
+def _maximal_capacity(model, investment):
+    """Largest total capacity of an investment in any period.
+
+    In multi-period models, the investments of all periods can add up, so
+    the sum of the maximal investments per period is the bound, unless the
+    `overall_maximum` of the total capacity is smaller.
+    """
+    capacity = investment.existing + sum(
+        investment.maximum[p] for p in model.PERIODS
+    )
+    if model.es.periods is not None and investment.overall_maximum is not None:
+        capacity = min(capacity, investment.overall_maximum)
+    return capacity
+
+
+def _initial_flow_bounds(model):
+    """Bounds of the flows per timestep given by their own attributes."""
+    length = len(model.TIMESTEPS)
+    bounds = {}
+    for (i, o), flow in model.flows.items():
+        lower = np.zeros(length)
+        upper = np.full(length, np.inf)
+        relative = _values(
+            flow.fix if flow.fix is not None else flow.maximum, length
+        )
+        if flow.nominal_capacity is not None:
+            upper = relative * flow.nominal_capacity
+            if flow.fix is not None:
+                lower = upper.copy()
+            elif flow.nonconvex is None:
+                lower = _values(flow.minimum, length) * flow.nominal_capacity
+        elif flow.investment is not None:
+            capacity = _maximal_capacity(model, flow.investment)
+            with np.errstate(invalid="ignore"):
+                # a relative maximum of zero allows no flow in any case
+                upper = np.where(relative > 0, relative * capacity, 0)
+        bounds[i, o] = [lower, upper]
+    return bounds
+
+
+def flow_bounds(model, max_iterations=20):
+    """Derive bounds of all flows per timestep from the balances of buses
+    and the conversion factors of converters.
+
+    Starting from the bounds given by the flows (`fix`, `minimum` and
+    `maximum` with the `nominal_capacity` or the maximal total capacity of
+    investments), the bounds are propagated through the balance of every
+    balanced bus and the linear relation of every converter until they
+    do not change anymore. The bounds hold for every feasible solution of
+    the model.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        Model with the parent block sets.
+    max_iterations : int
+        Maximal number of sweeps over all buses and converters.
+
+    Returns
+    -------
+    dict
+        Lower and upper bound (as numpy arrays over all timesteps) per flow,
+        indexed by `(source, target)`.
+    """
+    bounds = _initial_flow_bounds(model)
+    buses, converters = (
+        (
+            model.es.groups.get(group, [])
+            if group in model._constraint_groups
+            else []
+        )
+        for group in (BusBlock, ConverterBlock)
+    )
+    bidirectional = set(model.BIDIRECTIONAL_FLOWS)
+    length = len(model.TIMESTEPS)
+    zero = np.zeros(length)
+
+    def _tighten(flow, lower, upper):
+        old_lower, old_upper = bounds[flow]
+        new_lower = np.maximum(old_lower, lower)
+        new_upper = np.minimum(old_upper, upper)
+        changed = bool(
+            np.any(new_lower > old_lower + 1e-9)
+            or np.any(new_upper < old_upper - 1e-9)
+        )
+        bounds[flow] = [new_lower, new_upper]
+        return changed
+
+    def _bus(node):
+        inflows = [(i, node) for i in node.inputs]
+        outflows = [(node, o) for o in node.outputs]
+        if bidirectional.intersection(inflows + outflows):
+            return False
+        changed = False
+        for flows, others in [(inflows, outflows), (outflows, inflows)]:
+            other_lower = sum((bounds[f][0] for f in others), zero)
+            other_upper = sum((bounds[f][1] for f in others), zero)
+            for f in flows:
+                rest = [g for g in flows if g != f]
+                changed |= _tighten(
+                    f,
+                    other_lower - sum((bounds[g][1] for g in rest), zero),
+                    other_upper - sum((bounds[g][0] for g in rest), zero),
+                )
+        return changed
+
+    def _converter(node):
+        changed = False
+        for i in node.inputs:
+            for o in node.outputs:
+                inflow, outflow = (i, node), (node, o)
+                if bidirectional.intersection([inflow, outflow]):
+                    continue
+                factor_in = _values(node.conversion_factors[i], length)
+                factor_out = _values(node.conversion_factors[o], length)
+                valid = (factor_in > 0) & (factor_out > 0)
+                # flow_in * factor_out == flow_out * factor_in
+                ratio = np.where(valid, factor_out, 1) / np.where(
+                    valid, factor_in, 1
+                )
+                for source, target, r in [
+                    (inflow, outflow, ratio),
+                    (outflow, inflow, 1 / ratio),
+                ]:
+                    lower, upper = bounds[source]
+                    changed |= _tighten(
+                        target,
+                        np.where(valid, lower * r, 0),
+                        np.where(valid, upper * r, np.inf),
+                    )
+        return changed
+
+    for _ in range(max_iterations):
+        changed = False
+        for node in buses:
+            changed |= _bus(node)
+        for node in converters:
+            changed |= _converter(node)
+        if not changed:
+            break
+    return bounds
+
+
+def _dominated_investment(flow, source, target):
+    """Check if capacity beyond the largest possible flow is useless."""
+    investment = flow.investment
+    return (
+        flow.full_load_time_max is None
+        and not flow.bidirectional
+        and all(
+            costs is None or costs.min() >= 0
+            for costs in (investment.ep_costs, investment.fixed_costs)
+        )
+        and not isinstance(source, GenericStorage)
+        and not isinstance(target, GenericStorage)
+    )
+
+
+def investment_bounds(model):
+    """Tightened maximal investment into flows, used as big-M values.
+
+    The investment into a flow never needs to exceed the largest flow
+    possible according to :func:`flow_bounds`, divided by its relative
+    maximum (or `fix`). Flows are left out, if more capacity could be
+    needed or useful for other reasons: a `full_load_time_max`, negative
+    costs or a connection to a storage, which can link the investment to
+    the storage capacity.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        Model with the parent block sets.
+
+    Returns
+    -------
+    dict
+        Tightened maximal investment per investment flow, indexed by
+        `(source, target)`. The bound is never smaller than the minimal
+        investment, see :func:`oemof.solph.flows._shared.investment_maximum`.
+    """
+    flows = {
+        (i, o): flow
+        for (i, o), flow in model.flows.items()
+        if flow.investment is not None and _dominated_investment(flow, i, o)
+    }
+    if not flows:
+        return {}
+
+    length = len(model.TIMESTEPS)
+    bounds = flow_bounds(model)
+    result = {}
+    for (i, o), flow in flows.items():
+        relative = _values(
+            flow.fix if flow.fix is not None else flow.maximum, length
+        )
+        upper = bounds[i, o][1]
+        used = relative > 0
+        if np.isinf(upper[used]).any():
+            continue
+        bound = float((upper[used] / relative[used]).max(initial=0))
+        maximum = max(flow.investment.maximum[p] for p in model.PERIODS)
+        if bound < maximum:
+            result[i, o] = bound
+            logging.info(
+                f"Maximal investment into flow {i} -> {o}"
+                + f" tightened from {maximum} to {bound}."
+            )
+    return result
+
+
+def _flow_relations(model):
+    """Equations `flow[a, t] == factor[t] * flow[b, t]` of two flows stated
+    by balanced buses with a single input and output, converters and links,
+    together with the constraints stating them."""
+    length = len(model.TIMESTEPS)
+    groups = {
+        group: model.es.groups.get(group, [])
+        for group in (BusBlock, ConverterBlock, LinkBlock)
+        if group in model._constraint_groups
+    }
+
+    # duals of the bus balances are part of the results
+    if not isinstance(model.dual, po.Suffix):
+        for bus in groups.get(BusBlock, []):
+            if len(bus.inputs) == 1 and len(bus.outputs) == 1:
+                (i,) = bus.inputs
+                (o,) = bus.outputs
+                yield (bus, o), (i, bus), np.ones(length), [
+                    model.BusBlock.balance[bus, t] for t in model.TIMESTEPS
+                ]
+
+    for node in groups.get(ConverterBlock, []):
+        for i in node.inputs:
+            for o in node.outputs:
+                factor_in = _values(node.conversion_factors[i], length)
+                factor_out = _values(node.conversion_factors[o], length)
+                if (factor_in > 0).all() and (factor_out > 0).all():
+                    yield (node, o), (i, node), factor_out / factor_in, [
+                        model.ConverterBlock.relation[node, i, o, t]
+                        for t in model.TIMESTEPS
+                    ]
+
+    for node in groups.get(LinkBlock, []):
+        for (i, o), factor in node.conversion_factors.items():
+            factor = _values(factor, length)
+            if (factor > 0).all():
+                yield (node, o), (i, node), factor, [
+                    model.LinkBlock.relation[node, i, o, t]
+                    for t in model.TIMESTEPS
+                ]
+
+
+def flow_aliases(model):
+    """Find flows which can be expressed by other flows.
+
+    Balanced buses with a single input and a single output, converters and
+    links state equations :math:`P_a(t) = f(t) \\cdot P_b(t)` between two
+    flows with a positive factor :math:`f`. Chains of such equations are
+    resolved, so that every eliminated flow is expressed by a remaining
+    flow. Equations which are implied by others (e.g. of a converter with
+    several inputs and outputs) are kept. Flows with fixed or integer
+    values are never eliminated.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        Model with the parent block sets, variables and blocks.
+
+    Returns
+    -------
+    tuple
+        Dictionary of the eliminated flows, indexed by `(source, target)`,
+        with the remaining flow and the factors (as numpy array over all
+        timesteps) expressing them, and the list of constraints which are
+        implied by these aliases.
+    """
+    length = len(model.TIMESTEPS)
+    eligible = {
+        flow
+        for flow in model.FLOWS
+        if all(
+            not model.flow[flow + (t,)].fixed
+            and model.flow[flow + (t,)].is_continuous()
+            for t in model.TIMESTEPS
+        )
+    }
+
+    # flow -> (parent flow, factor) with flow == factor * parent flow
+    parents = {}
+
+    def _root(flow):
+        factor = np.ones(length)
+        while flow in parents:
+            flow, parent_factor = parents[flow]
+            factor = factor * parent_factor
+        return flow, factor
+
+    implied = []
+    for a, b, factor, constraints in _flow_relations(model):
+        if a not in eligible or b not in eligible:
+            continue
+        root_a, factor_a = _root(a)
+        root_b, factor_b = _root(b)
+        if root_a == root_b:
+            continue
+        parents[root_a] = (root_b, factor * factor_b / factor_a)
+        implied.extend(constraints)
+
+    return {flow: _root(flow) for flow in parents}, implied
+
+
+def _transfer_bounds(var, root, factor):
+    """Restrict `root` to the bounds of `var == factor * root`."""
+    lower, upper = var.bounds
+    if lower is not None:
+        lower = lower / factor
+        root.setlb(lower if root.lb is None else max(root.lb, lower))
+    if upper is not None:
+        upper = upper / factor
+        root.setub(upper if root.ub is None else min(root.ub, upper))
+
+
+@contextmanager
+def eliminated(model, eliminate_flows):
+    """Eliminate the aliased flows of the `model` while the context is
+    active.
+
+    Every flow found by :func:`flow_aliases` is substituted by the remaining
+    flow it is expressed by in all active constraints and objectives. Its
+    bounds are transferred to the remaining flow, and the constraints
+    implied by the aliases are deactivated. When leaving the context, the
+    model is restored and the eliminated flows get their values from the
+    remaining flows.
+    """
+    if not eliminate_flows:
+        model.eliminated_flows = {}
+        yield
+        return
+
+    aliases, implied = flow_aliases(model)
+    model.eliminated_flows = aliases
+    logging.info(
+        f"Eliminated {len(aliases)} flows and {len(implied)} constraints."
+    )
+    substitute = {
+        id(model.flow[i, o, t]): float(factor[t]) * model.flow[ri, ro, t]
+        for (i, o), ((ri, ro), factor) in aliases.items()
+        for t in model.TIMESTEPS
+    }
+    visitor = ExpressionReplacementVisitor(
+        substitute=substitute,
+        descend_into_named_expressions=True,
+        remove_named_expressions=True,
+    )
+
+    bounds = ComponentMap()
+    constraints = []
+    objectives = []
+    try:
+        for (i, o), ((ri, ro), factor) in aliases.items():
+            for t in model.TIMESTEPS:
+                root = model.flow[ri, ro, t]
+                if root not in bounds:
+                    bounds[root] = root.bounds
+                _transfer_bounds(model.flow[i, o, t], root, float(factor[t]))
+        for constraint in implied:
+            constraint.deactivate()
+        for constraint in model.component_data_objects(
+            po.Constraint, active=True, descend_into=True
+        ):
+            expr = constraint.expr
+            new_expr = visitor.walk_expression(expr)
+            if new_expr is not expr:
+                constraints.append((constraint, expr))
+                constraint.set_value(new_expr)
+        for objective in model.component_data_objects(
+            po.Objective, active=True, descend_into=True
+        ):
+            expr = objective.expr
+            objectives.append((objective, expr))
+            objective.expr = visitor.walk_expression(expr)
+
+        yield
+    finally:
+        for constraint, expr in constraints:
+            constraint.set_value(expr)
+        for objective, expr in objectives:
+            objective.expr = expr
+        for constraint in implied:
+            constraint.activate()
+        for root, (lb, ub) in bounds.items():
+            root.setlb(lb)
+            root.setub(ub)
+        for (i, o), ((ri, ro), factor) in aliases.items():
+            for t in model.TIMESTEPS:
+                value = model.flow[ri, ro, t].value
+                model.flow[i, o, t].set_value(
+                    None if value is None else float(factor[t]) * value,
+                    skip_validation=True,
+                )
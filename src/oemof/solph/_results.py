@@ -13,13 +13,16 @@ SPDX-License-Identifier: MIT
 import warnings
 from collections.abc import Hashable
 
+import numpy as np
 import pandas as pd
 from oemof.tools.debugging import ExperimentalFeatureWarning
 from pyomo.core.base.var import Var
+from pyomo.environ import Block
 from pyomo.environ import ConcreteModel
+from pyomo.environ import value
 from pyomo.opt.results.container import ListContainer
 
-import oemof.solph
+from oemof.solph._plumbing import _FakeSequence
 
 
 class Results:
@@ -28,7 +31,9 @@ class Results:
     Takes pyomo results and uses keys to access different types of results.
     Some of these keys are related to meta_results of the solver,
     and some of the variables are related to the oemof.solph model.
-    Examples are 'flow', 'storage_content', and 'invest'.
+    Examples are 'flow', 'storage_content', and 'invest'. The statistics
+    of the model (e.g. 'build_time', 'solver_wall_time', 'rows' or 'nodes')
+    are available as keys, too.
 
     Example
     -------
@@ -44,6 +49,7 @@ class Results:
         self._solver_results = model.solver_results
         self._meta_results = {
             "objective": model.objective(),
+            **getattr(model, "solve_statistics", {}),
         }
         self._variables = {}
         self._model = model
@@ -78,7 +84,9 @@ class Results:
         # adss additional keys for the calculation of opex and capex
         # if the keyword eval_economy is True
         # checks if investment optimization is happing to add capex as key
-        # TODO: add keyword for multiperiod
+        # in multi-period models, variable costs are discounted to the start
+        # of the optimization horizon and investment costs are the terms of
+        # the objective (annuities within the horizon and fixed costs)
 
         self._economy = {"variable_costs": None}
         if "invest" in self._variables.keys():
@@ -193,6 +201,18 @@ class Results:
             category=FutureWarning,
         )
 
+    def _discount_factors(self):
+        """Return the discount factor of every timestep.
+
+        For a standard model all factors are 1. For a multi-period model,
+        the factors equal :math:`(1 + dr)^{-year(p)}` of the period of the
+        timestep as used for the variable costs in the objective function.
+        """
+        m = self._model
+        if m.period_cache is None:
+            return np.ones(len(m.TIMESTEPS))
+        return m.period_cache.timestep_discount_factors
+
     def _calc_capex(self):
         self._economy_calculation_waring()
         # extract the the optimized investment sizes
@@ -201,85 +221,79 @@ class Results:
         except KeyError:  # no investments
             return pd.DataFrame()
 
-        # Initialize an empty dictionary to collect results
-        capex_data = {}
-
-        # calculate yearly investment costs associated with investment FLOWS
-        # and store data in capex_data dictionary
-
-        # TODO: is it really necessary to loop over all flows again or is it
-        # possible to use the flows of 'invest_values'?
-        for i, o in self._model.FLOWS:
-
-            # access the costs of each investment flow
-            if hasattr(self._model.flows[i, o], "investment"):
-
-                # map investment and costs and multiply
-                for col in invest_values.columns:
-                    if isinstance(col, oemof.solph.components.GenericStorage):
-                        pass
-                    else:
-                        if col[0] == i and col[1] == o:
-                            invest_size = invest_values[col][0]
-
-                            investment_costs = (
-                                self._model.flows[i, o].investment.ep_costs[0]
-                                * invest_size
-                                + self._model.flows[i, o].investment.offset[0]
-                            )
-
-                            # Save values to dictionary
-                            capex_data[col] = investment_costs
-
-            else:
-                pass
-
-        # calculate yearly investment costs associated with GenericStorages
-        # and store data in capex_data dictionary
-        for node in self._model.nodes:
-            if isinstance(
-                node,
-                oemof.solph.components._generic_storage.GenericStorage,
-            ):
-
-                # map investment and costs and mulitply
-                for col in invest_values.columns:
-                    if isinstance(col, oemof.solph.components.GenericStorage):
-                        if col == node:
-                            invest_size = invest_values[col][0]
-
-                            investment_costs = (
-                                node.investment.ep_costs[0] * invest_size
-                                + node.investment.offset[0]
-                            )
-
-                            # Save values to dictionary
-                            capex_data[col] = investment_costs
-                    else:
-                        pass
-
-        df_capex = pd.DataFrame([capex_data])
+        # investment options are either attached to a flow (keyed by a tuple)
+        # or to a node itself, e.g. the capacity of a GenericStorage
+        investments = [
+            (
+                self._model.flows[col].investment
+                if isinstance(col, tuple)
+                else col.investment
+            )
+            for col in invest_values.columns
+        ]
+        n_periods = len(invest_values.index)
+
+        # aligned (period x investment) cost matrices
+        ep_costs = _cost_matrix(
+            [inv.ep_costs for inv in investments], n_periods
+        )
+        offset = _cost_matrix([inv.offset for inv in investments], n_periods)
+
+        # the offset only applies if the investment is actually made
+        status = self.get("invest_status")
+        if status is None:
+            status = pd.DataFrame(index=invest_values.index)
+        status = status.reindex(
+            index=invest_values.index,
+            columns=invest_values.columns,
+            fill_value=1,
+        ).to_numpy(dtype=float)
+
+        capex = (
+            invest_values.to_numpy(dtype=float) * ep_costs + status * offset
+        )
 
-        return df_capex
+        # multi-period investment blocks charge annuities for the years
+        # within the horizon and fixed costs, so their terms are used
+        rows = {p: k for k, p in enumerate(invest_values.index)}
+        columns = {col: k for k, col in enumerate(invest_values.columns)}
+        for block in self._model.component_data_objects(Block):
+            for key, costs in getattr(block, "option_costs", {}).items():
+                *option, period = key
+                option = tuple(option) if len(option) > 1 else option[0]
+                capex[rows[period], columns[option]] = value(costs)
+
+        return pd.DataFrame(
+            capex, index=invest_values.index, columns=invest_values.columns
+        )
 
     def _calc_variable_costs(self):
         self._economy_calculation_waring()
-        df_opex = pd.DataFrame()
 
         # extract the the optimized flow values
         flow_values = self.get("flow", pd.DataFrame())
+        if flow_values.empty:
+            return pd.DataFrame()
+
+        n_timesteps = len(flow_values.index)
+
+        # aligned (timestep x flow) cost matrix
+        variable_costs = _cost_matrix(
+            [self._model.flows[col].variable_costs for col in flow_values],
+            n_timesteps,
+        )
 
-        for i, o in self._model.FLOWS:
-            # access the variable costs of each flow
-            variable_costs = self._model.flows[i, o].variable_costs
+        per_timestep = self._discount_factors()
 
-            # map flows and variable costs and mulitply
-            for col in flow_values.columns:
-                if col[0] == i and col[1] == o:
-                    opex = flow_values[col] * variable_costs
-                    df_opex[col] = opex
+        opex = (
+            flow_values.to_numpy(dtype=float)
+            * variable_costs
+            * per_timestep[:n_timesteps, np.newaxis]
+        )
 
-        return df_opex
+        return pd.DataFrame(
+            opex, index=flow_values.index, columns=flow_values.columns
+        )
 
     # --- BEGIN: The following code can be removed for versions >= v0.7 ---
     @property
@@ -325,3 +339,20 @@ class Results:
 
     def __contains__(self, key: Hashable) -> bool:
         return key in self._solver_results or key in self._variables
+
+
+def _cost_matrix(sequences, length):
+    """Stack cost sequences column-wise into a (length x n) array.
+
+    Scalars (:class:`_FakeSequence`) are broadcast, `None` is treated as
+    zero costs and longer arrays are cut to the given length.
+    """
+    matrix = np.zeros((length, len(sequences)))
+    for k, seq in enumerate(sequences):
+        if seq is None:
+            continue
+        elif isinstance(seq, _FakeSequence):
+            matrix[:, k] = seq.value
+        else:
+            matrix[:, k] = np.asarray(seq, dtype=float)[:length]
+    return matrix
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""Numerical scaling of flow variables and of the objective.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import math
+import numbers
+from contextlib import contextmanager
+
+from pyomo import environ as po
+from pyomo.common.collections import ComponentMap
+from pyomo.core.expr.visitor import ExpressionReplacementVisitor
+from pyomo.repn import generate_standard_repn
+
+# variables measured in the unit of the flow they are indexed by
+FLOW_UNIT_VARIABLES = (
+    "flow",
+    "invest",
+    "total",
+    "old",
+    "old_end",
+    "old_exo",
+    "status_nominal",
+)
+
+
+def flow_units(model, flow_scaling):
+    """Return the unit of every scaled flow of the `model`.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+    flow_scaling : None, 'nominal_capacity', numeric or dict
+        See :class:`oemof.solph.Model`.
+
+    Returns
+    -------
+    dict
+        Unit of every scaled flow, indexed by `(source, target)`.
+    """
+    if flow_scaling is None:
+        return {}
+    if isinstance(flow_scaling, numbers.Real):
+        units = {flow: flow_scaling for flow in model.FLOWS}
+    elif isinstance(flow_scaling, dict):
+        units = {
+            flow: unit for flow, unit in flow_scaling.items() if unit != 1
+        }
+        unknown = [flow for flow in units if flow not in model.flows]
+        if unknown:
+            raise ValueError(
+                f"Cannot scale {unknown}, these flows are not part of the"
+                + " model."
+            )
+    elif flow_scaling == "nominal_capacity":
+        units = {}
+        for flow, obj in model.flows.items():
+            if obj.nominal_capacity is not None:
+                units[flow] = obj.nominal_capacity
+            elif obj.investment is not None:
+                # the largest possible capacity, if it is known
+                units[flow] = obj.investment.existing + max(
+                    obj.investment.maximum[p] for p in model.PERIODS
+                )
+        units = {
+            flow: unit
+            for flow, unit in units.items()
+            if math.isfinite(unit) and unit > 0 and unit != 1
+        }
+    else:
+        raise ValueError(
+            "The flow_scaling has to be None, 'nominal_capacity', a number"
+            + f" or a dict but is {flow_scaling}."
+        )
+
+    for flow, unit in units.items():
+        if not (isinstance(unit, numbers.Real) and 0 < unit < math.inf):
+            raise ValueError(
+                f"The unit of the flow {flow} has to be a positive number"
+                + f" but is {unit}."
+            )
+    return units
+
+
+def _objective_factor(expr):
+    """Power of ten moving the objective coefficients of `expr` around 1."""
+    repn = generate_standard_repn(expr, compute_values=True, quadratic=False)
+    coefficients = [abs(c) for c in repn.linear_coefs if c != 0]
+    if not coefficients:
+        return 1.0
+    center = (
+        math.log10(max(coefficients)) + math.log10(min(coefficients))
+    ) / 2
+    return 10.0 ** -round(center)
+
+
+@contextmanager
+def scaled(model, flow_scaling, objective_scaling):
+    """Scale the `model` while the context is active.
+
+    Every scaled flow :math:`x = u \\cdot y` is substituted by a variable
+    :math:`y` measured in its unit :math:`u`. This applies to the `flow`
+    and to all variables in the same unit, e.g. the `invest` of investment
+    flows. The objective is multiplied by the `objective_scaling` factor.
+    When leaving the context, the original constraints and bounds are
+    restored and the solution, duals and reduced costs are transformed back
+    to the original units.
+    """
+    units = flow_units(model, flow_scaling)
+    if not units and not isinstance(objective_scaling, numbers.Real):
+        yield
+        return
+
+    factors = ComponentMap()
+    for component in model.component_objects(po.Var, descend_into=True):
+        if component.local_name not in FLOW_UNIT_VARIABLES:
+            continue
+        for index, var in component.items():
+            if isinstance(index, tuple) and index[:2] in units:
+                factors[var] = units[index[:2]]
+
+    visitor = ExpressionReplacementVisitor(
+        substitute={id(var): unit * var for var, unit in factors.items()},
+        descend_into_named_expressions=True,
+        remove_named_expressions=True,
+    )
+    bounds = ComponentMap()
+    constraints = []
+    objectives = []
+    try:
+        for var, unit in factors.items():
+            bounds[var] = (var.lb, var.ub)
+            if var.lb is not None:
+                var.setlb(var.lb / unit)
+            if var.ub is not None:
+                var.setub(var.ub / unit)
+            if var.value is not None:
+                var.set_value(var.value / unit, skip_validation=True)
+
+        for constraint in model.component_data_objects(
+            po.Constraint, active=True, descend_into=True
+        ):
+            expr = constraint.expr
+            new_expr = visitor.walk_expression(expr)
+            if new_expr is not expr:
+                constraints.append((constraint, expr))
+                constraint.set_value(new_expr)
+
+        for objective in model.component_data_objects(
+            po.Objective, active=True, descend_into=True
+        ):
+            expr = objective.expr
+            new_expr = visitor.walk_expression(expr)
+            if objective_scaling == "auto":
+                factor = _objective_factor(new_expr)
+            elif objective_scaling is None:
+                factor = 1.0
+            else:
+                factor = objective_scaling
+            objectives.append((objective, expr, factor))
+            objective.expr = factor * new_expr
+
+        yield
+    finally:
+        for constraint, expr in constraints:
+            constraint.set_value(expr)
+        for objective, expr, _ in objectives:
+            objective.expr = expr
+        for var, (lb, ub) in bounds.items():
+            var.setlb(lb)
+            var.setub(ub)
+            if var.value is not None:
+                var.set_value(var.value * factors[var], skip_validation=True)
+
+        factor = objectives[0][2] if len(objectives) == 1 else 1.0
+        if isinstance(model.dual, po.Suffix):
+            for constraint, value in list(model.dual.items()):
+                if value is not None:
+                    model.dual[constraint] = value / factor
+        if isinstance(model.rc, po.Suffix):
+            for var, value in list(model.rc.items()):
+                if value is not None:
+                    model.rc[var] = value / factor / factors.get(var, 1.0)
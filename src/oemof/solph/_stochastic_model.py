@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+"""Two-stage stochastic model with scenarios of the time series.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import logging
+import math
+import warnings
+
+from pyomo import environ as po
+from pyomo.opt import SolverFactory
+
+from oemof.solph import processing
+from oemof.solph._models import Model
+from oemof.solph._plumbing import sequence
+from oemof.solph.decomposition import _is_operational
+
+
+class StochasticModel(po.ConcreteModel):
+    """Two-stage stochastic model of an energy system.
+
+    The investment decisions (first stage) are taken once for all
+    scenarios, the operation (second stage) is optimized per scenario. The
+    objective is the expected value of the costs, weighted by the
+    probabilities of the scenarios.
+
+    Every scenario is a :class:`Model <oemof.solph.Model>` of the same
+    energy system, with the time series given for this scenario. The nodes
+    are shared by all scenarios, so the sequences which do not differ
+    between the scenarios are only stored once. The scenario models are
+    blocks of this model. All variables not indexed by timesteps (e.g.
+    `invest`, `total` or `invest_status`) are first stage variables, which
+    are equal in all scenarios.
+
+    The model is the deterministic equivalent: a complete model is built
+    for every scenario and the first stage variables are linked by
+    equality constraints. Building it therefore takes at least as long as
+    building the scenario models one after another, and the whole model
+    is passed to the solver at once. The options applied by
+    :meth:`Model.solve <oemof.solph.Model.solve>` (`flow_scaling`,
+    `objective_scaling` and `eliminate_flows`) are not supported.
+
+    Parameters
+    ----------
+    energysystem : EnergySystem object
+        Object that holds the nodes of an oemof energy system graph.
+    scenarios : list of dict
+        Time series of every scenario, given as dict of the values indexed
+        by the object (e.g. a flow, a node or a dict like the
+        `conversion_factors` of a converter) and the name of the attribute
+        (or key), e.g. `{(wind_flow, "maximum"): profile}`. Attributes not
+        given keep the values of the energy system.
+    probabilities : list of float or None
+        Probability of every scenario. Equal probabilities if None.
+    kwargs
+        Passed to every :class:`Model <oemof.solph.Model>`, except the
+        options applied while solving, which raise a ValueError.
+
+    Attributes
+    ----------
+    scenarios : list of Model
+        Model of every scenario, with the results after solving
+    probabilities : list of float
+        Probability of every scenario
+    solver_results : `pyomo.opt.results.results_.SolverResults` or None
+        Solver results of the last solve
+    nonanticipativity : `pyomo.core.base.constraint.ConstraintList`
+        Constraints equating the first stage variables of the scenarios
+
+    Examples
+    --------
+    >>> from oemof import solph
+    >>> es = solph.EnergySystem(
+    ...     timeindex=solph.create_time_index(2020, number=2),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = solph.Bus(label="el")
+    >>> pv = solph.Flow(
+    ...     maximum=[1, 0], nominal_capacity=solph.Investment(ep_costs=10)
+    ... )
+    >>> es.add(
+    ...     bus,
+    ...     solph.components.Source(label="pv", outputs={bus: pv}),
+    ...     solph.components.Source(
+    ...         label="grid", outputs={bus: solph.Flow(variable_costs=20)}
+    ...     ),
+    ...     solph.components.Sink(
+    ...         label="demand",
+    ...         inputs={bus: solph.Flow(nominal_capacity=1, fix=[1, 1])},
+    ...     ),
+    ... )
+    >>> model = solph.StochasticModel(
+    ...     es, [{(pv, "maximum"): [1, 0]}, {(pv, "maximum"): [1, 1]}]
+    ... )
+    >>> _ = model.solve(solver="cbc")
+    >>> invest = [
+    ...     s.InvestmentFlowBlock.invest["pv", "el", 0]()
+    ...     for s in model.scenarios
+    ... ]
+    >>> invest
+    [1.0, 1.0]
+    >>> float(model.objective())
+    20.0
+    """
+
+    def __init__(self, energysystem, scenarios, probabilities=None, **kwargs):
+        super().__init__()
+        if probabilities is None:
+            probabilities = [1 / len(scenarios)] * len(scenarios)
+        if len(probabilities) != len(scenarios):
+            raise ValueError(
+                f"{len(probabilities)} probabilities are given for"
+                + f" {len(scenarios)} scenarios."
+            )
+        if not math.isclose(sum(probabilities), 1):
+            raise ValueError(
+                "The probabilities of the scenarios have to add up to 1, but"
+                + f" their sum is {sum(probabilities)}."
+            )
+        unsupported = [
+            name
+            for name in (
+                "flow_scaling",
+                "objective_scaling",
+                "eliminate_flows",
+            )
+            if name in kwargs
+        ]
+        if unsupported:
+            raise ValueError(
+                f"The options {', '.join(unsupported)} are applied by"
+                + " Model.solve only and not supported by the StochasticModel."
+            )
+        self.es = energysystem
+        self.probabilities = list(probabilities)
+        self.solver_results = None
+
+        self.scenarios = []
+        for s, values in enumerate(scenarios):
+            originals = {}
+            try:
+                for (obj, name), value in values.items():
+                    originals[obj, name] = _get(obj, name)
+                    _set(obj, name, sequence(value))
+                model = Model(energysystem, name=f"scenario_{s}", **kwargs)
+            finally:
+                for (obj, name), value in originals.items():
+                    _set(obj, name, value)
+            model.objective.deactivate()
+            self.add_component(f"scenario_{s}", model)
+            self.scenarios.append(model)
+
+        self._share_first_stage()
+        self.objective = po.Objective(
+            expr=sum(
+                p * model.objective.expr
+                for p, model in zip(self.probabilities, self.scenarios)
+            ),
+            sense=po.minimize,
+        )
+        logging.info(
+            f"Built a stochastic model with {len(self.scenarios)} scenarios."
+        )
+
+    def _share_first_stage(self):
+        """Equate the first stage variables of all scenarios with the ones
+        of the first scenario (non-anticipativity)."""
+        first = self.scenarios[0]
+        shared = {
+            var.getname(fully_qualified=True, relative_to=first): var
+            for var in _first_stage_variables(first)
+        }
+        self.nonanticipativity = po.ConstraintList()
+        for model in self.scenarios[1:]:
+            for var in _first_stage_variables(model):
+                name = var.getname(fully_qualified=True, relative_to=model)
+                self.nonanticipativity.add(var == shared[name])
+
+    def solve(
+        self,
+        solver="cbc",
+        solver_io="lp",
+        allow_nonoptimal=False,
+        solve_kwargs=None,
+        cmdline_options=None,
+    ):
+        """Solve the model of all scenarios at once.
+
+        Parameters
+        ----------
+        solver, solver_io, allow_nonoptimal, solve_kwargs, cmdline_options
+            See :meth:`Model.solve <oemof.solph.Model.solve>`.
+
+        Returns
+        -------
+        `pyomo.opt.results.results_.SolverResults`
+            Results of the solver. The results of the scenarios are given
+            by :meth:`results`.
+        """
+        if solve_kwargs is None:
+            solve_kwargs = {}
+        if cmdline_options is None:
+            cmdline_options = {}
+
+        opt = SolverFactory(solver, solver_io=solver_io)
+        for k, v in cmdline_options.items():
+            opt.options[k] = v
+        solver_results = opt.solve(self, **solve_kwargs)
+
+        status = solver_results.Solver.Status
+        termination_condition = solver_results.Solver.Termination_condition
+        self.solver_results = solver_results
+        for model in self.scenarios:
+            model.solver_results = solver_results
+
+        if status == "ok" and termination_condition == "optimal":
+            logging.info("Optimization successful...")
+        else:
+            msg = (
+                f"The solver did not return an optimal solution. "
+                f"Instead the optimization ended with\n"
+                f"       - status: {status}\n"
+                f"       - termination condition: {termination_condition}"
+            )
+            if allow_nonoptimal:
+                warnings.warn(msg, UserWarning)
+            else:
+                raise RuntimeError(msg)
+        return solver_results
+
+    def results(self):
+        """Results of every scenario, see
+        :func:`processing.results <oemof.solph.processing.results>`."""
+        return [processing.results(model) for model in self.scenarios]
+
+
+def _get(obj, name):
+    if isinstance(obj, dict):
+        return obj[name]
+    return getattr(obj, name)
+
+
+def _set(obj, name, value):
+    if isinstance(obj, dict):
+        obj[name] = value
+    else:
+        setattr(obj, name, value)
+
+
+def _first_stage_variables(model):
+    for var in model.component_data_objects(po.Var, descend_into=True):
+        if not _is_operational(var, model):
+            yield var
@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+
+"""Aggregation of the time series of an energy system into typical periods.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import logging
+import warnings
+
+import numpy as np
+import pandas as pd
+from oemof.tools import debugging
+
+from oemof.solph._energy_system import EnergySystem
+from oemof.solph._options import NonConvex
+from oemof.solph._plumbing import LazySequence
+from oemof.solph._plumbing import sequence
+
+
+def aggregate(
+    energysystem,
+    typical_periods,
+    timesteps_per_period,
+    method="k_medoids",
+    segments=None,
+    representation="medoid",
+):
+    r"""Aggregate the time series of an energy system into typical periods.
+
+    The time series of all nodes and flows (e.g. `fix`, `maximum` or
+    `variable_costs`, conversion factors and custom properties) are split
+    into periods of `timesteps_per_period` timesteps. The periods are
+    clustered by :func:`cluster_periods`, based on all time series
+    normalized to the range from 0 to 1. Every cluster is represented by a
+    typical period. If `segments` is given, the timesteps of every typical
+    period are merged into this number of segments of adjacent timesteps
+    with similar values, see :func:`segment_periods`.
+
+    The time series of the nodes are replaced by the concatenated typical
+    periods. The nodes are added to a new energy system with the `timeindex`
+    and the `tsa_parameters` of the typical periods. In a multi-period
+    energy system, every period is aggregated on its own.
+
+    Parameters
+    ----------
+    energysystem : oemof.solph.EnergySystem
+        Energy system with nodes, the timeindex needs equidistant timesteps
+        (in hours).
+    typical_periods : int
+        Number of typical periods.
+    timesteps_per_period : int
+        Number of timesteps of a period, e.g. 24 for days of hourly values.
+    method : str
+        Clustering method, 'k_medoids' or 'hierarchical'.
+    segments : int or None
+        Number of segments per typical period. No segmentation if None.
+    representation : str
+        Representation of a cluster by its 'medoid' (an original period) or
+        by the 'mean' of its periods.
+
+    Returns
+    -------
+    oemof.solph.EnergySystem
+        Energy system with the aggregated nodes. Its `tsa_parameters`
+        contain the `timesteps_per_period`, the `order` of the typical
+        periods and the `segments`, if used.
+
+    Note
+    ----
+    The nodes are changed in place, so they should not be used in the
+    original energy system anymore. Only sequences with one value per
+    timestep are aggregated.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from oemof import solph
+    >>> from oemof.solph.aggregation import aggregate
+    >>> es = solph.EnergySystem(
+    ...     timeindex=solph.create_time_index(2020, number=4 * 24),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = solph.Bus(label="el")
+    >>> demand = np.tile([1.0] * 12 + [3.0] * 12, 4)
+    >>> demand[48:72] *= 2
+    >>> es.add(
+    ...     bus,
+    ...     solph.components.Sink(
+    ...         label="demand",
+    ...         inputs={bus: solph.Flow(nominal_capacity=1, fix=demand)},
+    ...     ),
+    ... )
+    >>> aggregated = aggregate(es, 2, 24, segments=2)
+    >>> aggregated.tsa_parameters[0]["order"]
+    [0, 0, 1, 0]
+    >>> aggregated.tsa_parameters[0]["segments"]
+    {(0, 0): 12.0, (0, 1): 12.0, (1, 0): 12.0, (1, 1): 12.0}
+    >>> aggregated.flows()["el", "demand"].fix.tolist()
+    [1.0, 3.0, 2.0, 6.0]
+    """
+    if energysystem.tsa_parameters is not None:
+        raise ValueError("The energy system is already aggregated.")
+    if representation not in ("medoid", "mean"):
+        raise ValueError(
+            "The representation has to be 'medoid' or 'mean' but is"
+            + f" {representation}."
+        )
+    increment = np.asarray(energysystem.timeincrement, dtype=float)
+    if not np.allclose(increment, increment[0]):
+        raise ValueError(
+            "The aggregation needs equidistant timesteps, but the"
+            + " timeincrement varies."
+        )
+    step = pd.Timedelta(hours=float(increment[0]))
+
+    length = len(increment)
+    if energysystem.periods is None:
+        starts = [_start(energysystem.timeindex)]
+        lengths = [length]
+    else:
+        starts = [period[0] for period in energysystem.periods]
+        lengths = [len(period) for period in energysystem.periods]
+
+    sequences = _time_series(energysystem, length)
+    features = _unique(sequences)
+    data = _stack(features, length)
+
+    aggregated = {key: [] for key, _ in features}
+    tsa_parameters = []
+    periods = []
+    timeincrement = []
+    offset = 0
+    for start, period_length in zip(starts, lengths):
+        if period_length % timesteps_per_period:
+            raise ValueError(
+                f"The number of timesteps ({period_length}) is not a multiple"
+                + f" of the timesteps per period ({timesteps_per_period})."
+            )
+        n = period_length // timesteps_per_period
+        # shape: (periods, time series, timesteps per period)
+        values = (
+            data[:, offset : offset + period_length]
+            .reshape(len(features), n, timesteps_per_period)
+            .transpose(1, 0, 2)
+        )
+        offset += period_length
+
+        order, medoids = cluster_periods(
+            _normalized(values).reshape(n, -1), typical_periods, method
+        )
+        if representation == "medoid":
+            profiles = values[medoids]
+        else:
+            profiles = np.stack(
+                [values[order == k].mean(axis=0) for k in range(len(medoids))]
+            )
+
+        params = {
+            "timesteps_per_period": timesteps_per_period,
+            "order": order.tolist(),
+        }
+        if segments is None:
+            durations = np.full(
+                (len(medoids), timesteps_per_period), float(increment[0])
+            )
+        else:
+            bounds = segment_periods(_normalized(profiles), segments)
+            profiles, durations = _merge_segments(
+                profiles, bounds, float(increment[0])
+            )
+            params["segments"] = {
+                (k, s): float(durations[k, s])
+                for k in range(len(medoids))
+                for s in range(segments)
+            }
+        tsa_parameters.append(params)
+
+        for i, (key, _) in enumerate(features):
+            aggregated[key].append(profiles[:, i, :].ravel())
+        timeincrement.extend(durations.ravel().tolist())
+        periods.append(
+            start
+            + pd.to_timedelta(
+                np.cumsum([0.0, *durations.ravel()[:-1]]), unit="h"
+            )
+        )
+        logging.info(
+            f"Aggregated {n} periods into {len(medoids)} typical periods."
+        )
+
+    for (obj, name), values in sequences:
+        new = sequence(np.concatenate(aggregated[id(values)]))
+        if isinstance(obj, dict):
+            obj[name] = new
+        else:
+            setattr(obj, name, new)
+
+    if energysystem.periods is None:
+        timeindex = periods[0]
+        if segments is None:
+            # timeincrement is derived from the last interval
+            timeindex = timeindex.append(
+                pd.DatetimeIndex([timeindex[-1]]) + step
+            )
+        kwargs = {"tsa_parameters": tsa_parameters[0]}
+    else:
+        timeindex = periods[0].append(periods[1:])
+        kwargs = {
+            "tsa_parameters": tsa_parameters,
+            "periods": periods,
+            "use_remaining_value": energysystem.use_remaining_value,
+        }
+        if segments is None:
+            kwargs["timeincrement"] = timeincrement
+
+    result = EnergySystem(
+        timeindex=timeindex, infer_last_interval=False, **kwargs
+    )
+    result.add(*energysystem.nodes)
+    return result
+
+
+def merge_timesteps(energysystem, tolerance, max_timesteps=None):
+    r"""Merge consecutive timesteps with similar values of all time series.
+
+    Consecutive timesteps are merged as long as every time series (see
+    :func:`aggregate`), normalized to the range from 0 to 1, varies by at
+    most `tolerance` within the merged timestep. The values of a merged
+    timestep are the mean of the original values, weighted by the length of
+    the timesteps, so energy sums are kept. Thus, no original value
+    deviates by more than `tolerance` times the range of its time series
+    from the value of its merged timestep.
+
+    The nodes are added to a new energy system with a non-equidistant
+    `timeindex`. Its `original_timeindex` is used by
+    :func:`oemof.solph.processing.results` to give the results for the
+    original timeindex.
+
+    Parameters
+    ----------
+    energysystem : oemof.solph.EnergySystem
+        Energy system with nodes and a timeindex (not multi-period).
+    tolerance : float
+        Maximal variation of every normalized time series within a merged
+        timestep.
+    max_timesteps : int or None
+        Maximal number of original timesteps merged into one.
+
+    Returns
+    -------
+    oemof.solph.EnergySystem
+        Energy system with the merged timesteps.
+
+    Note
+    ----
+    The nodes are changed in place, see :func:`aggregate`. Parameters
+    given in numbers of timesteps (e.g. minimum up and downtimes) or per
+    timestep (e.g. gradient limits) are not adapted to the merged
+    timesteps.
+
+    Examples
+    --------
+    >>> from oemof import solph
+    >>> from oemof.solph.aggregation import merge_timesteps
+    >>> es = solph.EnergySystem(
+    ...     timeindex=solph.create_time_index(2020, number=6),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = solph.Bus(label="el")
+    >>> demand = [1.0, 1.02, 1.0, 3.0, 5.0, 5.0]
+    >>> es.add(
+    ...     bus,
+    ...     solph.components.Sink(
+    ...         label="demand",
+    ...         inputs={bus: solph.Flow(nominal_capacity=1, fix=demand)},
+    ...     ),
+    ... )
+    >>> merged = merge_timesteps(es, tolerance=0.05)
+    >>> merged.timeincrement.tolist()
+    [3.0, 1.0, 2.0]
+    >>> merged.flows()["el", "demand"].fix.round(2).tolist()
+    [1.01, 3.0, 5.0]
+    """
+    if energysystem.periods is not None or energysystem.tsa_parameters:
+        raise ValueError(
+            "Timesteps can only be merged for energy systems without periods"
+            + " and aggregated time series."
+        )
+    increment = np.asarray(energysystem.timeincrement, dtype=float)
+    length = len(increment)
+    sequences = _time_series(energysystem, length)
+    features = _unique(sequences)
+    data = _stack(features, length)
+    normalized = _normalized(data[None])[0]
+
+    starts = [0]
+    lower = upper = normalized[:, 0]
+    for t in range(1, length):
+        lower = np.minimum(lower, normalized[:, t])
+        upper = np.maximum(upper, normalized[:, t])
+        if (upper - lower).max(initial=0) > tolerance or (
+            max_timesteps is not None and t - starts[-1] >= max_timesteps
+        ):
+            starts.append(t)
+            lower = upper = normalized[:, t]
+
+    durations = np.add.reduceat(increment, starts)
+    merged = np.add.reduceat(data * increment, starts, axis=1) / durations
+    rows = {key: row for row, (key, _) in enumerate(features)}
+    for (obj, name), values in sequences:
+        new = sequence(merged[rows[id(values)]])
+        if isinstance(obj, dict):
+            obj[name] = new
+        else:
+            setattr(obj, name, new)
+    logging.info(f"Merged {length} timesteps into {len(starts)} timesteps.")
+
+    original = pd.Index(energysystem.timeindex)
+    result = EnergySystem(
+        timeindex=original[starts].append(original[-1:]),
+        infer_last_interval=False,
+    )
+    result.original_timeindex = original
+    result.add(*energysystem.nodes)
+    return result
+
+
+def cluster_periods(data, typical_periods, method="k_medoids"):
+    """Cluster periods into typical periods.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        One row of (normalized) values per period.
+    typical_periods : int
+        Number of clusters.
+    method : str
+        'k_medoids' (k-medoids with a greedy initialization, alternating
+        assignment and medoid update) or 'hierarchical' (agglomerative
+        clustering with Ward's criterion).
+
+    Returns
+    -------
+    tuple
+        Cluster of every period (numbered in order of first occurrence) and
+        the medoid period of every cluster, both as numpy arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> data = np.array([[0.0, 1.0], [0.1, 1.0], [1.0, 0.0], [0.0, 0.9]])
+    >>> order, medoids = cluster_periods(data, 2)
+    >>> order.tolist(), medoids.tolist()
+    ([0, 0, 1, 0], [0, 2])
+    """
+    data = np.asarray(data, dtype=float)
+    typical_periods = min(typical_periods, len(data))
+    if typical_periods < 1:
+        raise ValueError("At least one typical period is needed.")
+    distinct = len(np.unique(data, axis=0))
+    if distinct < typical_periods:
+        warnings.warn(
+            f"There are only {distinct} distinct periods, so the number of"
+            + f" typical periods is reduced from {typical_periods} to"
+            + f" {distinct}.",
+            debugging.SuspiciousUsageWarning,
+        )
+        typical_periods = distinct
+    squared = np.sum(data**2, axis=1)
+    distances = np.sqrt(
+        np.maximum(squared[:, None] + squared[None, :] - 2 * data @ data.T, 0)
+    )
+    if method == "k_medoids":
+        labels = _k_medoids(distances, typical_periods)
+    elif method == "hierarchical":
+        labels = _ward(distances**2, typical_periods)
+    else:
+        raise ValueError(
+            "The method has to be 'k_medoids' or 'hierarchical' but is"
+            + f" {method}."
+        )
+
+    # number clusters in order of their first occurrence
+    _, first = np.unique(labels, return_index=True)
+    renumber = np.empty(len(first), dtype=int)
+    renumber[np.argsort(first)] = np.arange(len(first))
+    labels = renumber[np.searchsorted(np.unique(labels), labels)]
+    medoids = np.array(
+        [
+            _medoid(distances, np.flatnonzero(labels == k))
+            for k in range(len(first))
+        ]
+    )
+    return labels, medoids
+
+
+def segment_periods(profiles, segments):
+    """Merge the timesteps of typical periods into segments.
+
+    Adjacent timesteps are merged greedily, always merging the pair of
+    neighbouring segments which increases the sum of squared deviations
+    from the segment means the least (Ward's criterion).
+
+    Parameters
+    ----------
+    profiles : numpy.ndarray
+        Values of shape (typical periods, time series, timesteps).
+    segments : int
+        Number of segments per typical period.
+
+    Returns
+    -------
+    numpy.ndarray
+        First timestep of every segment, of shape (typical periods,
+        segments).
+    """
+    n_periods, _, timesteps = profiles.shape
+    if not 0 < segments <= timesteps:
+        raise ValueError(
+            f"The number of segments ({segments}) has to be between 1 and"
+            + f" the timesteps per period ({timesteps})."
+        )
+    result = np.empty((n_periods, segments), dtype=int)
+    for k in range(n_periods):
+        starts = list(range(timesteps))
+        sizes = np.ones(timesteps)
+        means = profiles[k].T.copy()
+        while len(starts) > segments:
+            weight = sizes[:-1] * sizes[1:] / (sizes[:-1] + sizes[1:])
+            costs = weight * np.sum((means[:-1] - means[1:]) ** 2, axis=1)
+            i = int(np.argmin(costs))
+            size = sizes[i] + sizes[i + 1]
+            means[i] = (
+                sizes[i] * means[i] + sizes[i + 1] * means[i + 1]
+            ) / size
+            sizes[i] = size
+            means = np.delete(means, i + 1, axis=0)
+            sizes = np.delete(sizes, i + 1)
+            del starts[i + 1]
+        result[k] = starts
+    return result
+
+
+def _start(timeindex):
+    if isinstance(timeindex, pd.DatetimeIndex):
+        return timeindex[0]
+    return pd.Timestamp(0)
+
+
+def _time_series(energysystem, length):
+    """Find all sequences with one value per timestep of the nodes and flows,
+    as pairs of their container (object or dict) and name and their values.
+    """
+    objects = list(energysystem.nodes) + list(energysystem.flows().values())
+    objects += [
+        obj.nonconvex
+        for obj in energysystem.flows().values()
+        if isinstance(obj.nonconvex, NonConvex)
+    ]
+    found = []
+    for obj in objects:
+        containers = [(obj, vars(obj))]
+        containers += [
+            (value, value)
+            for value in vars(obj).values()
+            if isinstance(value, dict)
+        ]
+        for container, items in containers:
+            for name, value in list(items.items()):
+                if isinstance(value, LazySequence):
+                    value = value.values
+                if (
+                    isinstance(value, np.ndarray)
+                    and value.ndim == 1
+                    and len(value) == length
+                    and np.issubdtype(value.dtype, np.number)
+                ):
+                    found.append(((container, name), value))
+    return found
+
+
+def _unique(sequences):
+    """Unique arrays of the sequences, keyed by the id of the array."""
+    unique = {}
+    for _, values in sequences:
+        unique.setdefault(id(values), np.asarray(values, dtype=float))
+    return list(unique.items())
+
+
+def _stack(features, length):
+    if not features:
+        return np.empty((0, length))
+    return np.stack([values for _, values in features])
+
+
+def _normalized(values):
+    """Scale every time series (axis 1) to the range from 0 to 1."""
+    lower = values.min(axis=(0, 2), keepdims=True)
+    span = values.max(axis=(0, 2), keepdims=True) - lower
+    return (values - lower) / np.where(span > 0, span, 1)
+
+
+def _medoid(distances, members):
+    return members[np.argmin(distances[np.ix_(members, members)].sum(axis=0))]
+
+
+def _k_medoids(distances, k, max_iterations=100):
+    # greedy initialization (BUILD step of PAM)
+    medoids = [int(np.argmin(distances.sum(axis=0)))]
+    nearest = distances[:, medoids[0]]
+    for _ in range(1, k):
+        gain = np.maximum(nearest[:, None] - distances, 0).sum(axis=0)
+        gain[medoids] = -1
+        medoids.append(int(np.argmax(gain)))
+        nearest = np.minimum(nearest, distances[:, medoids[-1]])
+    medoids = np.array(medoids)
+
+    for _ in range(max_iterations):
+        labels = np.argmin(distances[:, medoids], axis=1)
+        # an empty cluster keeps its medoid
+        new = np.array(
+            [
+                _medoid(distances, members) if members.size else medoids[c]
+                for c, members in enumerate(
+                    np.flatnonzero(labels == c) for c in range(k)
+                )
+            ]
+        )
+        if np.array_equal(new, medoids):
+            break
+        medoids = new
+    return np.argmin(distances[:, medoids], axis=1)
+
+
+def _ward(squared, k):
+    """Agglomerative clustering with Ward's criterion on squared euclidean
+    distances, using the Lance-Williams update."""
+    n = len(squared)
+    d = squared.astype(float)
+    np.fill_diagonal(d, np.inf)
+    sizes = np.ones(n)
+    labels = np.arange(n)
+    active = np.ones(n, dtype=bool)
+    for _ in range(n - k):
+        i, j = np.unravel_index(np.argmin(d), d.shape)
+        i, j = min(i, j), max(i, j)
+        total = sizes[i] + sizes[j] + sizes
+        d[i] = (
+            (sizes[i] + sizes) * d[i]
+            + (sizes[j] + sizes) * d[j]
+            - sizes * d[i, j]
+        ) / total
+        d[:, i] = d[i]
+        d[i, i] = np.inf
+        d[j] = np.inf
+        d[:, j] = np.inf
+        d[i, ~active] = np.inf
+        d[~active, i] = np.inf
+        sizes[i] += sizes[j]
+        active[j] = False
+        labels[labels == j] = i
+    return labels
+
+
+def _merge_segments(profiles, bounds, hours):
+    """Mean values and durations (in hours) of the segments."""
+    n_periods, n_series, timesteps = profiles.shape
+    segments = bounds.shape[1]
+    values = np.empty((n_periods, n_series, segments))
+    durations = np.empty((n_periods, segments))
+    for k in range(n_periods):
+        ends = np.append(bounds[k, 1:], timesteps)
+        for s, (start, end) in enumerate(zip(bounds[k], ends)):
+            values[k, :, s] = profiles[k, :, start:end].mean(axis=1)
+            durations[k, s] = (end - start) * hours
+    return values, durations
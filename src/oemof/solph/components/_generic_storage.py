@@ -29,7 +29,6 @@ from warnings import warn
 import numpy as np
 from oemof.network import Node
 from oemof.tools import debugging
-from oemof.tools import economics
 from pyomo.core.base.block import ScalarBlock
 from pyomo.environ import Binary
 from pyomo.environ import BuildAction
@@ -1663,22 +1662,10 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                             f" Value for {n} is missing."
                         )
                         raise ValueError(msg)
-                    # get the period matrix describing the temporal distance
-                    # between all period combinations.
-                    periods_matrix = m.es.periods_matrix
-
-                    # get the index of the minimum value in each row greater
-                    # equal than the lifetime. This value equals the
-                    # decommissioning period if not zero. The index of this
-                    # value represents the investment period. If np.where
-                    # condition is not met in any row, min value will be zero
-                    decomm_periods = np.argmin(
-                        np.where(
-                            (periods_matrix >= lifetime),
-                            periods_matrix,
-                            np.inf,
-                        ),
-                        axis=1,
+                    # get the decommissioning period of each investment
+                    # period (or zero) from the cache shared by all blocks.
+                    decomm_periods = m.period_cache.decommissioning_periods(
+                        lifetime
                     )
 
                     # no decommissioning in first period
@@ -1745,27 +1732,17 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                 capacity to be decommissioned due to reaching its lifetime
                 """
                 for n in self.INVESTSTORAGES:
-                    age = n.investment.age
-                    lifetime = n.investment.lifetime
-                    is_decommissioned = False
+                    # existing capacity is decommissioned once (never in the
+                    # first period) when reaching its lifetime
+                    decomm_p = m.period_cache.exo_decommissioning_period(
+                        n.investment.lifetime, n.investment.age
+                    )
                     for p in m.PERIODS:
-                        # No shutdown in first period
-                        if p == 0:
-                            expr = self.old_exo[n, p] == 0
-                            self.old_rule_exo.add((n, p), expr)
-                        elif lifetime - age <= m.es.periods_years[p]:
-                            # Track decommissioning status
-                            if not is_decommissioned:
-                                expr = (
-                                    self.old_exo[n, p] == n.investment.existing
-                                )
-                                is_decommissioned = True
-                            else:
-                                expr = self.old_exo[n, p] == 0
-                            self.old_rule_exo.add((n, p), expr)
+                        if p == decomm_p:
+                            expr = self.old_exo[n, p] == n.investment.existing
                         else:
                             expr = self.old_exo[n, p] == 0
-                            self.old_rule_exo.add((n, p), expr)
+                        self.old_rule_exo.add((n, p), expr)
 
             self.old_rule_exo = Constraint(
                 self.INVESTSTORAGES, m.PERIODS, noruleinit=True
@@ -2238,6 +2215,8 @@ class GenericInvestmentStorageBlock(ScalarBlock):
         storage_costs = 0
         period_investment_costs = {p: 0 for p in m.PERIODS}
         fixed_costs = 0
+        # costs of the investment of every storage and period (multi-period)
+        option_costs = {}
 
         if m.es.periods is None:
             for n in self.CONVEX_INVESTSTORAGES:
@@ -2270,17 +2249,14 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                     )
                     interest = m.discount_rate
                 for p in m.PERIODS:
-                    annuity = economics.annuity(
-                        capex=n.investment.ep_costs[p],
-                        n=lifetime,
-                        wacc=interest,
-                    )
-                    duration = min(
-                        m.es.end_year_of_optimization - m.es.periods_years[p],
+                    annuity = m.period_cache.annuity(
+                        n.investment.ep_costs[p],
                         lifetime,
+                        interest,
                     )
-                    present_value_factor = 1 / economics.annuity(
-                        capex=1, n=duration, wacc=interest
+                    duration = m.period_cache.investment_duration(p, lifetime)
+                    present_value_factor = m.period_cache.present_value_factor(
+                        duration, interest
                     )
                     investment_costs_increment = (
                         self.invest[n, p] * annuity * present_value_factor
@@ -2299,6 +2275,9 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                         investment_costs_increment + remaining_value_difference
                     )
                     period_investment_costs[p] += investment_costs_increment
+                    option_costs[n, p] = (
+                        investment_costs_increment + remaining_value_difference
+                    )
 
             for n in self.NON_CONVEX_INVESTSTORAGES:
                 lifetime = n.investment.lifetime
@@ -2310,17 +2289,14 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                     )
                     interest = m.discount_rate
                 for p in m.PERIODS:
-                    annuity = economics.annuity(
-                        capex=n.investment.ep_costs[p],
-                        n=lifetime,
-                        wacc=interest,
-                    )
-                    duration = min(
-                        m.es.end_year_of_optimization - m.es.periods_years[p],
+                    annuity = m.period_cache.annuity(
+                        n.investment.ep_costs[p],
                         lifetime,
+                        interest,
                     )
-                    present_value_factor = 1 / economics.annuity(
-                        capex=1, n=duration, wacc=interest
+                    duration = m.period_cache.investment_duration(p, lifetime)
+                    present_value_factor = m.period_cache.present_value_factor(
+                        duration, interest
                     )
                     investment_costs_increment = (
                         self.invest[n, p] * annuity * present_value_factor
@@ -2341,6 +2317,9 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                         investment_costs_increment + remaining_value_difference
                     )
                     period_investment_costs[p] += investment_costs_increment
+                    option_costs[n, p] = (
+                        investment_costs_increment + remaining_value_difference
+                    )
 
             for n in self.INVESTSTORAGES:
                 if valid_sequence(n.investment.fixed_costs, len(m.PERIODS)):
@@ -2350,13 +2329,15 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                             m.es.end_year_of_optimization,
                             m.es.periods_years[p] + lifetime,
                         )
-                        fixed_costs += sum(
+                        option_fixed_costs = sum(
                             self.invest[n, p] * n.investment.fixed_costs[pp]
                             for pp in range(
                                 m.es.periods_years[p],
                                 range_limit,
                             )
                         )
+                        fixed_costs += option_fixed_costs
+                        option_costs[n, p] += option_fixed_costs
 
             for n in self.EXISTING_INVESTSTORAGES:
                 if valid_sequence(n.investment.fixed_costs, len(m.PERIODS)):
@@ -2391,6 +2372,7 @@ class GenericInvestmentStorageBlock(ScalarBlock):
 
         self.investment_costs = Expression(expr=investment_costs)
         self.period_investment_costs = period_investment_costs
+        self.option_costs = option_costs
         self.fixed_costs = Expression(expr=fixed_costs)
         self.costs = Expression(
             expr=investment_costs + fixed_costs + storage_costs
@@ -2442,18 +2424,20 @@ class GenericInvestmentStorageBlock(ScalarBlock):
                 remaining_lifetime = lifetime - (
                     end_year_of_optimization - m.es.periods_years[p]
                 )
-                remaining_annuity = economics.annuity(
-                    capex=n.investment.ep_costs[-1],
-                    n=remaining_lifetime,
-                    wacc=interest,
+                remaining_annuity = m.period_cache.annuity(
+                    n.investment.ep_costs[-1],
+                    remaining_lifetime,
+                    interest,
                 )
-                original_annuity = economics.annuity(
-                    capex=n.investment.ep_costs[p],
-                    n=remaining_lifetime,
-                    wacc=interest,
+                original_annuity = m.period_cache.annuity(
+                    n.investment.ep_costs[p],
+                    remaining_lifetime,
+                    interest,
                 )
-                present_value_factor_remaining = 1 / economics.annuity(
-                    capex=1, n=remaining_lifetime, wacc=interest
+                present_value_factor_remaining = (
+                    m.period_cache.present_value_factor(
+                        remaining_lifetime, interest
+                    )
                 )
                 convex_investment_costs = (
                     self.invest[n, p]
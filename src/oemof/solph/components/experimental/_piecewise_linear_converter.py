@@ -17,14 +17,22 @@ SPDX-License-Identifier: MIT
 
 """
 
+import numpy as np
 from oemof.network import Node
 from pyomo.core.base.block import ScalarBlock
+from pyomo.environ import Binary
 from pyomo.environ import BuildAction
 from pyomo.environ import Constraint
+from pyomo.environ import NonNegativeReals
 from pyomo.environ import Piecewise
 from pyomo.environ import Set
+from pyomo.environ import SOSConstraint
 from pyomo.environ import Var
 
+# piecewise representations built by solph itself, all other representations
+# are passed to pyomo.environ.Piecewise
+NATIVE_PW_REPNS = ("SOS2", "CC", "INC")
+
 
 class PiecewiseLinearConverter(Node):
     """Component to model an energy converter with one input and one output
@@ -41,8 +49,12 @@ class PiecewiseLinearConverter(Node):
         flow which is to be approximated.
 
     pw_repn : string
-        Choice of piecewise representation that is passed to
-        pyomo.environ.Piecewise
+        Choice of piecewise representation. 'SOS2', 'CC' (convex
+        combination) and 'INC' (incremental) are formulated directly on the
+        flows of the component. All other representations (e.g. 'DCC',
+        'LOG' or 'BIGM_BIN') are passed to pyomo.environ.Piecewise. 'SOS2'
+        needs a solver interface supporting SOS constraints (e.g. Gurobi or
+        CPLEX, but not CBC with LP files), otherwise solving raises an error.
 
     Examples
     --------
@@ -113,12 +125,71 @@ class PiecewiseLinearConverterBlock(ScalarBlock):
     r"""Block for the relation of nodes with type
     :class:`~oemof.solph.components.experimental._piecewise_linear_converter.PiecewiseLinearConverter`
 
+    The breakpoints :math:`x_k` and :math:`y_k = f(x_k)`,
+    :math:`k = 0, \dots, K`, are computed once per converter and shared by
+    all timesteps. The native representations directly link the input flow
+    :math:`P_{i}(t)` and the output flow :math:`P_{o}(t)`.
+
+    **The following variables are created:**
+
+    :attr:`om.PiecewiseLinearConverterBlock.piecewise_weight[n,k,t]`
+        Weight :math:`\lambda_k(t) \geq 0` of breakpoint :math:`k`
+        ('SOS2' and 'CC').
+
+    :attr:`om.PiecewiseLinearConverterBlock.segment_fill[n,s,t]`
+        Filled share :math:`\delta_s(t) \in [0, 1]` of segment :math:`s`
+        ('INC').
+
+    :attr:`om.PiecewiseLinearConverterBlock.segment_status[n,s,t]`
+        Binary :math:`z_s(t)` selecting the active segment ('CC') or
+        indicating that segment :math:`s` is completely filled ('INC').
+
     **The following constraints are created:**
 
+    Input and output :attr:`om.PiecewiseLinearConverterBlock.piecewise_input`
+    and :attr:`om.PiecewiseLinearConverterBlock.piecewise_output`
+        .. math::
+            &P_{i}(t) = \sum_k \lambda_k(t) \cdot x_k, \quad
+            P_{o}(t) = \sum_k \lambda_k(t) \cdot y_k
+            \quad \text{('SOS2', 'CC')} \\
+            &P_{i}(t) = x_0 + \sum_s \delta_s(t) \cdot (x_{s+1} - x_s),
+            \quad
+            P_{o}(t) = y_0 + \sum_s \delta_s(t) \cdot (y_{s+1} - y_s)
+            \quad \text{('INC')}
+
+    Convexity :attr:`om.PiecewiseLinearConverterBlock.convexity`
+    ('SOS2', 'CC')
+        .. math::
+            \sum_k \lambda_k(t) = 1
+
+    SOS2 :attr:`om.PiecewiseLinearConverterBlock.sos2` ('SOS2')
+        At most two adjacent :math:`\lambda_k(t)` are non-zero.
+
+    Segment choice :attr:`om.PiecewiseLinearConverterBlock.segment_choice`
+    and :attr:`om.PiecewiseLinearConverterBlock.weight_in_segment` ('CC')
+        .. math::
+            \sum_s z_s(t) = 1, \quad
+            \lambda_k(t) \leq z_{k-1}(t) + z_k(t)
+
+    Filling order :attr:`om.PiecewiseLinearConverterBlock.fill_order`
+    ('INC')
+        .. math::
+            \delta_{s+1}(t) \leq z_s(t) \leq \delta_s(t)
+
+    All other representations are passed to `pyomo.environ.Piecewise`
+    (:attr:`om.PiecewiseLinearConverterBlock.piecewise`), using auxiliary
+    variables :attr:`inflow` and :attr:`outflow` equated to the flows.
     """
 
     CONSTRAINT_GROUP = True
 
+    # indexed by breakpoints or segments, thus not part of processed results
+    AUXILIARY_VARIABLES = (
+        "piecewise_weight",
+        "segment_fill",
+        "segment_status",
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -137,6 +208,182 @@ class PiecewiseLinearConverterBlock(ScalarBlock):
         if group is None:
             return None
 
+        native = [n for n in group if n.pw_repn in NATIVE_PW_REPNS]
+        if native:
+            self._create_native(native)
+
+        pyomo_group = [n for n in group if n.pw_repn not in NATIVE_PW_REPNS]
+        if pyomo_group:
+            self._create_pyomo_piecewise(pyomo_group)
+
+    def _create_native(self, group):
+        """Piecewise linear relation formulated directly on the flows."""
+        m = self.parent_block()
+
+        self.NATIVE_PWLINEARCONVERTERS = Set(initialize=group)
+        self.WEIGHTED_PWLINEARCONVERTERS = Set(
+            initialize=[n for n in group if n.pw_repn in ("SOS2", "CC")]
+        )
+        self.SOS2_PWLINEARCONVERTERS = Set(
+            initialize=[n for n in group if n.pw_repn == "SOS2"]
+        )
+
+        # breakpoint arrays are computed once and shared by all timesteps
+        self.breakpoint_arrays = {}
+        for n in group:
+            x = np.array(n.in_breakpoints, dtype=float)
+            self.breakpoint_arrays[n] = (
+                x,
+                np.array([n.conversion_function(xk) for xk in x], dtype=float),
+            )
+
+        self.BREAKPOINTS = Set(
+            initialize=[
+                (n, k)
+                for n in self.WEIGHTED_PWLINEARCONVERTERS
+                for k in range(len(n.in_breakpoints))
+            ],
+            dimen=2,
+        )
+        self.INC_SEGMENTS = Set(
+            initialize=[
+                (n, s)
+                for n in group
+                if n.pw_repn == "INC"
+                for s in range(len(n.in_breakpoints) - 1)
+            ],
+            dimen=2,
+        )
+        # CC: one binary per segment, INC: one binary per inner breakpoint
+        self.STATUS_SEGMENTS = Set(
+            initialize=[
+                (n, s)
+                for n in group
+                if n.pw_repn != "SOS2"
+                for s in range(
+                    len(n.in_breakpoints) - (1 if n.pw_repn == "CC" else 2)
+                )
+            ],
+            dimen=2,
+        )
+
+        self.piecewise_weight = Var(
+            self.BREAKPOINTS, m.TIMESTEPS, within=NonNegativeReals
+        )
+        self.segment_fill = Var(self.INC_SEGMENTS, m.TIMESTEPS, bounds=(0, 1))
+        self.segment_status = Var(
+            self.STATUS_SEGMENTS, m.TIMESTEPS, within=Binary
+        )
+
+        def _linear_combination(n, t, values):
+            if n.pw_repn == "INC":
+                steps = np.diff(values)
+                return values[0] + sum(
+                    self.segment_fill[n, s, t] * steps[s]
+                    for s in range(len(steps))
+                )
+            else:
+                return sum(
+                    self.piecewise_weight[n, k, t] * values[k]
+                    for k in range(len(values))
+                )
+
+        def _input_rule(block, n, t):
+            inp = list(n.inputs.keys())[0]
+            return m.flow[inp, n, t] == _linear_combination(
+                n, t, self.breakpoint_arrays[n][0]
+            )
+
+        self.piecewise_input = Constraint(
+            self.NATIVE_PWLINEARCONVERTERS, m.TIMESTEPS, rule=_input_rule
+        )
+
+        def _output_rule(block, n, t):
+            out = list(n.outputs.keys())[0]
+            return m.flow[n, out, t] == _linear_combination(
+                n, t, self.breakpoint_arrays[n][1]
+            )
+
+        self.piecewise_output = Constraint(
+            self.NATIVE_PWLINEARCONVERTERS, m.TIMESTEPS, rule=_output_rule
+        )
+
+        def _convexity_rule(block, n, t):
+            return (
+                sum(
+                    self.piecewise_weight[n, k, t]
+                    for k in range(len(n.in_breakpoints))
+                )
+                == 1
+            )
+
+        self.convexity = Constraint(
+            self.WEIGHTED_PWLINEARCONVERTERS, m.TIMESTEPS, rule=_convexity_rule
+        )
+
+        def _sos2_rule(block, n, t):
+            return [
+                self.piecewise_weight[n, k, t]
+                for k in range(len(n.in_breakpoints))
+            ]
+
+        self.sos2 = SOSConstraint(
+            self.SOS2_PWLINEARCONVERTERS, m.TIMESTEPS, rule=_sos2_rule, sos=2
+        )
+
+        def _segment_rules(block):
+            for n in group:
+                n_segments = len(n.in_breakpoints) - 1
+                for t in m.TIMESTEPS:
+                    if n.pw_repn == "CC":
+                        self.segment_choice.add(
+                            (n, t),
+                            sum(
+                                self.segment_status[n, s, t]
+                                for s in range(n_segments)
+                            )
+                            == 1,
+                        )
+                        for k in range(n_segments + 1):
+                            adjacent = [
+                                self.segment_status[n, s, t]
+                                for s in (k - 1, k)
+                                if 0 <= s < n_segments
+                            ]
+                            self.weight_in_segment.add(
+                                (n, k, t),
+                                self.piecewise_weight[n, k, t]
+                                <= sum(adjacent),
+                            )
+                    elif n.pw_repn == "INC":
+                        for s in range(n_segments - 1):
+                            self.fill_order.add(
+                                (n, s, "upper", t),
+                                self.segment_fill[n, s + 1, t]
+                                <= self.segment_status[n, s, t],
+                            )
+                            self.fill_order.add(
+                                (n, s, "lower", t),
+                                self.segment_status[n, s, t]
+                                <= self.segment_fill[n, s, t],
+                            )
+
+        self.segment_choice = Constraint(
+            self.NATIVE_PWLINEARCONVERTERS, m.TIMESTEPS, noruleinit=True
+        )
+        self.weight_in_segment = Constraint(
+            self.BREAKPOINTS, m.TIMESTEPS, noruleinit=True
+        )
+        self.fill_order = Constraint(
+            self.STATUS_SEGMENTS,
+            ["upper", "lower"],
+            m.TIMESTEPS,
+            noruleinit=True,
+        )
+        self.segment_build = BuildAction(rule=_segment_rules)
+
+    def _create_pyomo_piecewise(self, group):
+        """Piecewise linear relation using pyomo.environ.Piecewise."""
         m = self.parent_block()
 
         self.PWLINEARCONVERTERS = Set(initialize=[n for n in group])
@@ -15,8 +15,11 @@ SPDX-License-Identifier: MIT
 
 import warnings
 
+import numpy as np
 from pyomo import environ as po
+from pyomo.core.expr import LinearExpression
 
+from oemof.solph._plumbing import _FakeSequence
 from oemof.solph._plumbing import sequence
 
 
@@ -158,18 +161,11 @@ def generic_integral_limit(
             "At least one of upper_limit and lower_limit needs to be defined."
         )
 
+    coefficients = _keyword_coefficients(om, flows, keyword)
     setattr(
         om,
         limit_name,
-        po.Expression(
-            expr=sum(
-                om.flow[i, o, t]
-                * om.timeincrement[t]
-                * sequence(flows[i, o].custom_properties[keyword])[t]
-                for (i, o) in flows
-                for t in om.TIMESTEPS
-            )
-        ),
+        po.Expression(expr=_linear_flow_sum(om, coefficients, om.TIMESTEPS)),
     )
 
     if upper_limit is not None:
@@ -247,14 +243,10 @@ def generic_periodical_integral_limit(om, keyword, flows=None, limit=None):
         )
         raise ValueError(msg)
 
+    coefficients = _keyword_coefficients(om, flows, keyword)
+
     def _periodical_integral_limit_rule(m, p):
-        expr = sum(
-            om.flow[i, o, t]
-            * om.timeincrement[t]
-            * sequence(flows[i, o].custom_properties[keyword])[t]
-            for (i, o) in flows
-            for t in m.TIMESTEPS_IN_PERIOD[p]
-        )
+        expr = _linear_flow_sum(om, coefficients, m.TIMESTEPS_IN_PERIOD[p])
 
         return expr <= limit[p]
 
@@ -267,6 +259,48 @@ def generic_periodical_integral_limit(om, keyword, flows=None, limit=None):
     return om
 
 
+def _keyword_coefficients(om, flows, keyword):
+    """Resolve the weights named `keyword` once per flow
+
+    Returns
+    -------
+    dict
+        One array per flow holding the weight multiplied by the
+        timeincrement for every timestep.
+    """
+    timeincrement = np.array(
+        [om.timeincrement[t] for t in om.TIMESTEPS], dtype=float
+    )
+    coefficients = {}
+    for i, o in flows:
+        weights = sequence(flows[i, o].custom_properties[keyword])
+        if isinstance(weights, _FakeSequence):
+            coefficients[i, o] = weights.value * timeincrement
+        else:
+            coefficients[i, o] = (
+                np.asarray(weights, dtype=float)[: len(timeincrement)]
+                * timeincrement
+            )
+    return coefficients
+
+
+def _linear_flow_sum(om, coefficients, timesteps):
+    """Fold flows and their coefficients into one linear expression
+
+    Terms with a coefficient of zero are skipped.
+    """
+    linear_coefs = []
+    linear_vars = []
+    for (i, o), coefs in coefficients.items():
+        for t in timesteps:
+            if coefs[t] != 0:
+                linear_coefs.append(float(coefs[t]))
+                linear_vars.append(om.flow[i, o, t])
+    return LinearExpression(
+        constant=0, linear_coefs=linear_coefs, linear_vars=linear_vars
+    )
+
+
 def _check_and_set_flows(om, flows, keyword):
     """Checks and sets flows if needed
 
@@ -0,0 +1,1204 @@
+# -*- coding: utf-8 -*-
+
+"""Decomposition methods to solve large models in parts.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import copy
+import logging
+import math
+import multiprocessing
+import warnings
+
+import numpy as np
+import pandas as pd
+from oemof.tools import debugging
+from pyomo import environ as po
+from pyomo.opt import SolverFactory
+from pyomo.opt import SolverResults
+from pyomo.opt import SolverStatus
+from pyomo.opt import TerminationCondition
+from pyomo.repn import generate_standard_repn
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+from oemof.solph import processing
+from oemof.solph._energy_system import EnergySystem
+from oemof.solph._models import Model
+from oemof.solph._options import Investment
+from oemof.solph._plumbing import sequence
+from oemof.solph._results import Results
+from oemof.solph.aggregation import _time_series
+
+# sets indexing variables of the operation, i.e. per timestep
+_TIME_SETS = (
+    "TIMESTEPS",
+    "TIMEPOINTS",
+    "TIMEINDEX",
+    "TIMEINDEX_CLUSTER",
+    "TIMEINDEX_TYPICAL_CLUSTER",
+    "TIMEINDEX_TYPICAL_CLUSTER_OFFSET",
+)
+
+
+def benders(
+    model,
+    solver="cbc",
+    solver_io="lp",
+    cmdline_options=None,
+    subproblems=None,
+    processes=1,
+    tolerance=1e-4,
+    max_iterations=100,
+    penalty=1e6,
+):
+    r"""Solve an investment model by Benders decomposition.
+
+    The variables which are not indexed by timesteps (e.g. `invest`,
+    `total` or `invest_status` of investment flows and storages) form the
+    master problem, all other variables describe the operation. Parts of the
+    operation which are not connected by constraints (e.g. the periods of a
+    multi-period model without storages carrying energy between periods)
+    are distributed to `subproblems` linear problems.
+
+    In every iteration, the master problem (mixed integer, if needed) is
+    solved with one estimate :math:`\theta_s` of the operational costs per
+    subproblem. The subproblems are solved for the investment decisions of
+    the master problem, possibly in parallel processes, and their duals
+    give an optimality cut per subproblem:
+
+    .. math::
+        \theta_s \ge Q_s(\hat x) + g_s^T (x - \hat x)
+
+    The master objective is a lower bound and the costs of the investment
+    decisions together with the operational costs are an upper bound of the
+    optimal objective. The iteration stops if the gap between both is
+    below the `tolerance`.
+
+    Constraints linking operation and investment (e.g. the flow limited by
+    the invested capacity) are elastic in the subproblems: violating them is
+    penalized by `penalty` per unit. So the subproblems are feasible for
+    every investment decision, e.g. for no investment at all. The penalty
+    needs to exceed the value of an additional unit of capacity.
+
+    The master problem and the subproblems are extracted from the complete
+    `model`, so the decomposition needs more memory than the model itself
+    and does not help with models which do not fit into memory. Every
+    subproblem is solved in every iteration, so it is usually slower than
+    solving the `model` directly. Every master problem and subproblem keeps
+    its solver: with a persistent solver (e.g. 'appsi_highs' or
+    'gurobi_persistent') only the changed right hand sides and the new cuts
+    are passed to the solver in every iteration, other solvers (e.g. 'cbc')
+    get the complete problem every time.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        The model to be solved, its objective has to be linear and the
+        operational variables continuous.
+    solver, solver_io, cmdline_options
+        Solver used for the master problem and the subproblems, see
+        :meth:`Model.solve <oemof.solph.Model.solve>`. `solver_io` is not
+        passed to the solver if it is None, e.g. for persistent solvers.
+    subproblems : int or None
+        Maximal number of subproblems, defaults to the number of periods.
+    processes : int
+        Number of processes solving the subproblems. With more than one
+        process, every process keeps its subproblems in memory and only
+        the investment decisions and the cuts are exchanged.
+    tolerance : float
+        Relative gap between upper and lower bound to stop at.
+    max_iterations : int
+        Maximal number of iterations.
+    penalty : float
+        Costs per unit of violating a constraint linking operation and
+        investment.
+
+    Returns
+    -------
+    oemof.solph.Results
+        Results of the model with the best solution found. Additionally to
+        the objective, they contain the `lower_bound`, the `upper_bound`
+        and the number of `iterations`.
+
+    Note
+    ----
+    On platforms starting processes by "spawn" (Windows, macOS), the
+    calling script needs to be guarded by `if __name__ == "__main__":`
+    to use more than one process.
+    """
+    if cmdline_options is None:
+        cmdline_options = {}
+    config = {
+        "solver": solver,
+        "solver_io": solver_io,
+        "cmdline_options": cmdline_options,
+    }
+    if subproblems is None:
+        subproblems = len(model.PERIODS)
+
+    master, parts = _decompose(model, subproblems, penalty)
+    logging.info(
+        "Benders decomposition into a master problem with"
+        + f" {len(master.variables)} variables and {len(parts)}"
+        + " subproblems."
+    )
+
+    with _SubproblemSolver(parts, config, processes) as subproblem_solver:
+        # the operation without any investment constraints bounds the
+        # operational costs from below
+        relaxed = subproblem_solver.solve(None, relaxed=True)
+        master.add_estimates([objective for objective, *_ in relaxed])
+
+        lower_bound = -math.inf
+        upper_bound = math.inf
+        best = None
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            master_results = master.solve(config)
+            lower_bound = max(lower_bound, master.objective())
+            x = master.values()
+
+            solutions = subproblem_solver.solve(x)
+            violation = sum(v for *_, v in solutions)
+            costs = master.costs() + sum(q for q, *_ in solutions)
+            if violation <= 1e-6 and costs < upper_bound:
+                upper_bound = costs
+                best = x
+            for s, (objective, gradient, *_) in enumerate(solutions):
+                master.add_cut(s, objective, gradient, x)
+
+            logging.info(
+                f"Benders iteration {iteration}: lower bound {lower_bound},"
+                + f" upper bound {upper_bound}"
+            )
+            if upper_bound - lower_bound <= tolerance * max(
+                abs(upper_bound), 1
+            ):
+                break
+
+        if best is None:
+            raise RuntimeError(
+                "Benders decomposition found no solution satisfying the"
+                + " constraints linking operation and investment. Increase"
+                + " the penalty or the number of iterations."
+            )
+        values = subproblem_solver.solve(best, values=True)
+
+    for var, value in zip(master.variables, best):
+        var.set_value(value, skip_validation=True)
+    for part, (_, _, part_values, _) in zip(parts, values):
+        for var, value in zip(part.variables, part_values):
+            var.set_value(value, skip_validation=True)
+
+    model.solver_results = master_results
+    results = Results(model)
+    results._meta_results.update(
+        {
+            "lower_bound": lower_bound,
+            "upper_bound": upper_bound,
+            "iterations": iteration,
+        }
+    )
+    return results
+
+
+def admm(
+    model,
+    coupling,
+    solver="highs",
+    solver_io=None,
+    cmdline_options=None,
+    processes=1,
+    rho=1.0,
+    tolerance=1e-3,
+    max_iterations=500,
+):
+    r"""Solve a model of coupled regions by the alternating direction
+    method of multipliers (ADMM).
+
+    The energy system is split into regions at the `coupling` flows, e.g.
+    the flows of links or transmission converters into the buses of another
+    region. The nodes connected by the other flows form a region. Every
+    region gets a copy of the coupling flows it is connected to and is
+    solved on its own, possibly in parallel processes. In every iteration,
+    the copies of every coupling flow are averaged to the consensus
+    :math:`z` and the prices :math:`\lambda` of the differences are
+    updated. So every region solves
+
+    .. math::
+        \min f_r(x_r) + \sum_j \lambda_{rj} (y_{rj} - z_j)
+        + \frac{\rho}{2} (y_{rj} - z_j)^2
+
+    with the copies :math:`y_{rj}` of the coupling flows. The iteration
+    stops when the primal residual (difference of the copies) and the dual
+    residual (change of the consensus) are below `tolerance`, relative to
+    the values of the flows and the prices.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        The model to be solved, its objective has to be linear and its
+        variables continuous.
+    coupling : iterable
+        Coupling flows, indexed by `(source, target)`. Every constraint has
+        to contain a variable which is not a coupling flow, so only one flow
+        of a link should be coupling.
+    solver, solver_io, cmdline_options
+        Solver of the regions, which has to support quadratic objectives,
+        e.g. 'highs' (pyomo interface to highspy), 'gurobi' or 'cplex'.
+        `solver_io` is not passed to the solver if it is None.
+    processes : int
+        Number of processes solving the regions.
+    rho : float
+        Penalty of the squared differences between copies and consensus. It
+        should be of the order of the prices of the coupling flows divided
+        by their values.
+    tolerance : float
+        Relative tolerance of the primal and dual residual.
+    max_iterations : int
+        Maximal number of iterations.
+
+    Returns
+    -------
+    oemof.solph.Results
+        Results of the model with the coupling flows set to the consensus
+        and all other variables to the solutions of the regions.
+        Additionally to the objective, they contain the `iterations`, the
+        final `primal_residual` and `dual_residual` and the `residuals` of
+        all iterations.
+    """
+    if cmdline_options is None:
+        cmdline_options = {}
+    config = {
+        "solver": solver,
+        "solver_io": solver_io,
+        "cmdline_options": cmdline_options,
+    }
+    regions, shared = _regions(model, coupling)
+    logging.info(
+        f"ADMM with {len(regions)} regions and {len(shared)} coupling"
+        + " variables."
+    )
+
+    z = np.zeros(len(shared))
+    prices = [np.zeros(len(region.copies)) for region in regions]
+    copies = np.zeros(len(shared))
+    for region in regions:
+        np.add.at(copies, region.copies, 1)
+    residuals = []
+    converged = False
+    with _SubproblemSolver(regions, config, processes) as region_solver:
+        for iteration in range(1, max_iterations + 1):
+            solutions = region_solver.solve(z, prices, rho)
+            z_before = z
+            # consensus: mean of the copies shifted by their prices
+            total = np.zeros(len(shared))
+            for region, lam, (y, _) in zip(regions, prices, solutions):
+                np.add.at(total, region.copies, y + lam / rho)
+            z = total / copies
+
+            primal = dual = 0.0
+            norm_y = norm_lambda = 0.0
+            for region, lam, (y, _) in zip(regions, prices, solutions):
+                difference = y - z[region.copies]
+                lam += rho * difference
+                primal += np.sum(difference**2)
+                dual += np.sum((z - z_before)[region.copies] ** 2)
+                norm_y += np.sum(y**2)
+                norm_lambda += np.sum(lam**2)
+            primal = math.sqrt(primal)
+            dual = rho * math.sqrt(dual)
+            residuals.append((primal, dual))
+            logging.info(
+                f"ADMM iteration {iteration}: primal residual {primal},"
+                + f" dual residual {dual}"
+            )
+            scale = max(math.sqrt(norm_y), np.linalg.norm(z), 1)
+            if primal <= tolerance * scale and dual <= tolerance * max(
+                math.sqrt(norm_lambda), 1
+            ):
+                converged = True
+                break
+        solutions = region_solver.solve(z, prices, rho, values=True)
+
+    if not converged:
+        warnings.warn(
+            f"ADMM did not converge within {max_iterations} iterations.",
+            UserWarning,
+        )
+    for region, (_, values) in zip(regions, solutions):
+        for var, value in zip(region.variables, values):
+            var.set_value(value, skip_validation=True)
+    for var, value in zip(shared, z):
+        lower, upper = var.bounds
+        value = max(value, lower) if lower is not None else value
+        value = min(value, upper) if upper is not None else value
+        var.set_value(float(value), skip_validation=True)
+
+    solver_results = SolverResults()
+    solver_results.solver.status = SolverStatus.ok
+    solver_results.solver.termination_condition = (
+        TerminationCondition.optimal
+        if converged
+        else TerminationCondition.maxIterations
+    )
+    model.solver_results = solver_results
+    results = Results(model)
+    results._meta_results.update(
+        {
+            "iterations": iteration,
+            "primal_residual": residuals[-1][0],
+            "dual_residual": residuals[-1][1],
+            "residuals": residuals,
+        }
+    )
+    return results
+
+
+def myopic(
+    energysystem,
+    solver="cbc",
+    solver_io="lp",
+    cmdline_options=None,
+    **kwargs,
+):
+    r"""Solve a multi-period energy system period by period.
+
+    Instead of one model with perfect foresight over all periods, a model
+    of a single period is solved for every period in turn. The capacities
+    installed up to a period are the `existing` capacity of the
+    investments in the model of this period: the existing capacity of the
+    energy system and the capacities invested in earlier periods, as long
+    as they have not reached their lifetime. Units without investment age
+    accordingly.
+
+    Every model only knows its own period. Investment costs are the
+    annuities within the period, `overall_minimum` only applies in the
+    last period and storages start every period with their
+    `initial_storage_level`.
+
+    Parameters
+    ----------
+    energysystem : oemof.solph.EnergySystem
+        Multi-period energy system with nodes.
+    solver, solver_io, cmdline_options
+        Passed to :meth:`Model.solve <oemof.solph.Model.solve>`.
+    kwargs
+        Passed to :class:`Model <oemof.solph.Model>`, e.g. the
+        `discount_rate`.
+
+    Returns
+    -------
+    dict
+        Results like :func:`processing.results
+        <oemof.solph.processing.results>` of the multi-period model, with
+        the `sequences` and `period_scalars` of all periods. The old
+        capacities (`old`, `old_end` and `old_exo`) are the ones
+        decommissioned at the start of every period.
+
+    Note
+    ----
+    The nodes of the energy system are not changed, every period is
+    solved with copies of them.
+    """
+    if energysystem.periods is None:
+        raise ValueError("The myopic mode needs a multi-period energy system.")
+    increment = np.asarray(energysystem.timeincrement, dtype=float)
+    sequences = _time_series(energysystem, len(increment))
+    investments = _investments(energysystem)
+    years = energysystem.periods_years
+    # capacity invested and decommissioned per investment and period
+    invested = [[] for _ in investments]
+    decommissioned = [[] for _ in investments]
+
+    stitched = {}
+    offset = 0
+    for p, period in enumerate(energysystem.periods):
+        window = slice(offset, offset + len(period))
+        offset += len(period)
+        # copy the nodes, using the values of the period for time series
+        memo = {id(energysystem): None}
+        for (container, name), values in sequences:
+            original = (
+                container[name]
+                if isinstance(container, dict)
+                else getattr(container, name)
+            )
+            memo[id(original)] = sequence(values[window])
+        nodes = _copy_nodes(energysystem.nodes, memo)
+        originals = {id(c): o for c, o in zip(nodes, energysystem.nodes)}
+
+        with warnings.catch_warnings():
+            warnings.simplefilter(
+                "ignore", debugging.ExperimentalFeatureWarning
+            )
+            es = EnergySystem(
+                timeindex=period,
+                timeincrement=increment[window],
+                periods=[period],
+                infer_last_interval=False,
+                use_remaining_value=energysystem.use_remaining_value,
+            )
+        es.add(*nodes)
+
+        for n, ((key, investment), (_, copied)) in enumerate(
+            zip(investments, _investments(es))
+        ):
+            existing, old_end, old_exo = _carried_capacity(
+                investment, years, p, invested[n]
+            )
+            decommissioned[n].append((old_end + old_exo, old_end, old_exo))
+            copied.existing = existing
+            copied.age = 0
+            for name in ("maximum", "minimum", "ep_costs", "offset"):
+                values = getattr(copied, name)
+                if isinstance(values, np.ndarray):
+                    setattr(copied, name, sequence(values[p]))
+            if p < len(years) - 1:
+                copied.overall_minimum = None
+        for obj in nodes + list(es.flows().values()):
+            _shift_years(obj, years[p])
+
+        model = Model(es, **kwargs)
+        model.solve(
+            solver=solver,
+            solver_io=solver_io,
+            cmdline_options=cmdline_options,
+        )
+        logging.info(f"Myopic period {p}: objective {model.objective()}.")
+        results = processing.results(model)
+
+        for (a, b), data in results.items():
+            key = (originals[id(a)], None if b is None else originals[id(b)])
+            for name, frame in data.items():
+                stitched.setdefault(key, {}).setdefault(name, []).append(frame)
+        for n, ((a, b), _) in enumerate(_investments(es)):
+            scalars = results[a, b]["period_scalars"]
+            invested[n].append(float(scalars["invest"].iloc[0]))
+
+    stitched = {
+        key: {name: pd.concat(frames) for name, frames in data.items()}
+        for key, data in stitched.items()
+    }
+    for n, (key, _) in enumerate(investments):
+        scalars = stitched[key]["period_scalars"]
+        for column, values in zip(
+            ("old", "old_end", "old_exo"), zip(*decommissioned[n])
+        ):
+            if column in scalars:
+                scalars[column] = values
+    return stitched
+
+
+def _linear(expr):
+    repn = generate_standard_repn(expr, compute_values=True, quadratic=False)
+    if not repn.is_linear():
+        raise ValueError(
+            "The decomposition needs a linear model, but the"
+            + f" expression {expr} is nonlinear."
+        )
+    return repn
+
+
+def _bounds(constraint, repn):
+    """Bounds of the linear terms of a constraint."""
+    lower = constraint.lower
+    upper = constraint.upper
+    return (
+        None if lower is None else po.value(lower) - repn.constant,
+        None if upper is None else po.value(upper) - repn.constant,
+    )
+
+
+def _solver(config):
+    if config["solver_io"] is None:
+        opt = SolverFactory(config["solver"])
+    else:
+        opt = SolverFactory(config["solver"], solver_io=config["solver_io"])
+    for k, v in config["cmdline_options"].items():
+        opt.options[k] = v
+    return opt
+
+
+class _Solver:
+    """Solver kept for all solves of one `model`.
+
+    Persistent solvers (e.g. 'highs', 'appsi_highs' or 'gurobi_persistent')
+    keep the problem between the solves and only get the changes of the
+    model. The persistent interfaces of `pyomo.solvers` are told about new
+    and changed constraints and a changed objective, the newer interfaces
+    detect them on their own.
+    """
+
+    def __init__(self, config, model):
+        self.opt = _solver(config)
+        self.model = model
+        self.explicit = isinstance(self.opt, PersistentSolver)
+        if self.explicit:
+            self.opt.set_instance(model)
+
+    def solve(self, added=(), changed=(), objective=False):
+        if self.explicit:
+            for constraint in changed:
+                self.opt.remove_constraint(constraint)
+            for constraint in (*changed, *added):
+                self.opt.add_constraint(constraint)
+            if objective:
+                self.opt.set_objective(self.model.objective)
+        return self.opt.solve(self.model)
+
+
+def _is_operational(var, model):
+    component = var.parent_component()
+    if not component.is_indexed():
+        return False
+    time_sets = [getattr(model, name, None) for name in _TIME_SETS]
+    return any(
+        any(subset is time_set for time_set in time_sets)
+        for subset in component.index_set().subsets()
+    )
+
+
+def _decompose(model, subproblems, penalty):
+    """Split the `model` into the master problem and the subproblems."""
+    # index of every free variable in the master or in the operation
+    master_index = {}
+    operation_index = {}
+    operation = []
+    for var in model.component_data_objects(po.Var, descend_into=True):
+        if var.fixed:
+            continue
+        if _is_operational(var, model):
+            if not var.is_continuous():
+                raise ValueError(
+                    "Benders decomposition needs continuous operational"
+                    + f" variables, but {var.name} is integer."
+                )
+            operation_index[id(var)] = len(operation)
+            operation.append(var)
+        else:
+            master_index[id(var)] = len(master_index)
+    master_variables = [None] * len(master_index)
+    for var in model.component_data_objects(po.Var, descend_into=True):
+        if id(var) in master_index:
+            master_variables[master_index[id(var)]] = var
+
+    # rows as (lower, upper, operational terms, master terms)
+    master_rows = []
+    rows = []
+    parent = list(range(len(operation)))
+
+    def _find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for constraint in model.component_data_objects(
+        po.Constraint, active=True, descend_into=True
+    ):
+        repn = _linear(constraint.body)
+        lower, upper = _bounds(constraint, repn)
+        y_terms, x_terms = [], []
+        for var, coefficient in zip(repn.linear_vars, repn.linear_coefs):
+            if id(var) in operation_index:
+                y_terms.append((operation_index[id(var)], coefficient))
+            else:
+                x_terms.append((master_index[id(var)], coefficient))
+        if not y_terms:
+            master_rows.append((lower, upper, x_terms))
+            continue
+        rows.append((lower, upper, y_terms, x_terms))
+        first = _find(y_terms[0][0])
+        for j, _ in y_terms[1:]:
+            parent[_find(j)] = first
+
+    objective = next(model.component_data_objects(po.Objective, active=True))
+    if objective.sense != po.minimize:
+        raise ValueError("Benders decomposition needs a minimization.")
+    repn = _linear(objective.expr)
+    master_costs = {}
+    operation_costs = {}
+    for var, coefficient in zip(repn.linear_vars, repn.linear_coefs):
+        if id(var) in operation_index:
+            operation_costs[operation_index[id(var)]] = coefficient
+        else:
+            master_costs[master_index[id(var)]] = coefficient
+
+    # connected parts of the operation, distributed to the subproblems
+    components = {}
+    for j in range(len(operation)):
+        components.setdefault(_find(j), []).append(j)
+    groups = [[] for _ in range(max(min(subproblems, len(components)), 1))]
+    for members in sorted(components.values(), key=len, reverse=True):
+        min(groups, key=len).extend(members)
+    group_of = {}
+    for g, members in enumerate(groups):
+        for j in members:
+            group_of[j] = g
+
+    group_rows = [[] for _ in groups]
+    for row in rows:
+        group_rows[group_of[row[2][0][0]]].append(row)
+    parts = []
+    for members, part_rows in zip(groups, group_rows):
+        members = sorted(members)
+        parts.append(
+            _Subproblem(
+                [operation[j] for j in members],
+                {j: k for k, j in enumerate(members)},
+                part_rows,
+                operation_costs,
+                penalty,
+            )
+        )
+    master = _Master(
+        master_variables, master_rows, master_costs, repn.constant
+    )
+    return master, parts
+
+
+def _regions(model, coupling):
+    """Split the `model` at the `coupling` flows into regions."""
+    coupling = set(coupling)
+    unknown = coupling - set(model.flows)
+    if unknown:
+        raise ValueError(f"The coupling flows {unknown} are not in the model.")
+
+    # regions of the nodes, connected by all other flows
+    node_parent = {node: node for node in model.es.nodes}
+
+    def _find_node(node):
+        while node_parent[node] is not node:
+            node = node_parent[node]
+        return node
+
+    for i, o in model.flows:
+        if (i, o) not in coupling:
+            node_parent[_find_node(i)] = _find_node(o)
+    roots = {}
+    region_of_node = {
+        node: roots.setdefault(_find_node(node), len(roots))
+        for node in model.es.nodes
+    }
+
+    # free variables, the coupling flows are shared by the regions
+    shared_index = {}
+    shared = []
+    flow_region = {}
+    for (i, o, *_), var in model.flow.items():
+        if var.fixed:
+            continue
+        if (i, o) in coupling:
+            shared_index[id(var)] = len(shared)
+            shared.append(var)
+        flow_region[id(var)] = region_of_node[i]
+    index = {}
+    variables = []
+    for var in model.component_data_objects(po.Var, descend_into=True):
+        if var.fixed or id(var) in shared_index:
+            continue
+        if not var.is_continuous():
+            raise ValueError(
+                "ADMM needs continuous variables, but"
+                + f" {var.name} is integer."
+            )
+        index[id(var)] = len(variables)
+        variables.append(var)
+
+    parent = list(range(len(variables)))
+
+    def _find(j):
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        return j
+
+    rows = []
+    for constraint in model.component_data_objects(
+        po.Constraint, active=True, descend_into=True
+    ):
+        repn = _linear(constraint.body)
+        terms, shared_terms = [], []
+        for var, coefficient in zip(repn.linear_vars, repn.linear_coefs):
+            if id(var) in shared_index:
+                shared_terms.append((shared_index[id(var)], coefficient))
+            else:
+                terms.append((index[id(var)], coefficient))
+        if not terms:
+            raise ValueError(
+                f"The constraint {constraint.name} only contains coupling"
+                + " flows."
+            )
+        rows.append((*_bounds(constraint, repn), terms, shared_terms))
+        first = _find(terms[0][0])
+        for j, _ in terms[1:]:
+            parent[_find(j)] = first
+
+    objective = next(model.component_data_objects(po.Objective, active=True))
+    if objective.sense != po.minimize:
+        raise ValueError("ADMM needs a minimization.")
+    repn = _linear(objective.expr)
+    costs = {}
+    shared_costs = {}
+    for var, coefficient in zip(repn.linear_vars, repn.linear_coefs):
+        if id(var) in shared_index:
+            shared_costs[shared_index[id(var)]] = coefficient
+        else:
+            costs[index[id(var)]] = coefficient
+
+    # every connected part belongs to the region of one of its flows
+    component_region = {}
+    for j, var in enumerate(variables):
+        if id(var) in flow_region:
+            component_region.setdefault(_find(j), flow_region[id(var)])
+    for _, _, terms, shared_terms in rows:
+        for k, _ in shared_terms:
+            component_region.setdefault(
+                _find(terms[0][0]), flow_region[id(shared[k])]
+            )
+    region_of = [
+        component_region.get(_find(j), 0) for j in range(len(variables))
+    ]
+
+    members = [[] for _ in roots]
+    for j, r in enumerate(region_of):
+        members[r].append(j)
+    region_rows = [[] for _ in roots]
+    for row in rows:
+        region_rows[region_of[row[2][0][0]]].append(row)
+    copies = [
+        sorted({k for *_, shared_terms in part for k, _ in shared_terms})
+        for part in region_rows
+    ]
+    # coupling flows only appearing in the objective
+    for k, var in enumerate(shared):
+        if not any(k in c for c in copies):
+            copies[flow_region[id(var)]].append(k)
+    number = np.zeros(len(shared))
+    for c in copies:
+        number[c] += 1
+
+    regions = []
+    for r in range(len(roots)):
+        if not (members[r] or copies[r]):
+            continue
+        regions.append(
+            _Region(
+                len(regions),
+                [variables[j] for j in members[r]],
+                {j: n for n, j in enumerate(members[r])},
+                region_rows[r],
+                costs,
+                copies[r],
+                {
+                    k: shared_costs[k] / number[k]
+                    for k in copies[r]
+                    if k in shared_costs
+                },
+                [var.bounds for var in shared],
+            )
+        )
+    return regions, shared
+
+
+def _copy_nodes(nodes, memo):
+    """Deep copies of the `nodes`, which are hashed by their label. So all
+    copies get their label before they are used as keys."""
+    copies = []
+    for node in nodes:
+        copies.append(copy.copy(node))
+        memo[id(node)] = copies[-1]
+    for node, copied in zip(nodes, copies):
+        copied.__dict__ = copy.deepcopy(node.__dict__, memo)
+    return copies
+
+
+def _investments(energysystem):
+    """Investments of the flows and nodes, keyed like the results."""
+    found = [
+        ((i, o), flow.investment)
+        for (i, o), flow in energysystem.flows().items()
+        if isinstance(flow.investment, Investment)
+    ]
+    found += [
+        ((node, None), node.investment)
+        for node in energysystem.nodes
+        if isinstance(getattr(node, "investment", None), Investment)
+    ]
+    return found
+
+
+def _carried_capacity(investment, years, p, invested):
+    """Capacity installed at the start of period `p` from the `invested`
+    capacities of the earlier periods and the existing capacity, and the
+    endogenous and exogenous capacity decommissioned at this start,
+    following the rules of the multi-period model."""
+    lifetime = investment.lifetime
+    if lifetime is None:
+        lifetime = math.inf
+
+    def _existing(q):
+        if q > 0 and lifetime - investment.age <= years[q]:
+            return 0
+        return investment.existing
+
+    def _endogenous(q):
+        return sum(
+            value
+            for v, value in enumerate(invested)
+            if years[q] - years[v] < lifetime
+        )
+
+    if p == 0:
+        return _existing(0), 0.0, 0.0
+    return (
+        _existing(p) + _endogenous(p),
+        float(_endogenous(p - 1) - _endogenous(p)),
+        float(_existing(p - 1) - _existing(p)),
+    )
+
+
+def _shift_years(obj, shift):
+    """Age a unit by `shift` years and start its yearly fixed costs
+    `shift` years later."""
+    containers = [obj]
+    if isinstance(getattr(obj, "investment", None), Investment):
+        containers.append(obj.investment)
+    for container in containers:
+        costs = getattr(container, "fixed_costs", None)
+        if isinstance(costs, np.ndarray):
+            container.fixed_costs = sequence(costs[shift:])
+    if not isinstance(getattr(obj, "investment", None), Investment):
+        age = getattr(obj, "age", None)
+        if getattr(obj, "lifetime", None) is not None and age is not None:
+            obj.age = age + shift
+
+
+class _Master:
+    """Master problem of the Benders decomposition."""
+
+    def __init__(self, variables, rows, costs, constant):
+        self.variables = variables
+        self.costs_of = costs
+        self.constant = constant
+        m = po.ConcreteModel()
+        m.x = po.Var(range(len(variables)))
+        for k, var in enumerate(variables):
+            m.x[k].domain = var.domain
+            m.x[k].setlb(var.lb)
+            m.x[k].setub(var.ub)
+        m.rows = po.ConstraintList()
+        for lower, upper, x_terms in rows:
+            m.rows.add((lower, sum(b * m.x[k] for k, b in x_terms), upper))
+        m.cuts = po.ConstraintList()
+        self.model = m
+        self.solver = None
+        self.new_cuts = []
+
+    def add_estimates(self, lower_bounds):
+        m = self.model
+        m.theta = po.Var(range(len(lower_bounds)))
+        for s, bound in enumerate(lower_bounds):
+            m.theta[s].setlb(bound)
+        m.objective = po.Objective(
+            expr=self.constant
+            + sum(c * m.x[k] for k, c in self.costs_of.items())
+            + sum(m.theta.values())
+        )
+
+    def add_cut(self, s, objective, gradient, x):
+        m = self.model
+        self.new_cuts.append(
+            m.cuts.add(
+                m.theta[s]
+                >= objective
+                + sum(g * (m.x[k] - x[k]) for k, g in gradient.items())
+            )
+        )
+
+    def solve(self, config):
+        if self.solver is None:
+            self.solver = _Solver(config, self.model)
+            self.new_cuts = []
+        results = self.solver.solve(added=self.new_cuts)
+        self.new_cuts = []
+        if results.solver.termination_condition != "optimal":
+            raise RuntimeError(
+                "The master problem could not be solved: "
+                + f"{results.solver.termination_condition}"
+            )
+        return results
+
+    def objective(self):
+        return po.value(self.model.objective)
+
+    def values(self):
+        return [self.model.x[k].value or 0 for k in self.model.x]
+
+    def costs(self):
+        x = self.values()
+        return self.constant + sum(c * x[k] for k, c in self.costs_of.items())
+
+
+class _Subproblem:
+    """Linear operational problem for given investment decisions."""
+
+    def __init__(self, variables, local, rows, costs, penalty):
+        # bounds of the variables, the model itself is built when solving
+        self.bounds = [var.bounds for var in variables]
+        self.variables = variables
+        self.rows = [
+            (
+                lower,
+                upper,
+                [(local[j], a) for j, a in y_terms],
+                x_terms,
+            )
+            for lower, upper, y_terms, x_terms in rows
+        ]
+        self.costs = {local[j]: c for j, c in costs.items() if j in local}
+        self.penalty = penalty
+        self.model = None
+        self.solver = None
+
+    def __getstate__(self):
+        # the variables of the original model stay in the main process, the
+        # model and its solver are created by the process solving it
+        state = dict(self.__dict__)
+        state["variables"] = None
+        state["model"] = None
+        state["solver"] = None
+        return state
+
+    def _build(self):
+        m = po.ConcreteModel()
+        m.y = po.Var(range(len(self.bounds)))
+        for j, (lower, upper) in enumerate(self.bounds):
+            m.y[j].setlb(lower)
+            m.y[j].setub(upper)
+        # the investment decisions only change the right hand sides
+        masters = sorted({k for *_, x_terms in self.rows for k, _ in x_terms})
+        m.x = po.Param(masters, mutable=True, initialize=0)
+        linking = [i for i, row in enumerate(self.rows) if row[3]]
+        m.slack_up = po.Var(linking, within=po.NonNegativeReals)
+        m.slack_down = po.Var(linking, within=po.NonNegativeReals)
+        m.rows = po.Constraint(range(len(self.rows)))
+        for i, (lower, upper, y_terms, x_terms) in enumerate(self.rows):
+            body = sum(a * m.y[j] for j, a in y_terms) + sum(
+                b * m.x[k] for k, b in x_terms
+            )
+            if x_terms:
+                body = body + m.slack_up[i] - m.slack_down[i]
+            m.rows[i] = (lower, body, upper)
+        # without costs of the slacks, the linking rows do not restrict the
+        # operation (relaxed subproblem)
+        m.penalty = po.Param(mutable=True, initialize=self.penalty)
+        m.objective = po.Objective(
+            expr=sum(c * m.y[j] for j, c in self.costs.items())
+            + m.penalty
+            * (sum(m.slack_up.values()) + sum(m.slack_down.values()))
+        )
+        m.dual = po.Suffix(direction=po.Suffix.IMPORT)
+        self.model = m
+        self.linking = linking
+
+    def solve(self, config, x, relaxed=False, values=False):
+        """Solve for the investment decisions `x` and return the objective,
+        its gradient with respect to `x`, the values of the variables (if
+        requested) and the violation of the linking constraints."""
+        if self.model is None:
+            self._build()
+        m = self.model
+        penalty = 0 if relaxed else self.penalty
+        changed_penalty = po.value(m.penalty) != penalty
+        m.penalty = penalty
+        for k in m.x:
+            m.x[k] = 0 if x is None else x[k]
+        if self.solver is None:
+            self.solver = _Solver(config, m)
+        results = self.solver.solve(
+            changed=[m.rows[i] for i in self.linking],
+            objective=changed_penalty,
+        )
+        if results.solver.termination_condition != "optimal":
+            raise RuntimeError(
+                "A subproblem of the Benders decomposition could not be"
+                + f" solved: {results.solver.termination_condition}"
+            )
+
+        gradient = {}
+        violation = 0.0
+        if not relaxed:
+            for i in self.linking:
+                dual = m.dual.get(m.rows[i], 0) or 0
+                for k, b in self.rows[i][3]:
+                    gradient[k] = gradient.get(k, 0) - dual * b
+                violation += m.slack_up[i].value + m.slack_down[i].value
+        objective = po.value(m.objective)
+        y = [m.y[j].value for j in m.y] if values else None
+        return objective, gradient, y, violation
+
+
+class _Region:
+    """Region of the ADMM with copies of the coupling flows."""
+
+    def __init__(
+        self, number, variables, local, rows, costs, copies, shared, bounds
+    ):
+        self.number = number
+        self.variables = variables
+        self.bounds = [var.bounds for var in variables]
+        self.copies = np.array(copies, dtype=int)
+        self.shared_bounds = [bounds[k] for k in copies]
+        position = {k: n for n, k in enumerate(copies)}
+        self.rows = [
+            (
+                lower,
+                upper,
+                [(local[j], a) for j, a in terms],
+                [(position[k], b) for k, b in shared_terms],
+            )
+            for lower, upper, terms, shared_terms in rows
+        ]
+        self.costs = {local[j]: c for j, c in costs.items() if j in local}
+        self.shared_costs = {position[k]: c for k, c in shared.items()}
+        self.model = None
+        self.solver = None
+
+    def __getstate__(self):
+        # the variables of the original model stay in the main process, the
+        # model and its solver are created by the process solving it
+        state = dict(self.__dict__)
+        state["variables"] = None
+        state["model"] = None
+        state["solver"] = None
+        return state
+
+    def _build(self):
+        m = po.ConcreteModel()
+        m.x = po.Var(range(len(self.bounds)))
+        for j, (lower, upper) in enumerate(self.bounds):
+            m.x[j].setlb(lower)
+            m.x[j].setub(upper)
+        copies = range(len(self.copies))
+        m.y = po.Var(copies)
+        for k, (lower, upper) in enumerate(self.shared_bounds):
+            m.y[k].setlb(lower)
+            m.y[k].setub(upper)
+        m.z = po.Param(copies, mutable=True, initialize=0)
+        m.price = po.Param(copies, mutable=True, initialize=0)
+        m.rho = po.Param(mutable=True, initialize=1)
+        m.rows = po.ConstraintList()
+        for lower, upper, terms, shared_terms in self.rows:
+            m.rows.add(
+                (
+                    lower,
+                    sum(a * m.x[j] for j, a in terms)
+                    + sum(b * m.y[k] for k, b in shared_terms),
+                    upper,
+                )
+            )
+        m.objective = po.Objective(
+            expr=sum(c * m.x[j] for j, c in self.costs.items())
+            + sum(c * m.y[k] for k, c in self.shared_costs.items())
+            + sum(
+                m.price[k] * (m.y[k] - m.z[k])
+                + m.rho / 2 * (m.y[k] - m.z[k]) ** 2
+                for k in copies
+            )
+        )
+        self.model = m
+
+    def solve(self, config, z, prices, rho, values=False):
+        """Solve for the consensus `z` and the `prices` of all regions and
+        return the copies of the coupling flows and the values of the
+        other variables (if requested)."""
+        if self.model is None:
+            self._build()
+        m = self.model
+        m.rho = rho
+        for k, (shared_value, price) in enumerate(
+            zip(z[self.copies], prices[self.number])
+        ):
+            m.z[k] = float(shared_value)
+            m.price[k] = float(price)
+        if self.solver is None:
+            self.solver = _Solver(config, m)
+        results = self.solver.solve(objective=True)
+        if results.solver.termination_condition != "optimal":
+            raise RuntimeError(
+                f"Region {self.number} of the ADMM could not be solved: "
+                + f"{results.solver.termination_condition}"
+            )
+        y = np.array([m.y[k].value for k in m.y], dtype=float)
+        x = [m.x[j].value for j in m.x] if values else None
+        return y, x
+
+
+def _worker(parts, config, connection):
+    """Solve the subproblems `parts` on request of the main process."""
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        args, kwargs = message
+        try:
+            connection.send(
+                [part.solve(config, *args, **kwargs) for part in parts]
+            )
+        except Exception as error:  # passed to the main process
+            connection.send(error)
+
+
+class _SubproblemSolver:
+    """Solve the subproblems in the main process or in worker processes.
+
+    Every worker process keeps its subproblems, only the arguments of
+    their `solve` method and the solutions are exchanged.
+    """
+
+    def __init__(self, parts, config, processes):
+        self.parts = parts
+        self.config = config
+        self.processes = min(processes, len(parts))
+        self.workers = []
+
+    def __enter__(self):
+        if self.processes > 1:
+            context = multiprocessing.get_context()
+            for w in range(self.processes):
+                here, there = context.Pipe()
+                process = context.Process(
+                    target=_worker,
+                    args=(self.parts[w :: self.processes], self.config, there),
+                    daemon=True,
+                )
+                process.start()
+                self.workers.append((process, here))
+        return self
+
+    def __exit__(self, *exc):
+        for process, connection in self.workers:
+            connection.send(None)
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    def solve(self, *args, **kwargs):
+        """Solutions of all subproblems, solved with the given arguments."""
+        if not self.workers:
+            return [
+                part.solve(self.config, *args, **kwargs) for part in self.parts
+            ]
+        for _, connection in self.workers:
+            connection.send((args, kwargs))
+        solutions = [None] * len(self.parts)
+        for w, (_, connection) in enumerate(self.workers):
+            answer = connection.recv()
+            if isinstance(answer, Exception):
+                raise answer
+            solutions[w :: self.processes] = answer
+        return solutions
@@ -31,6 +31,7 @@ from oemof.network import Edge
 from oemof.tools import debugging
 
 from oemof.solph._options import Investment
+from oemof.solph._plumbing import LazySequence
 from oemof.solph._plumbing import sequence
 
 
@@ -326,18 +327,28 @@ class Flow(Edge):
         }
         if self.investment is None and self.nominal_capacity is None:
             for attr in need_nominal_capacity:
-                if isinstance(getattr(self, attr), Iterable):
-                    the_attr = getattr(self, attr)[0]
+                the_attr = getattr(self, attr)
+                if isinstance(the_attr, LazySequence):
+                    # do not load lazy sequences, they count as set
+                    is_default = False
+                elif isinstance(the_attr, Iterable):
+                    is_default = (
+                        the_attr[0] == need_nominal_capacity_defaults[attr]
+                    )
                 else:
-                    the_attr = getattr(self, attr)
-                if the_attr != need_nominal_capacity_defaults[attr]:
+                    is_default = (
+                        the_attr == need_nominal_capacity_defaults[attr]
+                    )
+                if not is_default:
                     raise AttributeError(
                         f"If {attr} is set in a flow, "
                         "nominal_capacity must be set as well."
                     )
 
-        if self.nominal_capacity is not None and not math.isfinite(
-            self.maximum[0]
+        if (
+            self.nominal_capacity is not None
+            and not isinstance(self.maximum, LazySequence)
+            and not math.isfinite(self.maximum[0])
         ):
             raise ValueError(infinite_error_msg.format("maximum"))
 
@@ -372,3 +383,13 @@ class Flow(Edge):
                 "Investment into a non-convex flows needs a maximum "
                 + "investment to be set."
             )
+
+        if (
+            self.investment
+            and self.nonconvex
+            and self.nonconvex.number_of_units > 1
+        ):
+            raise ValueError(
+                "Investment into non-convex flows with several units"
+                + " (number_of_units > 1) is not supported."
+            )
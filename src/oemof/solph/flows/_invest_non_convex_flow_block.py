@@ -135,10 +135,10 @@ class InvestNonConvexFlowBlock(ScalarBlock):
             if (i, o) in self.LINEAR_INVEST_NON_CONVEX_FLOWS:
                 return (
                     m.flows[i, o].investment.minimum[p],
-                    m.flows[i, o].investment.maximum[p],
+                    _shared.investment_maximum(m, i, o, p),
                 )
             elif (i, o) in self.OFFSET_INVEST_NON_CONVEX_FLOWS:
-                return 0, m.flows[i, o].investment.maximum[p]
+                return 0, _shared.investment_maximum(m, i, o, p)
 
         # Create the `invest` variable for the nonconvex investment flow.
         self.invest = Var(
@@ -232,7 +232,7 @@ class InvestNonConvexFlowBlock(ScalarBlock):
 
         def _linearization_rule_invest_non_convex_one(_, i, o, p, t):
             expr = (
-                self.status[i, o, t] * m.flows[i, o].investment.maximum[p]
+                self.status[i, o, t] * _shared.investment_maximum(m, i, o, p)
                 >= self.status_nominal[i, o, t]
             )
             return expr
@@ -274,7 +274,7 @@ class InvestNonConvexFlowBlock(ScalarBlock):
             expr = (
                 self.invest[i, o, p]
                 - (1 - self.status[i, o, t])
-                * m.flows[i, o].investment.maximum[p]
+                * _shared.investment_maximum(m, i, o, p)
                 <= self.status_nominal[i, o, t]
             )
             return expr
@@ -374,7 +374,7 @@ class InvestNonConvexFlowBlock(ScalarBlock):
                 for p in m.PERIODS:
                     expr = (
                         self.invest[i, o, p]
-                        <= m.flows[i, o].investment.maximum[p]
+                        <= _shared.investment_maximum(m, i, o, p)
                         * self.invest_status[i, o, p]
                     )
                     self.maximum_investment.add((i, o, p), expr)
@@ -20,7 +20,6 @@ from warnings import warn
 
 import numpy as np
 from oemof.tools import debugging
-from oemof.tools import economics
 from pyomo.core import Binary
 from pyomo.core import BuildAction
 from pyomo.core import Constraint
@@ -32,6 +31,8 @@ from pyomo.core.base.block import ScalarBlock
 
 from oemof.solph._plumbing import valid_sequence
 
+from . import _shared
+
 
 class InvestmentFlowBlock(ScalarBlock):
     r"""Block for all flows with :attr:`Investment` being not None.
@@ -231,7 +232,7 @@ class InvestmentFlowBlock(ScalarBlock):
                     m.flows[i, o].investment.maximum[p],
                 )
             elif (i, o) in self.NON_CONVEX_INVESTFLOWS:
-                return 0, m.flows[i, o].investment.maximum[p]
+                return 0, _shared.investment_maximum(m, i, o, p)
 
         # create invest variable for an investment flow
         self.invest = Var(
@@ -497,22 +498,10 @@ class InvestmentFlowBlock(ScalarBlock):
                         )
                         raise ValueError(msg)
 
-                    # get the period matrix describing the temporal distance
-                    # between all period combinations.
-                    periods_matrix = m.es.periods_matrix
-
-                    # get the index of the minimum value in each row greater
-                    # equal than the lifetime. This value equals the
-                    # decommissioning period if not zero. The index of this
-                    # value represents the investment period. If np.where
-                    # condition is not met in any row, min value will be zero
-                    decomm_periods = np.argmin(
-                        np.where(
-                            (periods_matrix >= lifetime),
-                            periods_matrix,
-                            np.inf,
-                        ),
-                        axis=1,
+                    # get the decommissioning period of each investment
+                    # period (or zero) from the cache shared by all blocks.
+                    decomm_periods = m.period_cache.decommissioning_periods(
+                        lifetime
                     )
 
                     # no decommissioning in first period
@@ -576,28 +565,21 @@ class InvestmentFlowBlock(ScalarBlock):
                 capacity to be decommissioned due to reaching its lifetime
                 """
                 for i, o in self.INVESTFLOWS:
-                    age = m.flows[i, o].investment.age
-                    lifetime = m.flows[i, o].investment.lifetime
-                    is_decommissioned = False
+                    # existing capacity is decommissioned once (never in the
+                    # first period) when reaching its lifetime
+                    decomm_p = m.period_cache.exo_decommissioning_period(
+                        m.flows[i, o].investment.lifetime,
+                        m.flows[i, o].investment.age,
+                    )
                     for p in m.PERIODS:
-                        # No shutdown in first period
-                        if p == 0:
-                            expr = self.old_exo[i, o, p] == 0
-                            self.old_rule_exo.add((i, o, p), expr)
-                        elif lifetime - age <= m.es.periods_years[p]:
-                            # Track decommissioning status
-                            if not is_decommissioned:
-                                expr = (
-                                    self.old_exo[i, o, p]
-                                    == m.flows[i, o].investment.existing
-                                )
-                                is_decommissioned = True
-                            else:
-                                expr = self.old_exo[i, o, p] == 0
-                            self.old_rule_exo.add((i, o, p), expr)
+                        if p == decomm_p:
+                            expr = (
+                                self.old_exo[i, o, p]
+                                == m.flows[i, o].investment.existing
+                            )
                         else:
                             expr = self.old_exo[i, o, p] == 0
-                            self.old_rule_exo.add((i, o, p), expr)
+                        self.old_rule_exo.add((i, o, p), expr)
 
             self.old_rule_exo = Constraint(
                 self.INVESTFLOWS, m.PERIODS, noruleinit=True
@@ -894,6 +876,8 @@ class InvestmentFlowBlock(ScalarBlock):
         investment_costs = 0
         period_investment_costs = {p: 0 for p in m.PERIODS}
         fixed_costs = 0
+        # costs of the investment of every flow and period (multi-period)
+        option_costs = {}
 
         if m.es.periods is None:
             for i, o in self.CONVEX_INVESTFLOWS:
@@ -926,17 +910,14 @@ class InvestmentFlowBlock(ScalarBlock):
                 )
                 for p in m.PERIODS:
 
-                    annuity = economics.annuity(
-                        capex=m.flows[i, o].investment.ep_costs[p],
-                        n=lifetime,
-                        wacc=interest,
-                    )
-                    duration = min(
-                        m.es.end_year_of_optimization - m.es.periods_years[p],
+                    annuity = m.period_cache.annuity(
+                        m.flows[i, o].investment.ep_costs[p],
                         lifetime,
+                        interest,
                     )
-                    present_value_factor_remaining = 1 / economics.annuity(
-                        capex=1, n=duration, wacc=interest
+                    duration = m.period_cache.investment_duration(p, lifetime)
+                    present_value_factor_remaining = (
+                        m.period_cache.present_value_factor(duration, interest)
                     )
                     investment_costs_increment = (
                         self.invest[i, o, p]
@@ -958,6 +939,9 @@ class InvestmentFlowBlock(ScalarBlock):
                         investment_costs_increment + remaining_value_difference
                     )
                     period_investment_costs[p] += investment_costs_increment
+                    option_costs[i, o, p] = (
+                        investment_costs_increment + remaining_value_difference
+                    )
 
             for i, o in self.NON_CONVEX_INVESTFLOWS:
                 lifetime = m.flows[i, o].investment.lifetime
@@ -966,22 +950,19 @@ class InvestmentFlowBlock(ScalarBlock):
                     debugging.SuspiciousUsageWarning,
                 )
                 for p in m.PERIODS:
-                    annuity = economics.annuity(
-                        capex=m.flows[i, o].investment.ep_costs[p],
-                        n=lifetime,
-                        wacc=interest,
-                    )
-                    duration = min(
-                        m.es.end_year_of_optimization - m.es.periods_years[p],
+                    annuity = m.period_cache.annuity(
+                        m.flows[i, o].investment.ep_costs[p],
                         lifetime,
+                        interest,
                     )
-                    present_value_factor_remaining = 1 / economics.annuity(
-                        capex=1, n=duration, wacc=interest
+                    duration = m.period_cache.investment_duration(p, lifetime)
+                    present_value_factor_remaining = (
+                        m.period_cache.present_value_factor(duration, interest)
                     )
-                    annuity_offset = economics.annuity(
-                        capex=m.flows[i, o].investment.offset[p],
-                        n=lifetime,
-                        wacc=interest,
+                    annuity_offset = m.period_cache.annuity(
+                        m.flows[i, o].investment.offset[p],
+                        lifetime,
+                        interest,
                     )
                     investment_costs_increment = (
                         self.invest[i, o, p]
@@ -1005,6 +986,9 @@ class InvestmentFlowBlock(ScalarBlock):
                         investment_costs_increment + remaining_value_difference
                     )
                     period_investment_costs[p] += investment_costs_increment
+                    option_costs[i, o, p] = (
+                        investment_costs_increment + remaining_value_difference
+                    )
 
             for i, o in self.INVESTFLOWS:
                 if valid_sequence(
@@ -1016,11 +1000,13 @@ class InvestmentFlowBlock(ScalarBlock):
                             m.es.end_year_of_optimization,
                             m.es.periods_years[p] + lifetime,
                         )
-                        fixed_costs += sum(
+                        option_fixed_costs = sum(
                             self.invest[i, o, p]
                             * m.flows[i, o].investment.fixed_costs[pp]
                             for pp in range(m.es.periods_years[p], range_limit)
                         )
+                        fixed_costs += option_fixed_costs
+                        option_costs[i, o, p] += option_fixed_costs
 
             for i, o in self.EXISTING_INVESTFLOWS:
                 if valid_sequence(
@@ -1039,6 +1025,7 @@ class InvestmentFlowBlock(ScalarBlock):
 
         self.investment_costs = Expression(expr=investment_costs)
         self.period_investment_costs = period_investment_costs
+        self.option_costs = option_costs
         self.fixed_costs = Expression(expr=fixed_costs)
         self.costs = Expression(expr=investment_costs + fixed_costs)
 
@@ -1092,18 +1079,20 @@ class InvestmentFlowBlock(ScalarBlock):
                 remaining_lifetime = lifetime - (
                     end_year_of_optimization - m.es.periods_years[p]
                 )
-                remaining_annuity = economics.annuity(
-                    capex=m.flows[i, o].investment.ep_costs[-1],
-                    n=remaining_lifetime,
-                    wacc=interest,
+                remaining_annuity = m.period_cache.annuity(
+                    m.flows[i, o].investment.ep_costs[-1],
+                    remaining_lifetime,
+                    interest,
                 )
-                original_annuity = economics.annuity(
-                    capex=m.flows[i, o].investment.ep_costs[p],
-                    n=remaining_lifetime,
-                    wacc=interest,
+                original_annuity = m.period_cache.annuity(
+                    m.flows[i, o].investment.ep_costs[p],
+                    remaining_lifetime,
+                    interest,
                 )
-                present_value_factor_remaining = 1 / economics.annuity(
-                    capex=1, n=remaining_lifetime, wacc=interest
+                present_value_factor_remaining = (
+                    m.period_cache.present_value_factor(
+                        remaining_lifetime, interest
+                    )
                 )
                 convex_investment_costs = (
                     self.invest[i, o, p]
@@ -1155,7 +1144,7 @@ class InvestmentFlowBlock(ScalarBlock):
             for i, o in self.NON_CONVEX_INVESTFLOWS:
                 for p in m.PERIODS:
                     expr = self.invest[i, o, p] <= (
-                        m.flows[i, o].investment.maximum[p]
+                        _shared.investment_maximum(m, i, o, p)
                         * self.invest_status[i, o, p]
                     )
                     self.maximum_rule.add((i, o, p), expr)
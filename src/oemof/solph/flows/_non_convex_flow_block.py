@@ -78,7 +78,9 @@ class NonConvexFlowBlock(ScalarBlock):
     def _create_variables(self):
         r"""
         :math:`Y_{status}` (binary) `om.NonConvexFlowBlock.status`:
-            Variable indicating if flow is >= 0
+            Variable indicating if flow is >= 0. For flows with several
+            identical units (MULTI_UNIT_FLOWS), it is an integer giving the
+            number of units online.
 
         :math:`P_{max,status}` Status_nominal (continuous)
             Variable indicating if flow is >= 0
@@ -89,6 +91,9 @@ class NonConvexFlowBlock(ScalarBlock):
         self.status = Var(
             self.FIXED_CAPACITY_NONCONVEX_FLOWS, m.TIMESTEPS, within=Binary
         )
+        _shared.unit_count_domain(
+            self, self.status, self.FIXED_CAPACITY_NONCONVEX_FLOWS
+        )
         for o, i in self.FIXED_CAPACITY_NONCONVEX_FLOWS:
             if m.flows[o, i].nonconvex.initial_status is not None:
                 for t in range(
@@ -164,8 +169,10 @@ class NonConvexFlowBlock(ScalarBlock):
     def _status_nominal_constraint(self):
         r"""
         .. math::
-            P_{max,status}(t) =  Y_{status}(t) \cdot P_{nom}, \\
+            P_{max,status}(t) =  Y_{status}(t) \cdot P_{nom} / N, \\
             \forall t \in \textrm{TIMESTEPS}.
+
+        With :math:`N` being the `number_of_units` (1 by default).
         """
         m = self.parent_block()
 
@@ -173,7 +180,9 @@ class NonConvexFlowBlock(ScalarBlock):
             """Rule definition for status_nominal"""
             expr = (
                 self.status_nominal[i, o, t]
-                == self.status[i, o, t] * m.flows[i, o].nominal_capacity
+                == self.status[i, o, t]
+                * m.flows[i, o].nominal_capacity
+                / m.flows[i, o].nonconvex.number_of_units
             )
             return expr
 
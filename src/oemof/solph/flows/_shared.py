@@ -20,6 +20,7 @@ from pyomo.core import Binary
 from pyomo.core import BuildAction
 from pyomo.core import Constraint
 from pyomo.core import Expression
+from pyomo.core import NonNegativeIntegers
 from pyomo.core import NonNegativeReals
 from pyomo.core import Set
 from pyomo.core import Var
@@ -27,6 +28,22 @@ from pyomo.core import Var
 from oemof.solph._plumbing import valid_sequence
 
 
+def investment_maximum(model, i, o, p):
+    r"""Maximal investment into the flow from `i` to `o` in period `p`.
+
+    The value is used as bound of the `invest` variable and as big-M value
+    of nonconvex investments. It is the `maximum` of the investment or, if
+    smaller, the bound derived by ``Model(tighten_big_m=True)``, but never
+    less than the `minimum` of the investment.
+    """
+    investment = model.flows[i, o].investment
+    maximum = investment.maximum[p]
+    bound = model.investment_bounds.get((i, o))
+    if bound is None or bound >= maximum:
+        return maximum
+    return max(bound, investment.minimum[p])
+
+
 def sets_for_non_convex_flows(block, group):
     r"""Creates all sets for non-convex flows.
 
@@ -55,26 +72,64 @@ def sets_for_non_convex_flows(block, group):
         `maximum_shutdowns` being not None.
     MINUPTIMEFLOWS
         A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
-        `minimum_uptime` being > 0.
+        `minimum_uptime` being > 0 and the 'window' formulation.
     MINDOWNTIMEFLOWS
         A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
-        `minimum_downtime` being > 0.
+        `minimum_downtime` being > 0 and the 'window' formulation.
+    TURN_ON_UPTIMEFLOWS
+        A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
+        `minimum_uptime` being > 0 and the 'turn_on' formulation.
+    TURN_ON_DOWNTIMEFLOWS
+        A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
+        `minimum_downtime` being > 0 and the 'turn_on' formulation.
+    TURN_ON_FLOWS
+        Union of TURN_ON_UPTIMEFLOWS and TURN_ON_DOWNTIMEFLOWS. These flows
+        are part of STARTUPFLOWS and SHUTDOWNFLOWS.
     POSITIVE_GRADIENT_FLOWS
         A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
         `positive_gradient` being not None.
     NEGATIVE_GRADIENT_FLOWS
         A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
         `negative_gradient` being not None.
+    MULTI_UNIT_FLOWS
+        A subset of set FIXED_CAPACITY_NONCONVEX_FLOWS with the attribute
+        `number_of_units` being > 1.
     """
     block.MIN_FLOWS = Set(
         initialize=[(g[0], g[1]) for g in group if g[2].minimum is not None]
     )
+    turn_on_uptime = [
+        (g[0], g[1])
+        for g in group
+        if g[2].nonconvex.minimum_uptime.max() > 0
+        and g[2].nonconvex.minimum_up_down_formulation == "turn_on"
+    ]
+    turn_on_downtime = [
+        (g[0], g[1])
+        for g in group
+        if g[2].nonconvex.minimum_downtime.max() > 0
+        and g[2].nonconvex.minimum_up_down_formulation == "turn_on"
+    ]
+    block.MULTI_UNIT_FLOWS = Set(
+        initialize=[
+            (g[0], g[1]) for g in group if g[2].nonconvex.number_of_units > 1
+        ]
+    )
+    block.TURN_ON_UPTIMEFLOWS = Set(initialize=turn_on_uptime)
+    block.TURN_ON_DOWNTIMEFLOWS = Set(initialize=turn_on_downtime)
+    turn_on = [
+        (g[0], g[1])
+        for g in group
+        if (g[0], g[1]) in turn_on_uptime or (g[0], g[1]) in turn_on_downtime
+    ]
+    block.TURN_ON_FLOWS = Set(initialize=turn_on)
     block.STARTUPFLOWS = Set(
         initialize=[
             (g[0], g[1])
             for g in group
             if g[2].nonconvex.startup_costs is not None
             or g[2].nonconvex.maximum_startups is not None
+            or (g[0], g[1]) in turn_on
         ]
     )
     block.MAXSTARTUPFLOWS = Set(
@@ -90,6 +145,7 @@ def sets_for_non_convex_flows(block, group):
             for g in group
             if g[2].nonconvex.shutdown_costs is not None
             or g[2].nonconvex.maximum_shutdowns is not None
+            or (g[0], g[1]) in turn_on
         ]
     )
     block.MAXSHUTDOWNFLOWS = Set(
@@ -104,6 +160,7 @@ def sets_for_non_convex_flows(block, group):
             (g[0], g[1])
             for g in group
             if g[2].nonconvex.minimum_uptime.max() > 0
+            and g[2].nonconvex.minimum_up_down_formulation == "window"
         ]
     )
     block.MINDOWNTIMEFLOWS = Set(
@@ -111,6 +168,7 @@ def sets_for_non_convex_flows(block, group):
             (g[0], g[1])
             for g in group
             if g[2].nonconvex.minimum_downtime.max() > 0
+            and g[2].nonconvex.minimum_up_down_formulation == "window"
         ]
     )
     block.NEGATIVE_GRADIENT_FLOWS = Set(
@@ -154,6 +212,17 @@ def variables_for_non_convex_flows(block):
         Variable indicating shutdown of flow (component) indexed by
         SHUTDOWNFLOWS
 
+    For MULTI_UNIT_FLOWS, startup and shutdown are integers between zero
+    and the `number_of_units`.
+
+    :math:`C_{startup}` (continuous) `NonConvexFlowBlock.startup_count`:
+        Number of startups until (including) a timestep, indexed by
+        TURN_ON_UPTIMEFLOWS
+
+    :math:`C_{shutdown}` (continuous) `NonConvexFlowBlock.shutdown_count`:
+        Number of shutdowns until (including) a timestep, indexed by
+        TURN_ON_DOWNTIMEFLOWS
+
     :math:`\dot{P}_{up}` (continuous)
         `NonConvexFlowBlock.positive_gradient`:
         Variable indicating the positive gradient, i.e. the load increase
@@ -170,9 +239,21 @@ def variables_for_non_convex_flows(block):
 
     if block.STARTUPFLOWS:
         block.startup = Var(block.STARTUPFLOWS, m.TIMESTEPS, within=Binary)
+        unit_count_domain(block, block.startup, block.STARTUPFLOWS)
 
     if block.SHUTDOWNFLOWS:
         block.shutdown = Var(block.SHUTDOWNFLOWS, m.TIMESTEPS, within=Binary)
+        unit_count_domain(block, block.shutdown, block.SHUTDOWNFLOWS)
+
+    if block.TURN_ON_UPTIMEFLOWS:
+        block.startup_count = Var(
+            block.TURN_ON_UPTIMEFLOWS, m.TIMESTEPS, within=NonNegativeReals
+        )
+
+    if block.TURN_ON_DOWNTIMEFLOWS:
+        block.shutdown_count = Var(
+            block.TURN_ON_DOWNTIMEFLOWS, m.TIMESTEPS, within=NonNegativeReals
+        )
 
     if block.POSITIVE_GRADIENT_FLOWS:
         block.positive_gradient = Var(
@@ -189,6 +270,18 @@ def variables_for_non_convex_flows(block):
         )
 
 
+def unit_count_domain(block, variable, flows):
+    """Turn the binary `variable` of all MULTI_UNIT_FLOWS in `flows` into
+    an integer variable between zero and the `number_of_units`."""
+    m = block.parent_block()
+    for i, o in flows:
+        if (i, o) in block.MULTI_UNIT_FLOWS:
+            number_of_units = m.flows[i, o].nonconvex.number_of_units
+            for t in m.TIMESTEPS:
+                variable[i, o, t].domain = NonNegativeIntegers
+                variable[i, o, t].setub(number_of_units)
+
+
 def _min_downtime_constraint(block):
     r"""
     .. math::
@@ -295,6 +388,106 @@ def _min_uptime_constraint(block):
     return Constraint(block.MINUPTIMEFLOWS, m.TIMESTEPS, rule=_min_uptime_rule)
 
 
+def _status_change_constraint(block):
+    r"""
+    .. math::
+        Y_{status}(t) - Y_{status}(t-1) = Y_{startup}(t) - Y_{shutdown}(t) \\
+        \forall t \in \textrm{TIMESTEPS}, \\
+        \forall (i,o) \in \textrm{TURN\_ON\_FLOWS}.
+
+    With :math:`Y_{status}(-1)` being the initial status.
+    """
+    m = block.parent_block()
+
+    def _status_change_rule(_, i, o, t):
+        """Rule definition linking status, startup and shutdown."""
+        if t > m.TIMESTEPS.at(1):
+            previous_status = block.status[i, o, t - 1]
+        elif m.flows[i, o].nonconvex.initial_status is not None:
+            previous_status = m.flows[i, o].nonconvex.initial_status
+        else:
+            return Constraint.Skip
+        return (
+            block.status[i, o, t] - previous_status
+            == block.startup[i, o, t] - block.shutdown[i, o, t]
+        )
+
+    return Constraint(
+        block.TURN_ON_FLOWS, m.TIMESTEPS, rule=_status_change_rule
+    )
+
+
+def _count_constraint(block, flows, count, events):
+    """Cumulate the startups (or shutdowns) `events` in `count`."""
+    m = block.parent_block()
+
+    def _count_rule(_, i, o, t):
+        if t > m.TIMESTEPS.at(1):
+            return count[i, o, t] == count[i, o, t - 1] + events[i, o, t]
+        else:
+            return count[i, o, t] == events[i, o, t]
+
+    return Constraint(flows, m.TIMESTEPS, rule=_count_rule)
+
+
+def _turn_on_uptime_constraint(block):
+    r"""
+    .. math::
+        \sum_{\tau=t-t_{up,minimum}+1}^{t} Y_{startup}(\tau)
+        = C_{startup}(t) - C_{startup}(t-t_{up,minimum})
+        \leq Y_{status}(t) \\
+        \forall t \in \textrm{TIMESTEPS}, \\
+        \forall (i,o) \in \textrm{TURN\_ON\_UPTIMEFLOWS}.
+
+    Hereby, :math:`C_{startup}(t) = C_{startup}(t-1) + Y_{startup}(t)`
+    and :math:`C_{startup}(t) = 0` for :math:`t < 0`.
+    """
+    m = block.parent_block()
+
+    def _turn_on_rule(_, i, o, t):
+        """Rule definition for the turn on inequalities."""
+        expr = block.startup_count[i, o, t]
+        window_start = t - m.flows[i, o].nonconvex.minimum_uptime[t]
+        if window_start >= 0:
+            expr -= block.startup_count[i, o, window_start]
+        return expr <= block.status[i, o, t]
+
+    return Constraint(
+        block.TURN_ON_UPTIMEFLOWS, m.TIMESTEPS, rule=_turn_on_rule
+    )
+
+
+def _turn_off_downtime_constraint(block):
+    r"""
+    .. math::
+        \sum_{\tau=t-t_{down,minimum}+1}^{t} Y_{shutdown}(\tau)
+        = C_{shutdown}(t) - C_{shutdown}(t-t_{down,minimum})
+        \leq N - Y_{status}(t) \\
+        \forall t \in \textrm{TIMESTEPS}, \\
+        \forall (i,o) \in \textrm{TURN\_ON\_DOWNTIMEFLOWS}.
+
+    With :math:`N` being the `number_of_units` (1 by default).
+    Hereby, :math:`C_{shutdown}(t) = C_{shutdown}(t-1) + Y_{shutdown}(t)`
+    and :math:`C_{shutdown}(t) = 0` for :math:`t < 0`.
+    """
+    m = block.parent_block()
+
+    def _turn_off_rule(_, i, o, t):
+        """Rule definition for the turn off inequalities."""
+        expr = block.shutdown_count[i, o, t]
+        window_start = t - m.flows[i, o].nonconvex.minimum_downtime[t]
+        if window_start >= 0:
+            expr -= block.shutdown_count[i, o, window_start]
+        return (
+            expr
+            <= m.flows[i, o].nonconvex.number_of_units - block.status[i, o, t]
+        )
+
+    return Constraint(
+        block.TURN_ON_DOWNTIMEFLOWS, m.TIMESTEPS, rule=_turn_off_rule
+    )
+
+
 def _shutdown_constraint(block):
     r"""
     .. math::
@@ -408,6 +601,9 @@ def shared_constraints_for_non_convex_flows(block):
     * :py:func:`max_shutdown_constraint`
     * :py:func:`min_uptime_constraint`
     * :py:func:`min_downtime_constraint`
+    * :py:func:`status_change_constraint`
+    * :py:func:`turn_on_uptime_constraint`
+    * :py:func:`turn_off_downtime_constraint`
     """
     m = block.parent_block()
 
@@ -417,6 +613,23 @@ def shared_constraints_for_non_convex_flows(block):
     block.max_shutdown_constr = _max_shutdown_constraint(block)
     block.min_uptime_constr = _min_uptime_constraint(block)
     block.min_downtime_constr = _min_downtime_constraint(block)
+    block.status_change_constr = _status_change_constraint(block)
+    if block.TURN_ON_UPTIMEFLOWS:
+        block.startup_count_constr = _count_constraint(
+            block,
+            block.TURN_ON_UPTIMEFLOWS,
+            block.startup_count,
+            block.startup,
+        )
+    block.turn_on_uptime_constr = _turn_on_uptime_constraint(block)
+    if block.TURN_ON_DOWNTIMEFLOWS:
+        block.shutdown_count_constr = _count_constraint(
+            block,
+            block.TURN_ON_DOWNTIMEFLOWS,
+            block.shutdown_count,
+            block.shutdown,
+        )
+    block.turn_off_downtime_constr = _turn_off_downtime_constraint(block)
 
     def _positive_gradient_flow_constraint(_):
         r"""Rule definition for positive gradient constraint."""
@@ -636,8 +849,10 @@ def activity_costs(block):
 def inactivity_costs(block):
     r"""
     .. math::
-        \sum_{INACTIVITYCOSTFLOWS} \sum_t (1 - Y_{status}(t)) \
+        \sum_{INACTIVITYCOSTFLOWS} \sum_t (N - Y_{status}(t)) \
         \cdot c_{inactivity}
+
+    With :math:`N` being the `number_of_units` (1 by default).
     """
     inactivity_costs = 0
 
@@ -650,7 +865,10 @@ def inactivity_costs(block):
                 len(m.TIMESTEPS),
             ):
                 inactivity_costs += sum(
-                    (1 - block.status[i, o, t])
+                    (
+                        m.flows[i, o].nonconvex.number_of_units
+                        - block.status[i, o, t]
+                    )
                     * m.flows[i, o].nonconvex.inactivity_costs[t]
                     * m.tsam_weighting[t]
                     for t in m.TIMESTEPS
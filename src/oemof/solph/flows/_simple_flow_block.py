@@ -345,13 +345,14 @@ class SimpleFlowBlock(ScalarBlock):
             def _lifetime_output_rule(_):
                 """Force flow value to zero when lifetime is reached"""
                 for inp, out in self.LIFETIME_FLOWS:
-                    for p, ts in m.TIMEINDEX:
-                        if m.flows[inp, out].lifetime <= m.es.periods_years[p]:
-                            lhs = m.flow[inp, out, ts]
-                            rhs = 0
-                            self.lifetime_output.add(
-                                (inp, out, p, ts), (lhs == rhs)
-                            )
+                    for p, ts in m.period_cache.expired_timeindex(
+                        m.flows[inp, out].lifetime
+                    ):
+                        lhs = m.flow[inp, out, ts]
+                        rhs = 0
+                        self.lifetime_output.add(
+                            (inp, out, p, ts), (lhs == rhs)
+                        )
 
             self.lifetime_output = Constraint(
                 self.LIFETIME_FLOWS, m.TIMEINDEX, noruleinit=True
@@ -365,16 +366,14 @@ class SimpleFlowBlock(ScalarBlock):
                 considering initial age
                 """
                 for inp, out in self.LIFETIME_AGE_FLOWS:
-                    for p, ts in m.TIMEINDEX:
-                        if (
-                            m.flows[inp, out].lifetime - m.flows[inp, out].age
-                            <= m.es.periods_years[p]
-                        ):
-                            lhs = m.flow[inp, out, ts]
-                            rhs = 0
-                            self.lifetime_age_output.add(
-                                (inp, out, p, ts), (lhs == rhs)
-                            )
+                    for p, ts in m.period_cache.expired_timeindex(
+                        m.flows[inp, out].lifetime, m.flows[inp, out].age
+                    ):
+                        lhs = m.flow[inp, out, ts]
+                        rhs = 0
+                        self.lifetime_age_output.add(
+                            (inp, out, p, ts), (lhs == rhs)
+                        )
 
             self.lifetime_age_output = Constraint(
                 self.LIFETIME_AGE_FLOWS, m.TIMEINDEX, noruleinit=True
@@ -462,7 +461,7 @@ class SimpleFlowBlock(ScalarBlock):
                             * m.objective_weighting[t]
                             * m.tsam_weighting[t]
                             * m.flows[i, o].variable_costs[t]
-                            * ((1 + m.discount_rate) ** -m.es.periods_years[p])
+                            * m.period_cache.period_discount_factors[p]
                         )
 
                 # Fixed costs for units with no lifetime limit
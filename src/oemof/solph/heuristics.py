@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""Heuristics to find good solutions of large mixed integer models fast.
+
+SPDX-License-Identifier: MIT
+
+"""
+
+import logging
+import math
+
+from pyomo import environ as po
+from pyomo.common.collections import ComponentMap
+
+
+def relax_and_fix(
+    model,
+    window,
+    step=None,
+    solver="cbc",
+    solver_io="lp",
+    solve_kwargs=None,
+    cmdline_options=None,
+    polish=False,
+):
+    r"""Solve a mixed integer model with the relax-and-fix heuristic.
+
+    The time horizon is swept in windows of `window` timesteps. In every
+    iteration, the integer variables of the current window are integer,
+    the ones of later timesteps are relaxed and the ones of earlier
+    timesteps are fixed to the values found before. After each solve, the
+    integer variables of the first `step` timesteps of the window are
+    fixed. Integer variables that are not indexed by timesteps (e.g. the
+    `invest_status`) stay integer in every iteration.
+
+    Before the sweep, the linear relaxation of the whole model is solved.
+    Its objective is a lower bound of the optimal objective, which is used
+    to report the gap of the final solution.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        The model to be solved.
+    window : int
+        Number of timesteps with integer variables in every iteration.
+    step : int or None
+        Number of timesteps fixed after every iteration, defaults to
+        `window`. A `step` smaller than `window` gives overlapping windows.
+    solver, solver_io, solve_kwargs, cmdline_options
+        Passed to :meth:`Model.solve <oemof.solph.Model.solve>` for every
+        solve.
+    polish : bool
+        If True, all integer variables are released after the sweep and the
+        full model is solved once more, warm-started from the heuristic
+        solution if the solver supports it.
+
+    Returns
+    -------
+    oemof.solph.Results
+        Results of the last solve. Additionally to the objective, they
+        contain the `lower_bound` from the linear relaxation, the
+        `mip_gap` of the objective with respect to this bound and the
+        `heuristic_objective` found by the sweep.
+
+    Note
+    ----
+    Fixing the integer variables of early windows can render later windows
+    infeasible, e.g. if minimum up and downtimes are used. In this case, a
+    RuntimeError naming the first timestep of the window is raised and the
+    integer variables are released again. Larger windows or overlapping
+    windows (`step` < `window`) help.
+    """
+    if step is None:
+        step = window
+    if not 0 < step <= window:
+        raise ValueError(
+            "The step has to be positive and must not exceed the window"
+            + f" but step is {step} and window is {window}."
+        )
+
+    timed_variables, other_variables = _integer_variables(model)
+    # variable data objects are not hashable
+    original_domains = ComponentMap(
+        (v, (v.domain, v.lower, v.upper))
+        for variables in [*timed_variables.values(), other_variables]
+        for v in variables
+    )
+
+    def _solve(warmstart=False):
+        return model.solve(
+            solver=solver,
+            solver_io=solver_io,
+            solve_kwargs=solve_kwargs,
+            cmdline_options=cmdline_options,
+            warmstart=warmstart,
+        )
+
+    try:
+        for v in original_domains:
+            _relax(v)
+        lower_bound = _solve()["objective"]
+        logging.info(f"Lower bound from linear relaxation: {lower_bound}")
+
+        for v in other_variables:
+            _restore(v, original_domains[v])
+
+        timesteps = sorted(timed_variables)
+        # solve at least once if there are no integer variables in time
+        for start in range(0, max(len(timesteps), 1), step):
+            for t in timesteps[start : start + window]:
+                for v in timed_variables[t]:
+                    _restore(v, original_domains[v])
+            first = timesteps[start] if timesteps else None
+            try:
+                results = _solve()
+            except RuntimeError as error:
+                raise RuntimeError(
+                    "The relax-and-fix window starting at timestep"
+                    + f" {first} could not be solved to optimality. The"
+                    + " integer variables fixed in earlier windows might"
+                    + " render it infeasible, larger or overlapping"
+                    + " windows might help."
+                ) from error
+            logging.info(
+                "Relax-and-fix window starting at timestep"
+                + f" {first}: objective {results['objective']}"
+            )
+            if start + window >= len(timesteps):
+                break
+            for t in timesteps[start : start + step]:
+                for v in timed_variables[t]:
+                    _fix(v)
+
+        heuristic_objective = results["objective"]
+    finally:
+        for v, domain in original_domains.items():
+            v.unfix()
+            _restore(v, domain)
+
+    if polish:
+        results = _solve(warmstart=True)
+
+    objective = results["objective"]
+    if math.isclose(objective, lower_bound):
+        mip_gap = 0.0
+    else:
+        mip_gap = abs(objective - lower_bound) / max(abs(objective), 1e-10)
+    results._meta_results.update(
+        {
+            "lower_bound": lower_bound,
+            "mip_gap": mip_gap,
+            "heuristic_objective": heuristic_objective,
+        }
+    )
+    return results
+
+
+def _integer_variables(model):
+    """Return the free integer variables indexed by timesteps (grouped by
+    timestep) and all other free integer variables."""
+    timed, other = {}, []
+    for v in model.component_data_objects(po.Var, descend_into=True):
+        if v.fixed or v.is_continuous():
+            continue
+        index_sets = tuple(v.parent_component().index_set().subsets())
+        if index_sets[-1] is model.TIMESTEPS:
+            index = v.index()
+            t = index[-1] if isinstance(index, tuple) else index
+            timed.setdefault(t, []).append(v)
+        else:
+            other.append(v)
+    return timed, other
+
+
+def _relax(variable):
+    lb, ub = variable.bounds
+    variable.domain = po.Reals
+    variable.setlb(lb)
+    variable.setub(ub)
+
+
+def _restore(variable, domain):
+    variable.domain, lower, upper = domain
+    variable.setlb(lower)
+    variable.setub(upper)
+
+
+def _fix(variable):
+    if variable.value is not None:
+        variable.fix(round(variable.value))
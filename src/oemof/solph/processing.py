@@ -101,8 +101,13 @@ def create_dataframe(om):
     var_dict = {}
     for bv in block_vars:
         # Drop the auxiliary variables introduced by pyomo's Piecewise
-        parent_component = bv.parent_block().parent_component()
-        if not isinstance(parent_component, IndexedPiecewise):
+        # and the ones declared as auxiliary by solph blocks
+        parent_block = bv.parent_block()
+        parent_component = parent_block.parent_component()
+        auxiliary = getattr(parent_block, "AUXILIARY_VARIABLES", ())
+        if not isinstance(parent_component, IndexedPiecewise) and (
+            bv.local_name not in auxiliary
+        ):
             try:
                 idx_set = getattr(bv, "_index_set")
             except AttributeError:
@@ -330,6 +335,40 @@ def results(model, remove_last_time_point=False):
             else:
                 result[(bus, None)]["sequences"]["duals"] = duals
 
+    if model.es.original_timeindex is not None:
+        result = _expand_merged_timesteps(
+            result, model.es.original_timeindex, remove_last_time_point
+        )
+
+    return result
+
+
+def _expand_merged_timesteps(
+    result, original_timeindex, remove_last_time_point
+):
+    """Give the sequences of a model with merged timesteps for the original
+    timeindex.
+
+    Values of timesteps (e.g. flows) are constant within a merged timestep,
+    storage contents (given for time points) are interpolated linearly.
+    See :func:`oemof.solph.aggregation.merge_timesteps`.
+    """
+    index = original_timeindex
+    if remove_last_time_point:
+        index = index[:-1]
+    for data in result.values():
+        sequences = data["sequences"]
+        if sequences.empty:
+            continue
+        expanded = sequences.reindex(index, method="ffill")
+        if "storage_content" in sequences:
+            expanded["storage_content"] = (
+                sequences["storage_content"]
+                .reindex(sequences.index.union(index))
+                .interpolate(method="index")
+                .reindex(index)
+            )
+        data["sequences"] = expanded
     return result
 
 
@@ -771,7 +810,9 @@ def meta_results(om, undefined=False):
     Fetch some metadata from the Solver. Feel free to add more keys.
 
     Valid keys of the resulting dictionary are: 'objective', 'problem',
-    'solver'.
+    'solver' and 'statistics'. The 'statistics' are the timings, problem
+    size, MIP gap and node count collected by the model, see
+    :attr:`Model.solve_statistics <oemof.solph.Model>`.
 
     om : oemof.solph.Model
         A solved Model.
@@ -783,7 +824,10 @@ def meta_results(om, undefined=False):
     -------
     dict
     """
-    meta_res = {"objective": om.objective()}
+    meta_res = {
+        "objective": om.objective(),
+        "statistics": dict(getattr(om, "solve_statistics", {})),
+    }
 
     for k1 in ["Problem", "Solver"]:
         k1 = k1.lower()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -
+
+"""Tests of the aggregation module.
+
+SPDX-License-Identifier: MIT
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.tools.debugging import ExperimentalFeatureWarning
+from oemof.tools.debugging import SuspiciousUsageWarning
+
+from oemof import solph
+from oemof.solph import aggregation
+
+
+def _energy_system(days=8, periods=False):
+    rng = np.random.default_rng(1)
+    number = days * 24
+    if periods:
+        first = pd.date_range("2020-01-01", periods=number, freq="h")
+        second = pd.date_range("2030-01-01", periods=number, freq="h")
+        with pytest.warns(ExperimentalFeatureWarning):
+            es = solph.EnergySystem(
+                timeindex=first.append(second),
+                timeincrement=[1] * 2 * number,
+                periods=[first, second],
+                infer_last_interval=False,
+            )
+        number *= 2
+    else:
+        es = solph.EnergySystem(
+            timeindex=solph.create_time_index(2020, number=number),
+            infer_last_interval=False,
+        )
+    hours = np.arange(number) % 24
+    pv = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None)
+    pv *= rng.uniform(0.3, 1, number)
+    el = solph.buses.Bus(label="el")
+    es.add(
+        el,
+        solph.components.Source(
+            label="pv",
+            outputs={el: solph.flows.Flow(nominal_capacity=100, maximum=pv)},
+        ),
+        solph.components.Source(
+            label="grid",
+            outputs={
+                el: solph.flows.Flow(
+                    variable_costs=rng.uniform(20, 40, number)
+                )
+            },
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(
+                    nominal_capacity=50, fix=rng.uniform(0.5, 1, number)
+                )
+            },
+        ),
+        solph.components.GenericStorage(
+            label="battery",
+            nominal_capacity=100,
+            inputs={el: solph.flows.Flow(nominal_capacity=20)},
+            outputs={el: solph.flows.Flow(nominal_capacity=20)},
+        ),
+    )
+    return es
+
+
+@pytest.mark.parametrize("method", ["k_medoids", "hierarchical"])
+def test_cluster_periods(method):
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0] * 4, [1.0] * 4, [0.0, 1.0] * 2])
+    labels = rng.integers(0, 3, 30)
+    data = centers[labels] + rng.normal(0, 0.05, (30, 4))
+
+    order, medoids = aggregation.cluster_periods(data, 3, method)
+
+    # same partition, clusters numbered by first occurrence
+    assert len(set(zip(order, labels))) == 3
+    assert order[0] == 0
+    assert (order[medoids] == np.arange(3)).all()
+
+
+@pytest.mark.parametrize("method", ["k_medoids", "hierarchical"])
+def test_cluster_duplicate_periods(method):
+    data = np.array([[0, 1], [0, 1], [0, 1], [1, 0]])
+    with pytest.warns(SuspiciousUsageWarning, match="only 2 distinct"):
+        order, medoids = aggregation.cluster_periods(data, 3, method)
+    assert order.tolist() == [0, 0, 0, 1]
+    assert medoids.tolist() == [0, 3]
+
+
+def test_aggregate_identical_days():
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=96),
+        infer_last_interval=False,
+    )
+    el = solph.buses.Bus(label="el")
+    day = np.linspace(0.5, 1, 24)
+    es.add(
+        el,
+        solph.components.Source(
+            label="grid",
+            outputs={el: solph.flows.Flow(variable_costs=30)},
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(nominal_capacity=50, fix=np.tile(day, 4))
+            },
+        ),
+    )
+    with pytest.warns(ExperimentalFeatureWarning):
+        with pytest.warns(SuspiciousUsageWarning, match="only 1 distinct"):
+            aggregated = aggregation.aggregate(es, 2, 24)
+    assert aggregated.tsa_parameters[0]["order"] == [0, 0, 0, 0]
+    assert aggregated.flows()["el", "demand"].fix.tolist() == day.tolist()
+
+
+def test_segment_periods():
+    profiles = np.array([[[1, 1, 5, 5, 5, 2]]], dtype=float)
+    assert aggregation.segment_periods(profiles, 3).tolist() == [[0, 2, 5]]
+    with pytest.raises(ValueError, match="number of segments"):
+        aggregation.segment_periods(profiles, 7)
+
+
+@pytest.mark.parametrize("segments", [None, 6])
+def test_aggregate(segments):
+    es = _energy_system()
+    demand = es.flows()["el", "demand"]
+    original = demand.fix.copy()
+
+    with pytest.warns(ExperimentalFeatureWarning):
+        aggregated = aggregation.aggregate(es, 3, 24, segments=segments)
+
+    params = aggregated.tsa_parameters[0]
+    assert params["timesteps_per_period"] == 24
+    assert len(params["order"]) == 8
+    timesteps = 3 * (24 if segments is None else segments)
+    assert len(aggregated.timeincrement) == timesteps
+    assert len(demand.fix) == timesteps
+    if segments is None:
+        # medoids are original days
+        first = params["order"].index(0)
+        assert (
+            demand.fix[:24].tolist()
+            == original[24 * first : 24 * first + 24].tolist()
+        )
+    else:
+        assert sum(params["segments"].values()) == 72
+
+    model = solph.Model(aggregated)
+    hours = sum(
+        model.tsam_weighting[t] * model.timeincrement[t]
+        for t in model.TIMESTEPS
+    )
+    assert hours == 8 * 24
+    assert model.solve()["objective"] > 0
+
+
+def test_aggregate_multi_period():
+    es = _energy_system(days=4, periods=True)
+    with pytest.warns(ExperimentalFeatureWarning):
+        aggregated = aggregation.aggregate(
+            es, 2, 24, method="hierarchical", representation="mean"
+        )
+    assert [len(p) for p in aggregated.periods] == [48, 48]
+    assert [len(p["order"]) for p in aggregated.tsa_parameters] == [4, 4]
+    assert aggregated.periods[1][0] == pd.Timestamp("2030-01-01")
+    assert len(aggregated.flows()["el", "demand"].fix) == 96
+
+
+def test_aggregate_invalid():
+    with pytest.raises(ValueError, match="not a multiple"):
+        aggregation.aggregate(_energy_system(), 3, 25)
+    with pytest.raises(ValueError, match="representation"):
+        aggregation.aggregate(_energy_system(), 3, 24, representation="x")
+    with pytest.raises(ValueError, match="method"):
+        aggregation.aggregate(_energy_system(), 3, 24, method="x")
+
+
+def test_merge_timesteps():
+    es = _energy_system(days=2)
+    demand = es.flows()["el", "demand"]
+    energy = demand.fix.sum()
+
+    merged = aggregation.merge_timesteps(es, tolerance=0.5)
+
+    increment = np.asarray(merged.timeincrement)
+    assert 1 < len(increment) < 48
+    assert increment.sum() == 48
+    assert (demand.fix * increment).sum() == pytest.approx(energy)
+    assert merged.original_timeindex.equals(es.timeindex)
+
+    model = solph.Model(merged)
+    model.solve()
+    results = solph.processing.results(model)
+    flow = results[("el", "demand")]["sequences"]["flow"]
+    assert flow.index.equals(es.timeindex)
+    assert flow.sum() == pytest.approx(50 * energy)
+    content = results[("battery", None)]["sequences"]["storage_content"]
+    assert content.notna().all()
+
+
+def test_merge_timesteps_max_timesteps():
+    es = _energy_system(days=1)
+    merged = aggregation.merge_timesteps(es, tolerance=1, max_timesteps=5)
+    assert list(merged.timeincrement) == [5, 5, 5, 5, 4]
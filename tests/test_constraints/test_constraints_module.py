@@ -108,3 +108,51 @@ def test_integral_limit():
     ) == pytest.approx(
         emission_limit
     )
+
+
+def test_emission_limit_per_period():
+    t1 = pd.date_range("2020-01-01", periods=2, freq="2h")
+    t2 = pd.date_range("2030-01-01", periods=2, freq="2h")
+    energysystem = solph.EnergySystem(
+        timeindex=t1.append(t2).append(pd.DatetimeIndex(["2030-01-01 04:00"])),
+        timeincrement=[2] * 4,
+        periods=[t1, t2],
+        infer_last_interval=False,
+    )
+    bel = solph.buses.Bus(label="electricityBus", balanced=False)
+    dirty = solph.components.Source(
+        label="dirty",
+        outputs={
+            bel: solph.flows.Flow(
+                nominal_capacity=10,
+                variable_costs=-1,
+                custom_properties={"emission_factor": [1, 0, 2, 2]},
+            )
+        },
+    )
+    clean = solph.components.Source(
+        label="clean",
+        outputs={
+            bel: solph.flows.Flow(
+                nominal_capacity=10,
+                variable_costs=-0.1,
+                custom_properties={"emission_factor": 0},
+            )
+        },
+    )
+    energysystem.add(bel, dirty, clean)
+    model = solph.Model(energysystem, discount_rate=0.02)
+
+    solph.constraints.emission_limit_per_period(model, limit=[4, 20])
+
+    # one term per flow and timestep with a non-zero weight
+    for p, n_terms in [(0, 1), (1, 2)]:
+        body = model.periodical_integral_limit[p].body
+        assert body.nargs() == n_terms
+
+    results = model.solve()
+    flow = results["flow"][(dirty, bel)]
+    # period 0: 2 h * 1 * flow[0] <= 4, flow[1] has no emissions
+    assert list(flow[:2]) == pytest.approx([2, 10])
+    # period 1: 2 h * 2 * (flow[2] + flow[3]) <= 20
+    assert flow[2:].sum() == pytest.approx(5)
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -
+
+"""Tests of the decomposition module.
+
+SPDX-License-Identifier: MIT
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.tools.debugging import ExperimentalFeatureWarning
+
+from oemof import solph
+from oemof.solph import decomposition
+
+
+def _investment_model(storage=True, nonconvex=False):
+    rng = np.random.default_rng(3)
+    number = 24
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=number),
+        infer_last_interval=False,
+    )
+    el = solph.buses.Bus(label="el")
+    es.add(
+        el,
+        solph.components.Source(
+            label="wind",
+            outputs={
+                el: solph.flows.Flow(
+                    maximum=rng.uniform(0, 1, number),
+                    nominal_capacity=solph.Investment(
+                        ep_costs=5,
+                        maximum=200,
+                        nonconvex=nonconvex,
+                        offset=20 if nonconvex else 0,
+                    ),
+                )
+            },
+        ),
+        solph.components.Source(
+            label="gas",
+            outputs={el: solph.flows.Flow(variable_costs=30)},
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(
+                    nominal_capacity=50, fix=rng.uniform(0.5, 1, number)
+                )
+            },
+        ),
+    )
+    if storage:
+        es.add(
+            solph.components.GenericStorage(
+                label="battery",
+                nominal_capacity=solph.Investment(ep_costs=2),
+                invest_relation_input_capacity=0.5,
+                invest_relation_output_capacity=0.5,
+                inputs={
+                    el: solph.flows.Flow(nominal_capacity=solph.Investment())
+                },
+                outputs={
+                    el: solph.flows.Flow(nominal_capacity=solph.Investment())
+                },
+                loss_rate=0.01,
+            )
+        )
+    return solph.Model(es)
+
+
+@pytest.mark.parametrize("nonconvex", [False, True])
+def test_benders(nonconvex):
+    exact = _investment_model(nonconvex=nonconvex).solve()["objective"]
+
+    model = _investment_model(nonconvex=nonconvex)
+    results = decomposition.benders(model, tolerance=1e-6)
+
+    assert results["objective"] == pytest.approx(exact, rel=1e-4)
+    assert results["lower_bound"] <= exact + 1e-6
+    assert results["upper_bound"] == pytest.approx(results["objective"])
+    assert results["iterations"] > 1
+    # the operation is part of the results
+    flows = results["flow"]
+    assert (flows["gas", "el"] >= 0).all()
+    assert flows["el", "demand"].sum() == pytest.approx(
+        sum(model.flows["el", "demand"].fix) * 50
+    )
+
+
+def test_benders_parallel():
+    exact = _investment_model(storage=False).solve()["objective"]
+
+    model = _investment_model(storage=False)
+    results = decomposition.benders(
+        model, subproblems=3, processes=2, tolerance=1e-6
+    )
+
+    assert results["objective"] == pytest.approx(exact, rel=1e-4)
+
+
+def test_benders_persistent_solver():
+    exact = _investment_model().solve()["objective"]
+
+    model = _investment_model()
+    results = decomposition.benders(
+        model, solver="appsi_highs", solver_io=None, tolerance=1e-6
+    )
+
+    assert results["objective"] == pytest.approx(exact, rel=1e-4)
+
+
+def test_benders_integer_operation():
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=2),
+        infer_last_interval=False,
+    )
+    el = solph.buses.Bus(label="el")
+    es.add(
+        el,
+        solph.components.Source(
+            label="plant",
+            outputs={
+                el: solph.flows.Flow(
+                    nominal_capacity=10, nonconvex=solph.NonConvex()
+                )
+            },
+        ),
+    )
+    with pytest.raises(ValueError, match="continuous operational"):
+        decomposition.benders(solph.Model(es))
+
+
+def _multi_period_energy_system():
+    periods = [
+        pd.date_range(f"{year}-01-01", periods=4, freq="h")
+        for year in (2020, 2030, 2040)
+    ]
+    with pytest.warns(ExperimentalFeatureWarning):
+        es = solph.EnergySystem(
+            timeindex=periods[0].append(periods[1:]),
+            timeincrement=[1] * 12,
+            periods=periods,
+            infer_last_interval=False,
+        )
+    el = solph.buses.Bus(label="el")
+    es.add(
+        el,
+        solph.components.Source(
+            label="wind",
+            outputs={
+                el: solph.flows.Flow(
+                    maximum=[0.2, 0.8, 0.5, 0.9] * 3,
+                    nominal_capacity=solph.Investment(
+                        ep_costs=[50, 40, 30],
+                        lifetime=15,
+                        existing=10,
+                        age=10,
+                    ),
+                )
+            },
+        ),
+        solph.components.Source(
+            label="gas",
+            outputs={el: solph.flows.Flow(variable_costs=[1000] * 12)},
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(
+                    nominal_capacity=20, fix=[0.5, 1, 0.8, 0.6] * 3
+                )
+            },
+        ),
+    )
+    return es
+
+
+def test_myopic():
+    es = _multi_period_energy_system()
+    results = decomposition.myopic(es, discount_rate=0.02)
+
+    model = solph.Model(_multi_period_energy_system(), discount_rate=0.02)
+    model.solve()
+    expected = solph.processing.results(model)
+    assert {(str(a), str(b)) for a, b in results} == {
+        (str(a), str(b)) for a, b in expected
+    }
+
+    wind = es.groups["wind"]
+    el = es.groups["el"]
+    scalars = results[wind, el]["period_scalars"]
+    assert scalars.index.tolist() == [2020, 2030, 2040]
+    # foresight does not change the investments here
+    groups = model.es.groups
+    pd.testing.assert_frame_equal(
+        scalars, expected[groups["wind"], groups["el"]]["period_scalars"]
+    )
+    # the existing capacity reaches its lifetime in 2030
+    assert scalars["old_exo"].tolist() == [0, 10, 0]
+    assert scalars["total"].iloc[0] == pytest.approx(
+        10 + scalars["invest"].iloc[0]
+    )
+    for p in (1, 2):
+        assert scalars["total"].iloc[p] == pytest.approx(
+            scalars["total"].iloc[p - 1]
+            + scalars["invest"].iloc[p]
+            - scalars["old"].iloc[p]
+        )
+
+    demand = results[el, es.groups["demand"]]["sequences"]["flow"]
+    assert demand.index.equals(es.timeindex)
+    # the nodes of the energy system are left unchanged
+    assert len(es.flows()[el, es.groups["demand"]].fix) == 12
+    assert wind.outputs[el].investment.existing == 10
+
+
+def test_myopic_needs_periods():
+    with pytest.raises(ValueError, match="multi-period"):
+        decomposition.myopic(_investment_model().es)
+
+
+def _two_regions():
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=6),
+        infer_last_interval=False,
+    )
+    a = solph.buses.Bus(label="a")
+    b = solph.buses.Bus(label="b")
+    line = solph.components.Link(
+        label="line",
+        inputs={a: solph.flows.Flow(), b: solph.flows.Flow()},
+        outputs={
+            a: solph.flows.Flow(),
+            b: solph.flows.Flow(nominal_capacity=15),
+        },
+        conversion_factors={(a, b): 0.95, (b, a): 0.95},
+    )
+    es.add(
+        a,
+        b,
+        line,
+        solph.components.Source(
+            label="cheap",
+            outputs={
+                a: solph.flows.Flow(nominal_capacity=40, variable_costs=10)
+            },
+        ),
+        solph.components.Source(
+            label="expensive",
+            outputs={b: solph.flows.Flow(variable_costs=50)},
+        ),
+        solph.components.Sink(
+            label="demand_a",
+            inputs={
+                a: solph.flows.Flow(
+                    nominal_capacity=20, fix=[1, 0.5, 0.7, 0.9, 0.3, 0.6]
+                )
+            },
+        ),
+        solph.components.Sink(
+            label="demand_b",
+            inputs={
+                b: solph.flows.Flow(
+                    nominal_capacity=30, fix=[0.5, 1, 0.7, 0.9, 0.3, 0.6]
+                )
+            },
+        ),
+    )
+    return solph.Model(es)
+
+
+def test_admm():
+    expected = _two_regions().solve()["objective"]
+
+    model = _two_regions()
+    groups = model.es.groups
+    line, b = groups["line"], groups["b"]
+    results = decomposition.admm(model, [(line, b), (b, line)])
+
+    assert results["objective"] == pytest.approx(expected, rel=1e-3)
+    assert 1 < results["iterations"] < 500
+    assert len(results["residuals"]) == results["iterations"]
+    assert results["primal_residual"] == results["residuals"][-1][0]
+    # the consensus respects the capacity of the link
+    flow = results["flow"][("line", "b")]
+    assert flow.max() <= 15
+    assert flow.max() == pytest.approx(15, rel=1e-2)
+
+
+def test_admm_invalid_coupling():
+    model = _two_regions()
+    a, b = model.es.groups["a"], model.es.groups["b"]
+    with pytest.raises(ValueError, match="not in the model"):
+        decomposition.admm(model, [(a, b)])
+    # the relation of the link would only contain coupling flows
+    line = model.es.groups["line"]
+    with pytest.raises(ValueError, match="only contains coupling"):
+        decomposition.admm(model, [(a, line), (line, b)])
@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+import pytest
+
 from oemof import solph
 
 
@@ -145,3 +149,88 @@ def results_storage():
 
     assert results.get("investment_costs").iloc[0, 0] == 100
     assert results.get("investment_costs").iloc[0, 1] == 2000
+
+
+def test_variable_costs_multi_period_discounting():
+    t1 = pd.date_range("2020-01-01", periods=2, freq="h")
+    t2 = pd.date_range("2030-01-01", periods=2, freq="h")
+    timeindex = t1.append(t2).append(pd.DatetimeIndex(["2030-01-01 02:00"]))
+
+    energysystem = solph.EnergySystem(
+        timeindex=timeindex,
+        timeincrement=[1] * 4,
+        periods=[t1, t2],
+        infer_last_interval=False,
+    )
+
+    bus = solph.buses.Bus("bus")
+    source = solph.components.Source(
+        "source",
+        outputs={bus: solph.flows.Flow(variable_costs=[10, 10, 20, 20])},
+    )
+    demand = solph.components.Sink(
+        "demand",
+        inputs={bus: solph.flows.Flow(fix=[1, 2, 3, 4], nominal_capacity=1)},
+    )
+    energysystem.add(bus, source, demand)
+
+    energysystem_model = solph.Model(energysystem, discount_rate=0.1)
+    results = energysystem_model.solve(solver="cbc")
+
+    variable_costs = results["variable_costs"][(source, bus)]
+    discount = 1.1**-10
+    np.testing.assert_allclose(
+        variable_costs.values, [10, 20, 60 * discount, 80 * discount]
+    )
+    assert variable_costs.sum() == pytest.approx(results["objective"])
+
+
+def test_investment_costs_multi_period():
+    t1 = pd.date_range("2020-01-01", periods=2, freq="h")
+    t2 = pd.date_range("2030-01-01", periods=2, freq="h")
+    timeindex = t1.append(t2).append(pd.DatetimeIndex(["2030-01-01 02:00"]))
+
+    energysystem = solph.EnergySystem(
+        timeindex=timeindex,
+        timeincrement=[1] * 4,
+        periods=[t1, t2],
+        infer_last_interval=False,
+    )
+
+    bus = solph.buses.Bus("bus")
+    source = solph.components.Source(
+        "source",
+        outputs={
+            bus: solph.flows.Flow(
+                nominal_capacity=solph.Investment(
+                    ep_costs=100, lifetime=15, fixed_costs=5
+                ),
+                variable_costs=[10, 10, 20, 20],
+            )
+        },
+    )
+    storage = solph.components.GenericStorage(
+        "storage",
+        inputs={bus: solph.flows.Flow()},
+        outputs={bus: solph.flows.Flow()},
+        nominal_capacity=solph.Investment(ep_costs=1, lifetime=20),
+        balanced=False,
+    )
+    demand = solph.components.Sink(
+        "demand",
+        inputs={bus: solph.flows.Flow(fix=[1, 2, 3, 4], nominal_capacity=1)},
+    )
+    energysystem.add(bus, source, storage, demand)
+
+    energysystem_model = solph.Model(energysystem, discount_rate=0.1)
+    results = energysystem_model.solve(solver="cbc")
+
+    investment_costs = results["investment_costs"]
+    assert investment_costs.shape == (2, 2)
+    # the annuities are paid for the years within the horizon only
+    assert investment_costs[(source, bus)].iloc[1] < (
+        100 * results["invest"][(source, bus)].iloc[1]
+    )
+    assert investment_costs.to_numpy().sum() + results[
+        "variable_costs"
+    ].to_numpy().sum() == pytest.approx(results["objective"])
@@ -11,6 +11,7 @@ SPDX-License-Identifier: MIT
 
 import pytest
 
+from oemof.solph import LazySequence
 from oemof.solph import NonConvex
 from oemof.solph.flows import Flow
 
@@ -99,3 +100,14 @@ def test_fix_sequence_non_nominal():
     """Attribute fix needs nominal_capacity"""
     with pytest.raises(AttributeError):
         Flow(fix=[0.3, 0.2, 0.7])
+
+
+def test_lazy_fix_sequence():
+    fix = LazySequence(lambda: [0.3, 0.2, 0.1], length=3)
+    flow = Flow(nominal_capacity=4, fix=fix)
+    assert flow.fix is fix
+    assert not fix.loaded
+    assert flow.fix[0] == 0.3
+
+    with pytest.raises(AttributeError, match="nominal_capacity must be set"):
+        Flow(fix=LazySequence(lambda: [0.3, 0.2, 0.1]))
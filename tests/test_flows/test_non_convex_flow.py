@@ -132,3 +132,85 @@ def test_shutdown_costs_start_on():
     flow_result = _run_flow_model(flow)
 
     assert (flow_result["flow"][:-1] == [1, 1, 1, 10, 1, 1, 1, 10, 1, 1]).all()
+
+
+def test_initial_status_off_turn_on_formulation():
+    flow = solph.flows.Flow(
+        nominal_capacity=10,
+        nonconvex=solph.NonConvex(
+            initial_status=0,
+            minimum_downtime=5,
+            minimum_up_down_formulation="turn_on",
+        ),
+        variable_costs=-1,
+    )
+    flow_result = _run_flow_model(flow)
+
+    assert (flow_result["flow"][:-1] == 5 * [0] + 5 * [10]).all()
+
+
+def test_initial_status_on_turn_on_formulation():
+    flow = solph.flows.Flow(
+        nominal_capacity=10,
+        minimum=0.5,
+        nonconvex=solph.NonConvex(
+            initial_status=1,
+            minimum_uptime=3,
+            minimum_up_down_formulation="turn_on",
+        ),
+        variable_costs=1,
+    )
+    flow_result = _run_flow_model(flow)
+
+    assert (flow_result["flow"][:-1] == 3 * [5] + 7 * [0]).all()
+
+
+def test_minimum_uptime_turn_on_formulation():
+    # a start for the single profitable time step keeps the unit on
+    flow = solph.flows.Flow(
+        nominal_capacity=10,
+        minimum=0.5,
+        nonconvex=solph.NonConvex(
+            minimum_uptime=3,
+            minimum_downtime=2,
+            minimum_up_down_formulation="turn_on",
+        ),
+        variable_costs=[1, 1, -10, 1, 1, 1, 1, 1, 1, 1],
+    )
+    flow_result = _run_flow_model(flow)
+
+    assert list(flow_result["status"][:-1]) == [0, 0, 1, 1, 1, 0, 0, 0, 0, 0]
+
+
+def test_number_of_units_maximum_startups():
+    # three units of 10, but only two of them may be started
+    flow = solph.flows.Flow(
+        nominal_capacity=30,
+        minimum=0.5,
+        nonconvex=solph.NonConvex(number_of_units=3, maximum_startups=2),
+        variable_costs=-1,
+    )
+    flow_result = _run_flow_model(flow)
+
+    assert list(flow_result["status"][:-1]) == 10 * [2]
+    assert (flow_result["flow"][:-1] == 10 * [20]).all()
+
+
+def test_number_of_units_minimum_downtime():
+    # both units are shut down for the expensive time step and have to
+    # stay off for the minimum downtime
+    flow = solph.flows.Flow(
+        nominal_capacity=20,
+        minimum=0.5,
+        nonconvex=solph.NonConvex(
+            number_of_units=2,
+            initial_status=2,
+            minimum_downtime=3,
+            minimum_up_down_formulation="turn_on",
+        ),
+        variable_costs=[-2, 5, -1, -1, -1, -1, -1, -1, -1, -1],
+    )
+    flow_result = _run_flow_model(flow)
+
+    assert list(flow_result["status"][:-1]) == [2, 0, 0, 0] + 6 * [2]
+    assert list(flow_result["startup"][:-1]) == 4 * [0] + [2] + 5 * [0]
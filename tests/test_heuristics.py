@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -
+
+"""Tests of the heuristics module.
+
+SPDX-License-Identifier: MIT
+"""
+
+import pytest
+from pyomo import environ as po
+
+from oemof import solph
+from oemof.solph import heuristics
+
+
+def _unit_commitment_model():
+    demand = [5, 12, 18, 9, 3, 15, 20, 8, 4, 16, 11, 2]
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=len(demand)),
+        infer_last_interval=False,
+    )
+    bel = solph.buses.Bus(label="bus")
+    es.add(bel)
+    es.add(
+        solph.components.Sink(
+            label="demand",
+            inputs={bel: solph.flows.Flow(nominal_capacity=1, fix=demand)},
+        )
+    )
+    es.add(
+        solph.components.Source(
+            label="shortage",
+            outputs={bel: solph.flows.Flow(variable_costs=100)},
+        )
+    )
+    for k in range(2):
+        es.add(
+            solph.components.Source(
+                label=f"plant_{k}",
+                outputs={
+                    bel: solph.flows.Flow(
+                        nominal_capacity=10,
+                        minimum=0.5,
+                        variable_costs=10 + k,
+                        nonconvex=solph.NonConvex(startup_costs=30),
+                    )
+                },
+            )
+        )
+    return solph.Model(es)
+
+
+def test_relax_and_fix():
+    exact = _unit_commitment_model().solve()["objective"]
+
+    model = _unit_commitment_model()
+    results = heuristics.relax_and_fix(model, window=4, step=2)
+
+    assert results["lower_bound"] <= exact + 1e-6
+    assert results["objective"] >= exact - 1e-6
+    assert results["heuristic_objective"] == results["objective"]
+    gap = results["objective"] - results["lower_bound"]
+    assert results["mip_gap"] == pytest.approx(gap / results["objective"])
+    # integer variables are released again
+    status = model.NonConvexFlowBlock.status
+    assert all(status[i].domain is po.Binary for i in status)
+    assert not any(status[i].fixed for i in status)
+
+
+def test_relax_and_fix_polish():
+    model = _unit_commitment_model()
+    results = heuristics.relax_and_fix(model, window=6, polish=True)
+
+    exact = _unit_commitment_model().solve()["objective"]
+    assert results["objective"] == pytest.approx(exact)
+    assert results["heuristic_objective"] >= exact - 1e-6
+
+
+def test_relax_and_fix_invalid_step():
+    with pytest.raises(ValueError, match="must not exceed the window"):
+        heuristics.relax_and_fix(_unit_commitment_model(), window=2, step=3)
+
+
+def test_relax_and_fix_infeasible_window():
+    # the plant cannot serve 3 (minimum load 5) but the relaxation can
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=4),
+        infer_last_interval=False,
+    )
+    bel = solph.buses.Bus(label="bus")
+    es.add(bel)
+    es.add(
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                bel: solph.flows.Flow(nominal_capacity=1, fix=[5, 5, 3, 5])
+            },
+        )
+    )
+    es.add(
+        solph.components.Source(
+            label="plant",
+            outputs={
+                bel: solph.flows.Flow(
+                    nominal_capacity=10,
+                    minimum=0.5,
+                    variable_costs=10,
+                    nonconvex=solph.NonConvex(),
+                )
+            },
+        )
+    )
+    model = solph.Model(es)
+    with pytest.raises(RuntimeError, match="starting at timestep 2"):
+        heuristics.relax_and_fix(model, window=2)
+
+    status = model.NonConvexFlowBlock.status
+    assert all(status[i].domain is po.Binary for i in status)
+    assert not any(status[i].fixed for i in status)
@@ -9,10 +9,13 @@ available from its original location oemof/tests/basic_tests.py
 SPDX-License-Identifier: MIT
 """
 
+import asyncio
+import gc
 import warnings
 
 import pandas as pd
 import pytest
+from oemof.tools import debugging
 from pyomo.opt.results import SolverResults
 
 from oemof import solph
@@ -140,3 +143,426 @@ def test_multi_period_default_discount_rate():
     with warnings.catch_warnings(record=True) as w:
         solph.Model(es)
         assert msg in str(w[0].message)
+
+
+def test_multi_period_period_cache():
+    """Period and lifetime data is computed once and shared by all blocks"""
+    t1 = pd.date_range("2020-01-01", periods=2, freq="h")
+    t2 = pd.date_range("2030-01-01", periods=2, freq="h")
+    t3 = pd.date_range("2040-01-01", periods=2, freq="h")
+    timeindex = t1.append(t2).append(t3)
+    es = solph.EnergySystem(
+        timeindex=timeindex,
+        timeincrement=[1] * len(timeindex),
+        periods=[t1, t2, t3],
+        infer_last_interval=False,
+    )
+    bel = solph.buses.Bus(label="bus")
+    es.add(bel)
+    for k in range(3):
+        es.add(
+            solph.components.Source(
+                label=f"source_{k}",
+                outputs={
+                    bel: solph.flows.Flow(
+                        nominal_capacity=solph.Investment(
+                            ep_costs=10, lifetime=15, existing=2, age=12
+                        )
+                    )
+                },
+            )
+        )
+    es.add(
+        solph.components.Sink(
+            label="sink",
+            inputs={bel: solph.flows.Flow(nominal_capacity=1, fix=1)},
+        )
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        m = solph.Model(es, discount_rate=0.1)
+
+    cache = m.period_cache
+    assert cache.decommissioning_periods(15).tolist() == [2, 0, 0]
+    assert cache.decommissioning_periods(15) is (
+        cache.decommissioning_periods(15)
+    )
+    assert cache.exo_decommissioning_period(15, 12) == 1
+    assert cache.exo_decommissioning_period(50, 12) is None
+    assert cache.expired_timeindex(15, 12) == ((1, 2), (1, 3), (2, 4), (2, 5))
+    assert list(cache._annuity_factors) == [(15, 0.05), (11, 0.05), (1, 0.05)]
+    assert cache.timestep_discount_factors == pytest.approx(
+        [1, 1, 1.1**-10, 1.1**-10, 1.1**-20, 1.1**-20]
+    )
+
+    standard = solph.Model(
+        solph.EnergySystem(timeindex=timeindex, infer_last_interval=False)
+    )
+    assert standard.period_cache is None
+
+
+def _start_value_model():
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=4),
+        infer_last_interval=False,
+    )
+    bel = solph.buses.Bus(label="bus")
+    es.add(bel)
+    es.add(
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                bel: solph.flows.Flow(nominal_capacity=1, fix=[2, 8, 4, 9])
+            },
+        )
+    )
+    es.add(
+        solph.components.Source(
+            label="shortage",
+            outputs={bel: solph.flows.Flow(variable_costs=100)},
+        )
+    )
+    es.add(
+        solph.components.Source(
+            label="plant",
+            outputs={
+                bel: solph.flows.Flow(
+                    nominal_capacity=10,
+                    minimum=0.3,
+                    variable_costs=10,
+                    nonconvex=solph.NonConvex(startup_costs=5),
+                )
+            },
+        )
+    )
+    return solph.Model(es)
+
+
+def test_set_start_values():
+    results = _start_value_model().solve()
+
+    model = _start_value_model()
+    model.set_start_values(results)
+    flow = [model.flow["plant", "bus", t].value for t in range(4)]
+    assert flow == [0, 8, 4, 9]
+    assert model.NonConvexFlowBlock.startup["plant", "bus", 1].value == 1
+
+    # integer values of a relaxed solve are rounded
+    relaxed = _start_value_model().relax_problem().solve()
+    model.set_start_values(relaxed, variables=["status"])
+    status = model.NonConvexFlowBlock.status
+    assert all(status[i].value in (0, 1) for i in status)
+
+    # nodes can be given by their labels
+    model.set_start_values({"flow": {("plant", "bus", 0): 5}})
+    assert model.flow["plant", "bus", 0].value == 5
+
+
+def test_warmstart_not_supported():
+    model = _start_value_model()
+    with pytest.warns(
+        debugging.SuspiciousUsageWarning, match="does not support warm"
+    ):
+        model.solve(solver="glpk", warmstart=True)
+
+
+def test_portfolio_solve():
+    objective = _start_value_model().solve()["objective"]
+
+    model = _start_value_model()
+    results = model.solve(
+        solver=["nosuchsolver", {"solver": "cbc", "solve_kwargs": {}}]
+    )
+    assert results["objective"] == pytest.approx(objective)
+    assert results["solver_configuration"]["solver"] == "cbc"
+    assert model.flow["plant", "bus", 1].value == pytest.approx(8)
+    assert results["solver_wall_time"] > 0
+    assert results["solver_cpu_time"] is None
+
+
+def test_portfolio_solve_without_solution():
+    with pytest.raises(RuntimeError, match="No solver of the portfolio"):
+        _start_value_model().solve(solver=["nosuchsolver"])
+
+
+def test_solve_statistics():
+    model = _start_value_model()
+    assert model.solve_statistics["build_time"] > 0
+    assert model.solve_statistics["solver_wall_time"] is None
+    # the statistics of pyomo are still available
+    assert model.nconstraints() > 0
+
+    results = model.solve()
+    statistics = model.solve_statistics
+    for key in ["write_time", "load_time"]:
+        assert statistics[key] > 0
+    # the solver reports its time rounded, e.g. 0.00 seconds for cbc
+    assert statistics["solver_wall_time"] >= 0
+    # the call of the solver includes reading the solution file
+    assert statistics["read_time"] >= 0
+    assert statistics["solver_cpu_time"] >= 0
+    assert statistics["rows"] > 0
+    assert statistics["columns"] > 0
+    assert statistics["integer_variables"] == 8
+    assert statistics["mip_gap"] == pytest.approx(0, abs=1e-6)
+    assert statistics["nodes"] >= 0
+
+    assert results["build_time"] == statistics["build_time"]
+    assert results["nodes"] == statistics["nodes"]
+    meta = solph.processing.meta_results(model)
+    assert meta["statistics"] == statistics
+
+
+def test_lazy_sequences_released_after_build():
+    loads = []
+
+    def _loader(values):
+        def _load():
+            loads.append(values)
+            return values
+
+        return _load
+
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=3),
+        infer_last_interval=False,
+    )
+    bus = solph.buses.Bus(label="bus")
+    costs = solph.LazySequence(_loader([1, 2, 3]), length=3)
+    demand = solph.LazySequence(_loader([4, 5, 6]), length=3)
+    es.add(
+        bus,
+        solph.components.Source(
+            label="source",
+            outputs={bus: solph.flows.Flow(variable_costs=costs)},
+        ),
+        solph.components.Sink(
+            label="sink",
+            inputs={bus: solph.flows.Flow(nominal_capacity=1, fix=demand)},
+        ),
+    )
+    model = solph.Model(es)
+    assert not costs.loaded
+    assert not demand.loaded
+    assert len(loads) >= 2
+    assert model.solve()["objective"] == pytest.approx(4 + 10 + 18)
+
+
+def _badly_scaled_model(**kwargs):
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=4),
+        infer_last_interval=False,
+    )
+    bel = solph.buses.Bus(label="bus")
+    es.add(bel)
+    es.add(
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                bel: solph.flows.Flow(
+                    nominal_capacity=1e5, fix=[0.2, 0.8, 0.4, 0.9]
+                )
+            },
+        )
+    )
+    es.add(
+        solph.components.Source(
+            label="pv",
+            outputs={
+                bel: solph.flows.Flow(
+                    nominal_capacity=solph.Investment(
+                        ep_costs=0.1, maximum=2e5
+                    ),
+                    maximum=[0, 1, 0.5, 0.8],
+                    variable_costs=1e-3,
+                )
+            },
+        )
+    )
+    es.add(
+        solph.components.Source(
+            label="gas",
+            outputs={
+                bel: solph.flows.Flow(nominal_capacity=1e5, variable_costs=0.5)
+            },
+        )
+    )
+    es.add(
+        solph.components.Sink(
+            label="excess",
+            inputs={bel: solph.flows.Flow(variable_costs=1e-3)},
+        )
+    )
+    model = solph.Model(es, **kwargs)
+    model.receive_duals()
+    return model
+
+
+def test_flow_scaling():
+    reference = _badly_scaled_model()
+    expected = reference.solve()
+
+    for flow_scaling in ["nominal_capacity", 1e3, {("gas", "bus"): 1e4}]:
+        model = _badly_scaled_model(flow_scaling=flow_scaling)
+        flow = model.flow["gas", "bus", 1]
+        balance = model.BusBlock.balance["bus", 1]
+        expr = balance.expr
+
+        results = model.solve()
+        assert results["objective"] == pytest.approx(expected["objective"])
+        pd.testing.assert_frame_equal(results["flow"], expected["flow"])
+        pd.testing.assert_frame_equal(results["invest"], expected["invest"])
+        assert model.dual[balance] == pytest.approx(
+            reference.dual[reference.BusBlock.balance["bus", 1]]
+        )
+        # the model itself is unchanged
+        assert flow.ub == 1e5
+        assert balance.expr is expr
+
+
+def test_flow_scaling_invalid():
+    model = _badly_scaled_model(flow_scaling={("gas", "bus"): -1})
+    with pytest.raises(ValueError, match="has to be a positive number"):
+        model.solve()
+    with pytest.raises(ValueError, match="not part of the model"):
+        _badly_scaled_model(flow_scaling={("bus", "gas"): 10}).solve()
+
+
+def test_coefficient_report():
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=3),
+        infer_last_interval=False,
+    )
+    gas = solph.buses.Bus(label="gas")
+    heat = solph.buses.Bus(label="heat")
+    es.add(gas, heat)
+    es.add(
+        solph.components.Source(
+            label="import",
+            outputs={gas: solph.flows.Flow(nominal_capacity=1e12)},
+        )
+    )
+    es.add(
+        solph.components.Converter(
+            label="boiler",
+            inputs={gas: solph.flows.Flow()},
+            outputs={heat: solph.flows.Flow(variable_costs=2)},
+            conversion_factors={heat: 1e-9},
+        )
+    )
+    es.add(
+        solph.components.Sink(
+            label="demand",
+            inputs={heat: solph.flows.Flow(nominal_capacity=5, fix=1)},
+        )
+    )
+    report = solph.Model(es).coefficient_report(top=1)
+
+    blocks = report["blocks"]
+    assert blocks.loc["ConverterBlock", ("matrix", "min")] == 1e-9
+    assert blocks.loc["ConverterBlock", ("matrix", "ratio")] == (
+        pytest.approx(1e9)
+    )
+    assert blocks.loc["BusBlock", ("rhs", "max")] == 5
+    assert blocks.loc["Model", ("bounds", "max")] == 1e12
+    assert blocks.loc["Model", ("objective", "max")] == 2
+
+    extremes = report["extremes"]
+    assert len(extremes) == 2
+    assert extremes.loc[0].to_dict() == {
+        "part": "matrix",
+        "value": 1e-9,
+        "block": "ConverterBlock",
+        "constraint": "ConverterBlock.relation[boiler,gas,heat,0]",
+        "variable": "flow[gas,boiler,0]",
+    }
+    assert extremes.loc[1].to_dict() == {
+        "part": "bounds",
+        "value": 1e12,
+        "block": "Model",
+        "constraint": "",
+        "variable": "flow[import,gas,0]",
+    }
+
+
+def test_solve_async():
+    expected = _start_value_model().solve()
+
+    model = _start_value_model()
+    future = model.solve_async()
+    # the next model is built while the solver runs
+    other = _start_value_model()
+    results = future.result()
+    assert future.done()
+    assert future.result() is results
+    assert results["objective"] == pytest.approx(expected["objective"])
+    pd.testing.assert_frame_equal(results["flow"], expected["flow"])
+    assert model.solve_statistics["write_time"] > 0
+    assert model.solve_statistics["solver_wall_time"] > 0
+
+    async def _solve_all(models):
+        return await asyncio.gather(*(m.solve_async() for m in models))
+
+    models = [other, _badly_scaled_model(flow_scaling="nominal_capacity")]
+    first, second = asyncio.run(_solve_all(models))
+    assert first["objective"] == pytest.approx(expected["objective"])
+    assert second["objective"] == pytest.approx(
+        _badly_scaled_model().solve()["objective"]
+    )
+    # the scaling is undone after loading the solution
+    assert models[1].flow["gas", "bus", 1].ub == 1e5
+
+
+def test_solve_async_cancel_and_errors():
+    future = _start_value_model().solve_async(solver="nosuchsolver")
+    with pytest.raises(RuntimeError, match="nosuchsolver"):
+        future.result()
+    with pytest.raises(RuntimeError, match="nosuchsolver"):
+        future.result()
+
+    future = _start_value_model().solve_async()
+    assert future.cancel()
+    assert future.cancelled()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        future.result()
+
+
+def test_solve_async_close():
+    model = _badly_scaled_model(flow_scaling="nominal_capacity")
+    with model.solve_async() as future:
+        assert model.flow["gas", "bus", 1].ub != 1e5
+    assert future.cancelled()
+    assert not future._process.is_alive()
+    # the model is restored without loading a solution
+    assert model.flow["gas", "bus", 1].ub == 1e5
+    future.close()
+
+    future = model.solve_async()
+    process = future._process
+    del future
+    gc.collect()
+    assert not process.is_alive()
+    assert model.flow["gas", "bus", 1].ub == 1e5
+
+
+def test_solve_async_cancel_while_awaiting():
+    future = _start_value_model().solve_async()
+
+    async def _await_cancelled():
+        asyncio.get_running_loop().call_soon(future.cancel)
+        await future
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_await_cancelled())
+
+    async def _cancel_task(future):
+        task = asyncio.ensure_future(future)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    future = _start_value_model().solve_async()
+    asyncio.run(_cancel_task(future))
+    assert future.cancelled()
+    assert not future._process.is_alive()
@@ -69,3 +69,22 @@ def test_investment_custom_properties():
             custom_properties={"prop": 1},
         )
     # --- END ---
+
+
+def test_check_number_of_units():
+    """Check errors for invalid numbers of units"""
+    with pytest.raises(ValueError, match="positive integer"):
+        solph.NonConvex(number_of_units=1.5)
+    with pytest.raises(ValueError, match="formulation 'turn_on'"):
+        solph.NonConvex(number_of_units=2, minimum_uptime=2)
+    with pytest.raises(ValueError, match="Gradient limits"):
+        solph.NonConvex(number_of_units=2, positive_gradient_limit=0.2)
+    with pytest.raises(ValueError, match="Gradient limits"):
+        solph.NonConvex(number_of_units=3, negative_gradient_limit=[0.1])
+    with pytest.raises(ValueError, match="between 0 and the number_of_units"):
+        solph.NonConvex(number_of_units=2, initial_status=3)
+    with pytest.raises(ValueError, match="several units"):
+        solph.Flow(
+            nominal_capacity=solph.Investment(maximum=10),
+            nonconvex=solph.NonConvex(number_of_units=2),
+        )
@@ -11,6 +11,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from oemof.solph._plumbing import LazySequence
+from oemof.solph._plumbing import SequenceRegistry
 from oemof.solph._plumbing import _FakeSequence
 from oemof.solph._plumbing import sequence
 from oemof.solph._plumbing import valid_sequence
@@ -114,3 +116,107 @@ def test_valid_sequence():
 
     # strings are no valid sequences
     assert not valid_sequence("abc", 3)
+
+
+def test_sequence_registry_deduplicates():
+    profile = np.array([0.1, 0.5, 0.9])
+    with SequenceRegistry() as registry:
+        seq_np = sequence(profile)
+        seq_pd = sequence(pd.Series(profile))
+        seq_list = sequence([0.1, 0.5, 0.9])
+        seq_other = sequence([0.2, 0.5, 0.9])
+        seq_scalar = sequence(3)
+    seq_outside = sequence(profile)
+
+    assert seq_np is seq_pd
+    assert seq_np is seq_list
+    assert seq_other is not seq_np
+    assert isinstance(seq_scalar, _FakeSequence)
+    assert seq_outside is not seq_np
+
+    # interned arrays are read-only views, the input stays writeable
+    assert np.shares_memory(seq_np, profile)
+    assert not seq_np.flags.writeable
+    assert profile.flags.writeable
+    with pytest.raises(ValueError):
+        seq_np[0] = 1
+
+    report = registry.memory_report()
+    assert report["sequences"] == 4
+    assert report["unique"] == 2
+    assert report["requested_bytes"] == 4 * 24
+    assert report["saved_bytes"] == 2 * 24
+
+    registry.clear()
+    assert registry.memory_report()["sequences"] == 0
+
+
+def test_sequence_registry_float32_and_memmap(tmp_path):
+    data = np.memmap(
+        tmp_path / "profile.dat", dtype=np.float32, mode="w+", shape=(4,)
+    )
+    data[:] = [0.25, 0.5, 0.75, 1.0]
+
+    with SequenceRegistry(dtype=np.float32) as registry:
+        seq_memmap = sequence(data)
+        seq_list = sequence([0.25, 0.5, 0.75, 1])
+        seq_int = sequence([2, 3, 4, 5])
+
+    assert np.shares_memory(seq_memmap, data)
+    assert seq_list is seq_memmap
+    assert seq_memmap.dtype == np.float32
+    # integer sequences (e.g. minimum uptimes) are not converted
+    assert seq_int.dtype.kind == "i"
+    assert registry.memory_report()["stored_bytes"] == 16 + seq_int.nbytes
+
+
+def test_lazy_sequence():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return pd.Series([1.0, 2.0, 3.0])
+
+    seq = sequence(loader)
+    assert isinstance(seq, LazySequence)
+    assert not seq.loaded
+    assert sequence(seq) is seq
+
+    # length unknown, so it has to be loaded for validation
+    assert valid_sequence(seq, 3)
+    assert seq.loaded
+    assert seq[2] == 3
+    assert seq.max() == 3
+    assert (2 * seq == np.array([2, 4, 6])).all()
+    assert len(calls) == 1
+
+    seq.unload()
+    assert not seq.loaded
+    assert list(seq) == [1, 2, 3]
+    assert len(calls) == 2
+
+    assert np.shares_memory(np.asarray(seq), seq.values)
+    copied = np.array(seq, copy=True)
+    assert not np.shares_memory(copied, seq.values)
+    with pytest.raises(ValueError, match="avoid a copy"):
+        np.array(seq, dtype=int, copy=False)
+
+
+def test_lazy_sequence_known_length():
+    seq = LazySequence(lambda: [1, 2], length=3)
+    assert valid_sequence(seq, 3)
+    assert not seq.loaded
+    with pytest.raises(ValueError, match="Length mismatch"):
+        sequence(seq, length=2)
+    with pytest.raises(ValueError, match="Length of loaded sequence"):
+        _ = seq[0]
+
+    with pytest.raises(ValueError, match="one-dimensional iterable"):
+        _ = LazySequence(lambda: 5)[0]
+
+
+def test_sequence_keeps_memmap(tmp_path):
+    data = np.memmap(tmp_path / "profile.dat", mode="w+", shape=(3,))
+    seq = sequence(data)
+    assert seq is data
+    assert valid_sequence(seq, 3)
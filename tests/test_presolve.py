@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -
+
+"""Tests of the presolve steps of the model.
+
+SPDX-License-Identifier: MIT
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oemof import solph
+from oemof.solph import _presolve
+
+
+def _nonconvex_investment_model(minimum=10, **kwargs):
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=3),
+        infer_last_interval=False,
+    )
+    gas = solph.buses.Bus(label="gas")
+    el = solph.buses.Bus(label="el")
+    es.add(gas, el)
+    es.add(
+        solph.components.Source(
+            label="import",
+            outputs={gas: solph.flows.Flow(variable_costs=10)},
+        )
+    )
+    es.add(
+        solph.components.Converter(
+            label="plant",
+            inputs={gas: solph.flows.Flow()},
+            outputs={
+                el: solph.flows.Flow(
+                    nominal_capacity=solph.Investment(
+                        ep_costs=20,
+                        offset=100,
+                        minimum=minimum,
+                        maximum=10e10,
+                        nonconvex=True,
+                    )
+                )
+            },
+            conversion_factors={el: 0.5},
+        )
+    )
+    es.add(
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(nominal_capacity=50, fix=[0.2, 1, 0.6])
+            },
+        )
+    )
+    return solph.Model(es, **kwargs)
+
+
+def test_flow_bounds():
+    model = _nonconvex_investment_model()
+    bounds = _presolve.flow_bounds(model)
+    lower, upper = bounds["plant", "el"]
+    assert lower == pytest.approx([10, 50, 30])
+    assert upper == pytest.approx([10, 50, 30])
+    lower, upper = bounds["gas", "plant"]
+    assert upper == pytest.approx([20, 100, 60])
+    assert np.all(bounds["import", "gas"][1] == upper)
+
+
+def test_tighten_big_m():
+    model = _nonconvex_investment_model(tighten_big_m=True)
+    assert model.investment_bounds == {("plant", "el"): 50}
+    assert model.InvestmentFlowBlock.invest["plant", "el", 0].ub == 50
+    # fuel, capacity and offset costs
+    objective = 10 * 180 + 20 * 50 + 100
+    assert model.solve()["objective"] == pytest.approx(objective)
+
+
+def test_tighten_big_m_keeps_minimum():
+    model = _nonconvex_investment_model(minimum=80, tighten_big_m=True)
+    assert model.InvestmentFlowBlock.invest["plant", "el", 0].ub == 80
+
+
+def _multi_period_investment_model(**kwargs):
+    t1 = pd.date_range("2020-01-01", periods=2, freq="h")
+    t2 = pd.date_range("2030-01-01", periods=2, freq="h")
+    es = solph.EnergySystem(
+        timeindex=t1.append(t2).append(pd.DatetimeIndex(["2030-01-01 02:00"])),
+        timeincrement=[1] * 4,
+        periods=[t1, t2],
+        infer_last_interval=False,
+    )
+    gas = solph.buses.Bus(label="gas")
+    el = solph.buses.Bus(label="el")
+    es.add(gas, el)
+    es.add(
+        solph.components.Source(
+            label="import",
+            outputs={gas: solph.flows.Flow(variable_costs=10)},
+        ),
+        solph.components.Source(
+            label="backup",
+            outputs={el: solph.flows.Flow(variable_costs=100)},
+        ),
+        solph.components.Converter(
+            label="plant",
+            inputs={gas: solph.flows.Flow()},
+            outputs={
+                el: solph.flows.Flow(
+                    nominal_capacity=solph.Investment(
+                        ep_costs=20,
+                        offset=100,
+                        maximum=30,
+                        lifetime=20,
+                        nonconvex=True,
+                    )
+                )
+            },
+            conversion_factors={el: 0.5},
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(nominal_capacity=50, fix=[0, 0.6, 1, 1])
+            },
+        ),
+    )
+    return solph.Model(es, **kwargs)
+
+
+def test_tighten_big_m_multi_period():
+    # the investments of both periods add up to the capacity needed later
+    reference = _multi_period_investment_model().solve()
+    model = _multi_period_investment_model(tighten_big_m=True)
+    lower, upper = _presolve.flow_bounds(model)["plant", "el"]
+    assert upper == pytest.approx([0, 30, 50, 50])
+    assert model.solve()["objective"] == pytest.approx(reference["objective"])
+    assert model.InvestmentFlowBlock.total["plant", "el", 1].value == (
+        pytest.approx(50)
+    )
+
+
+def _chain_model(**kwargs):
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=3),
+        infer_last_interval=False,
+    )
+    gas, el, grid, remote = (
+        solph.buses.Bus(label=label)
+        for label in ["gas", "el", "grid", "remote"]
+    )
+    es.add(gas, el, grid, remote)
+    es.add(
+        solph.components.Source(
+            label="import",
+            outputs={gas: solph.flows.Flow(variable_costs=10)},
+        ),
+        solph.components.Converter(
+            label="plant",
+            inputs={gas: solph.flows.Flow()},
+            outputs={el: solph.flows.Flow(nominal_capacity=40)},
+            conversion_factors={el: 0.5},
+        ),
+        solph.components.Converter(
+            label="transformer",
+            inputs={el: solph.flows.Flow()},
+            outputs={grid: solph.flows.Flow()},
+            conversion_factors={grid: [0.9, 0.9, 0.8]},
+        ),
+        solph.components.Source(
+            label="backup",
+            outputs={grid: solph.flows.Flow(variable_costs=50)},
+        ),
+        solph.components.Link(
+            label="line",
+            inputs={grid: solph.flows.Flow(), remote: solph.flows.Flow()},
+            outputs={grid: solph.flows.Flow(), remote: solph.flows.Flow()},
+            conversion_factors={(grid, remote): 0.95, (remote, grid): 0.95},
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                remote: solph.flows.Flow(
+                    nominal_capacity=50, fix=[0.2, 1, 0.6]
+                )
+            },
+        ),
+    )
+    return solph.Model(es, **kwargs)
+
+
+def test_flow_aliases():
+    model = _chain_model()
+    aliases, implied = _presolve.flow_aliases(model)
+    # the demand is fixed and the backup is connected to a bus with several
+    # flows
+    root, factor = aliases["el", "transformer"]
+    assert root == ("import", "gas")
+    assert factor == pytest.approx([0.5, 0.5, 0.5])
+    root, factor = aliases["transformer", "grid"]
+    assert root == ("import", "gas")
+    assert factor == pytest.approx([0.45, 0.45, 0.4])
+    root, factor = aliases["line", "remote"]
+    assert root == ("grid", "line")
+    assert factor == pytest.approx([0.95, 0.95, 0.95])
+    assert ("backup", "grid") not in aliases
+    assert ("remote", "demand") not in aliases
+    assert model.BusBlock.balance["el", 0] in implied
+    assert model.BusBlock.balance["grid", 0] not in implied
+
+
+def test_eliminate_flows():
+    reference = _chain_model().solve()
+    model = _chain_model(eliminate_flows=True)
+    results = model.solve()
+    assert len(model.eliminated_flows) == 6
+    assert results["objective"] == pytest.approx(reference["objective"])
+    assert np.allclose(results["flow"], reference["flow"])
+    # the bounds of the plant output are passed to the gas import
+    assert results["flow"]["plant", "el"].max() == pytest.approx(40)
+    assert model.BusBlock.balance["el", 0].active
+    assert model.flow["import", "gas", 0].ub is None
+
+
+def test_eliminate_flows_keeps_duals():
+    model = _chain_model(eliminate_flows=True)
+    model.receive_duals()
+    model.solve()
+    assert ("gas", "plant") not in model.eliminated_flows
+    assert model.dual[model.BusBlock.balance["gas", 1]] is not None
@@ -13,6 +13,8 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 import numpy as np
 import pandas as pd
+import pytest
+from pyomo import environ as po
 
 import oemof.solph as solph
 from oemof.solph import EnergySystem
@@ -23,7 +25,8 @@ from oemof.solph.components import Sink
 from oemof.solph.flows import Flow
 
 
-def test_pwltf():
+@pytest.mark.parametrize("pw_repn", ["CC", "INC", "SOS2", "BIGM_BIN"])
+def test_pwltf(pw_repn):
     # Set timeindex and create data
     periods = 20
     datetimeindex = pd.date_range("1/1/2019", periods=periods, freq="h")
@@ -58,15 +61,27 @@ def test_pwltf():
         outputs={b_el: solph.flows.Flow()},
         in_breakpoints=in_breakpoints,
         conversion_function=conv_func,
-        pw_repn="CC",
+        pw_repn=pw_repn,
     )
 
     energysystem.add(pwltf)
 
     # Create and solve the optimization model
     optimization_model = Model(energysystem)
+    report = optimization_model.coefficient_report()
+    assert "PiecewiseLinearConverterBlock" in report["blocks"].index
+    if pw_repn == "SOS2" and not po.SolverFactory("cbc").has_capability(
+        "sos2"
+    ):
+        with pytest.raises(ValueError, match="does not support SOS"):
+            optimization_model.solve(solver="cbc")
+        pytest.skip("The solver interface does not support SOS2.")
     optimization_model.solve(solver="cbc")
 
+    # native representations work on the flows without equated variables
+    block = optimization_model.PiecewiseLinearConverterBlock
+    assert hasattr(block, "inflow") is (pw_repn == "BIGM_BIN")
+
     # Get results
     results = processing.results(
         optimization_model, remove_last_time_point=True
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -
+
+"""Tests of the two-stage stochastic model.
+
+SPDX-License-Identifier: MIT
+"""
+
+import pytest
+
+from oemof import solph
+
+WIND = [[0.9, 0.1, 0.5, 0.8], [0.2, 0.3, 0.1, 0.4], [0.6, 0.7, 0.9, 0.2]]
+
+
+def _energy_system():
+    es = solph.EnergySystem(
+        timeindex=solph.create_time_index(2020, number=4),
+        infer_last_interval=False,
+    )
+    el = solph.buses.Bus(label="el")
+    wind = solph.flows.Flow(
+        maximum=WIND[0], nominal_capacity=solph.Investment(ep_costs=20)
+    )
+    es.add(
+        el,
+        solph.components.Source(label="wind", outputs={el: wind}),
+        solph.components.Source(
+            label="gas", outputs={el: solph.flows.Flow(variable_costs=30)}
+        ),
+        solph.components.Sink(
+            label="demand",
+            inputs={
+                el: solph.flows.Flow(nominal_capacity=10, fix=[1, 0.8, 1, 1])
+            },
+        ),
+        solph.components.GenericStorage(
+            label="battery",
+            nominal_capacity=solph.Investment(ep_costs=5),
+            inputs={el: solph.flows.Flow()},
+            outputs={el: solph.flows.Flow()},
+        ),
+    )
+    return es, wind
+
+
+def test_stochastic_model():
+    es, wind = _energy_system()
+    model = solph.StochasticModel(
+        es,
+        [{(wind, "maximum"): profile} for profile in WIND],
+        probabilities=[0.5, 0.3, 0.2],
+    )
+    # the nodes keep their sequences
+    assert wind.maximum.tolist() == WIND[0]
+    model.solve()
+
+    results = model.results()
+    assert len(results) == 3
+    wind_node = es.groups["wind"]
+    el = es.groups["el"]
+    battery = es.groups["battery"]
+    for s, result in enumerate(results):
+        invest = result[wind_node, el]["scalars"]["invest"]
+        assert invest == pytest.approx(
+            results[0][wind_node, el]["scalars"]["invest"]
+        )
+        assert result[battery, None]["scalars"]["invest"] == pytest.approx(
+            results[0][battery, None]["scalars"]["invest"]
+        )
+        flow = result[wind_node, el]["sequences"]["flow"].dropna()
+        assert (flow <= [invest * w + 1e-6 for w in WIND[s]]).all()
+
+    # knowing the scenario in advance can only be cheaper
+    wait_and_see = 0
+    for probability, profile in zip(model.probabilities, WIND):
+        es, wind = _energy_system()
+        wind.maximum = solph.sequence(profile)
+        deterministic = solph.Model(es)
+        wait_and_see += probability * deterministic.solve()["objective"]
+    assert wait_and_see <= model.objective() + 1e-6
+
+
+def test_stochastic_model_single_scenario():
+    es, wind = _energy_system()
+    model = solph.StochasticModel(es, [{}, {}])
+    model.solve()
+
+    deterministic = solph.Model(_energy_system()[0])
+    assert model.objective() == pytest.approx(
+        deterministic.solve()["objective"]
+    )
+    # first stage variables are equal in all scenarios
+    invest = model.scenario_1.InvestmentFlowBlock.invest
+    assert all(
+        invest[i].value == model.scenario_0.InvestmentFlowBlock.invest[i].value
+        for i in invest
+    )
+
+
+def test_stochastic_model_invalid_probabilities():
+    es, _ = _energy_system()
+    with pytest.raises(ValueError, match="add up to 1"):
+        solph.StochasticModel(es, [{}, {}], probabilities=[0.5, 0.6])
+    with pytest.raises(ValueError, match="probabilities are given"):
+        solph.StochasticModel(es, [{}, {}], probabilities=[1])
+
+
+def test_stochastic_model_rejects_solve_options():
+    es, _ = _energy_system()
+    with pytest.raises(ValueError, match="flow_scaling, eliminate_flows"):
+        solph.StochasticModel(
+            es, [{}, {}], flow_scaling=True, eliminate_flows=True
+        )